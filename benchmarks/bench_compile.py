@@ -0,0 +1,57 @@
+"""
+Speed of compiled expressions (`expression.compile()`) against the
+interpreter, for `find()`, `find_values()` and `update()` on representative
+queries over a generated document. Updates apply a function returning the
+current value, so that the document does not change.
+
+Usage: PYTHONPATH=. python benchmarks/bench_compile.py [records] [number]
+"""
+import sys
+import timeit
+
+from jsonpath_ng.ext import parse
+
+EXPRESSIONS = (
+    'records[*].name',
+    '$.records[*].address.city',
+    '$.records[10:5000:3].tags[0]',
+    '$..city',
+    '$.records[?(@.score > 50)].name',
+    '$.records[?(@.address.city == "paris" & @.score < 10)].name',
+)
+
+
+def document(records):
+    cities = ['paris', 'lima', 'oslo']
+    return {'records': [{'name': 'record%d' % i, 'score': i % 100, 'tags': ['a', 'b'],
+                         'address': {'city': cities[i % 3], 'zip': '%05d' % i}}
+                        for i in range(records)]}
+
+
+def unchanged(value, data, field):
+    return value
+
+
+def bench(function, number):
+    return min(timeit.repeat(function, number=number, repeat=3)) / number
+
+
+def main(records=20000, number=5):
+    data = document(int(records))
+    number = int(number)
+    for string in EXPRESSIONS:
+        expression = parse(string)
+        compiled = expression.compile()
+        for name, interpreted, fast in (
+            ('find', lambda: expression.find(data), lambda: compiled.find(data)),
+            ('find_values', lambda: expression.find_values(data), lambda: compiled.find_values(data)),
+            ('update', lambda: expression.update(data, unchanged), lambda: compiled.update(data, unchanged)),
+        ):
+            before = bench(interpreted, number)
+            after = bench(fast, number)
+            print('%-62r %-12s interpreter: %8.2f ms  compiled: %8.2f ms  (%.1fx)'
+                  % (string, name, before * 1e3, after * 1e3, before / after))
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
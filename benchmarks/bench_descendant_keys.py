@@ -0,0 +1,55 @@
+"""
+`$..price`, `$..timeout` and `$..[1:]` on a large configuration-like document,
+in which `price` is rare, with and without the key test
+that lets `..` skip the values its right side cannot match.
+
+Usage: PYTHONPATH=. python benchmarks/bench_descendant_keys.py [services]
+"""
+import sys
+import time
+
+from jsonpath_ng import jsonpath, parse
+
+
+def document(services):
+    return {'services': [
+        {
+            'name': 'service-%d' % i,
+            'enabled': bool(i % 2),
+            'settings': {'timeout': 30, 'retries': 3, 'hosts': ['a.example', 'b.example'],
+                         'limits': {'cpu': 2, 'memory': '512M'}},
+            'plan': {'price': i} if i % 100 == 0 else {'tier': 'free'},
+        }
+        for i in range(services)
+    ]}
+
+
+def timed(function, data):
+    start = time.perf_counter()
+    function(data)
+    return time.perf_counter() - start
+
+
+def main(services=20000):
+    data = document(int(services))
+    key_test = jsonpath._descendant_test
+    for string in ('$..price', '$..timeout', '$..[1:]'):
+        for label, test in (('unpruned', lambda node: None), ('pruned', key_test)):
+            jsonpath._descendant_test = test
+            try:
+                expression = parse(string)
+                compiled = expression.compile()
+                for operation, function in (
+                    ('find', expression.find),
+                    ('find_values', expression.find_values),
+                    ('count', expression.count),
+                    ('compiled find', compiled.find),
+                    ('compiled values', compiled.find_values),
+                ):
+                    print('%-9s %-9s %-16s %8.1f ms' % (string, label, operation, timed(function, data) * 1e3))
+            finally:
+                jsonpath._descendant_test = key_test
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
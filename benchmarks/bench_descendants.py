@@ -0,0 +1,55 @@
+"""
+`..` (Descendants) on a wide document (many shallow records) and on a deep
+one (a single chain of nested objects and lists), for `find()`,
+`find_values()`, `update()` and `filter()`, interpreted and compiled.
+
+Usage: PYTHONPATH=. python benchmarks/bench_descendants.py [width] [depth]
+"""
+import sys
+import time
+
+from jsonpath_ng import parse
+
+
+def wide(width):
+    return {'records': [{'id': i, 'tags': ['a', 'b'], 'meta': {'id': -i}} for i in range(width)]}
+
+
+def deep(depth):
+    data = {'id': depth}
+    for level in range(depth):
+        data = {'id': level, 'child': [data]} if level % 2 else {'id': level, 'child': data}
+    return data
+
+
+def unchanged(value, data, field):
+    return value
+
+
+def timed(function, document):
+    data = document()
+    start = time.perf_counter()
+    try:
+        function(data)
+    except RecursionError:
+        return None
+    return time.perf_counter() - start
+
+
+def main(width=20000, depth=5000):
+    expression = parse('$..id')
+    for name, document in (('wide', lambda: wide(int(width))), ('deep', lambda: deep(int(depth)))):
+        for label, path in (('interpreted', expression), ('compiled', expression.compile())):
+            for operation, function in (
+                ('find', path.find),
+                ('find_values', path.find_values),
+                ('update', lambda data: path.update(data, unchanged)),
+                ('filter', lambda data: path.filter(lambda value: False, data)),
+            ):
+                elapsed = timed(function, document)
+                print('%-5s %-12s %-12s %s' % (name, label, operation,
+                                               'RecursionError' if elapsed is None else '%8.1f ms' % (elapsed * 1e3)))
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
@@ -0,0 +1,41 @@
+"""
+Time for a freshly started process to compile a rule set with `parse()`:
+without a persistent cache, on the run that fills it, and on a restart
+that reads it.
+
+Usage: PYTHONPATH=. python benchmarks/bench_disk_cache.py [rules]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+
+WORKER = '''
+import sys, time
+start = time.perf_counter()
+from jsonpath_ng.ext import parse
+for i in range(int(sys.argv[1])):
+    parse('$.routes[?(@.name == route%d)].targets[%d].host' % (i, i % 7))
+print(time.perf_counter() - start)
+'''
+
+
+def run(rules, directory=None):
+    env = dict(os.environ)
+    env.pop('JSONPATH_NG_CACHE_DIR', None)
+    if directory is not None:
+        env['JSONPATH_NG_CACHE_DIR'] = directory
+    output = subprocess.check_output([sys.executable, '-c', WORKER, str(rules)], env=env)
+    return float(output)
+
+
+def main(rules=20000):
+    with tempfile.TemporaryDirectory() as directory:
+        print('%d rules' % int(rules))
+        print('no persistent cache:  %8.3f s' % run(rules))
+        print('filling the cache:    %8.3f s' % run(rules, directory))
+        print('restart from cache:   %8.3f s' % run(rules, directory))
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
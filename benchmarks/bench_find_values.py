@@ -0,0 +1,35 @@
+"""
+Throughput of `find_values()` against `[m.value for m in find()]` on a
+large array.
+
+Usage: PYTHONPATH=. python benchmarks/bench_find_values.py [records] [number]
+"""
+import sys
+import timeit
+
+from jsonpath_ng.ext import parse
+
+EXPRESSIONS = (
+    'records[*].name',
+    '$.records[*].tags[0]',
+    '$..name',
+    '$.records[?(@.score > 50)].name',
+)
+
+
+def main(records=100000, number=3):
+    data = {'records': [{'name': 'record%d' % i, 'score': i % 100, 'tags': ['a', 'b']}
+                        for i in range(int(records))]}
+    number = int(number)
+    for string in EXPRESSIONS:
+        expression = parse(string)
+        find = min(timeit.repeat(lambda: [m.value for m in expression.find(data)],
+                                 number=number, repeat=3)) / number
+        values = min(timeit.repeat(lambda: expression.find_values(data),
+                                   number=number, repeat=3)) / number
+        print('%-36r find: %8.1f ms  find_values: %8.1f ms  (%.1fx)'
+              % (string, find * 1e3, values * 1e3, find / values))
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
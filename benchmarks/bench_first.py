@@ -0,0 +1,47 @@
+"""
+Early exit of `find_first()`, `exists()` and `count()` against `find()` on
+a deep document: a tree of `depth` levels of nested objects and lists, with
+an "error" field near the start of the walk.
+
+Usage: PYTHONPATH=. python benchmarks/bench_first.py [depth] [number]
+"""
+import sys
+import timeit
+
+from jsonpath_ng.ext import parse
+
+EXPRESSIONS = (
+    '$..error',
+    '$..items[*].id',
+    '$.node.children[*].node.children[0]',
+)
+
+
+def document(depth, fanout=3):
+    if depth == 0:
+        return {'id': 0, 'items': [{'id': i} for i in range(fanout)]}
+    node = {'id': depth, 'children': [document(depth - 1, fanout) for _ in range(fanout)]}
+    if depth == 1:
+        node['error'] = 'failed'
+    return {'node': node, 'items': [{'id': i} for i in range(fanout)]}
+
+
+def bench(function, number):
+    return min(timeit.repeat(function, number=number, repeat=5)) / number
+
+
+def main(depth=7, number=5):
+    data = document(int(depth))
+    number = int(number)
+    for string in EXPRESSIONS:
+        expression = parse(string)
+        find = bench(lambda: expression.find(data), number)
+        print('%-40r find: %8.2f ms' % (string, find * 1e3))
+        for name in ('find_first', 'exists', 'count'):
+            method = getattr(expression, name)
+            elapsed = bench(lambda: method(data), number)
+            print('%-40r %-10s %8.2f ms  (%.1fx)' % (string, name, elapsed * 1e3, find / elapsed))
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
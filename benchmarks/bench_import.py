@@ -0,0 +1,37 @@
+"""
+Cost of `import jsonpath_ng`, as reported by `python -X importtime`, in a
+fresh interpreter for every run.
+
+Usage: PYTHONPATH=. python benchmarks/bench_import.py [number] [module]
+"""
+import subprocess
+import sys
+
+
+def import_times(module='jsonpath_ng'):
+    """
+    Imports `module` in a fresh interpreter and returns the `-X importtime`
+    report as a list of (module name, self us, cumulative us), in import order.
+    """
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import %s' % module],
+                             stderr=subprocess.PIPE, universal_newlines=True, check=True)
+    times = []
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        times.append((name.strip(), int(self_us), int(cumulative_us)))
+    return times
+
+
+def main(number=10, module='jsonpath_ng'):
+    runs = [import_times(module) for _ in range(int(number))]
+    best = min(runs, key=lambda times: times[-1][2])
+    for name, self_us, cumulative_us in best:
+        if name.startswith(('jsonpath_ng', 'ply')):
+            print('%-32s self: %8d us  cumulative: %8d us' % (name, self_us, cumulative_us))
+    print('%d modules, best of %d: %d us' % (len(best), len(runs), best[-1][2]))
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
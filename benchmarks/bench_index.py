@@ -0,0 +1,42 @@
+"""
+Many expressions against the same document, on the document itself and
+on a `JsonIndex` of it, with the time and memory the index takes to build.
+
+Usage: PYTHONPATH=. python benchmarks/bench_index.py [services] [expressions]
+"""
+import sys
+import time
+
+from jsonpath_ng import JsonIndex, parse
+
+from bench_descendant_keys import document
+
+
+def expressions(count):
+    templates = ('$..price', '$..timeout', '$.services[*].plan.tier', '($..limits).`parent`',
+                 '$.services[%d].settings.hosts[*]', '$..services[%d].name')
+    return [parse(templates[i % len(templates)].replace('%d', str(i))) for i in range(count)]
+
+
+def timed(function):
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main(services=20000, count=60):
+    data = document(int(services))
+    paths = expressions(int(count))
+
+    plain = timed(lambda: [path.find(data) for path in paths])
+    index = JsonIndex(data)
+    indexed = timed(lambda: [path.find(index) for path in paths])
+
+    print('%d expressions, %d nodes' % (len(paths), len(index)))
+    print('document            %8.1f ms' % (plain * 1e3))
+    print('index build         %8.1f ms, %.1f MB' % (index.build_time * 1e3, index.memory_size() / 2 ** 20))
+    print('index               %8.1f ms' % (indexed * 1e3))
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
@@ -0,0 +1,43 @@
+"""
+`&` of overlapping wildcard queries on a large configuration-like document,
+against intersecting their matches by comparing paths pairwise.
+
+Usage: PYTHONPATH=. python benchmarks/bench_intersect.py [services]
+"""
+import sys
+import time
+
+from jsonpath_ng import parse
+
+from bench_descendant_keys import document
+
+EXPRESSIONS = (
+    '($.services[*].settings.*)&($..timeout)',
+    '($..*)&($.services[*].plan.*)',
+    '($.services[*].*)&($.services[*].settings)',
+)
+
+
+def pairwise(expression, data):
+    right = [match.full_path for match in expression.right.find(data)]
+    return [match for match in expression.left.find(data) if any(match.full_path == path for path in right)]
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return len(result), time.perf_counter() - start
+
+
+def main(services=1000):
+    data = document(int(services))
+    for string in EXPRESSIONS:
+        expression = parse(string)
+        count, elapsed = timed(expression.find, data)
+        print('%-46r %6d matches  %8.1f ms' % (string, count, elapsed * 1e3))
+        count, elapsed = timed(pairwise, expression, data)
+        print('%-46s %6d matches  %8.1f ms' % ('  pairwise', count, elapsed * 1e3))
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
@@ -0,0 +1,54 @@
+"""
+Time and peak traced memory of `find()`, of consuming `iter_find()` one
+match at a time, and of stopping `iter_find()` at the first match.
+
+Usage: PYTHONPATH=. python benchmarks/bench_iter_find.py [records]
+"""
+import sys
+import time
+import tracemalloc
+
+from jsonpath_ng.ext import parse
+
+EXPRESSIONS = (
+    '$.records[*].tags[*]',
+    '$..name',
+    '$.records[?(@.score > 50)].name',
+)
+
+
+def document(records):
+    return {'records': [{'name': 'record%d' % i, 'score': i % 100, 'tags': ['a', 'b', 'c']}
+                        for i in range(records)]}
+
+
+def measure(function):
+    tracemalloc.start()
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def consume(iterator):
+    for _ in iterator:
+        pass
+
+
+def main(records=20000):
+    data = document(int(records))
+    for string in EXPRESSIONS:
+        expression = parse(string)
+        for label, function in (
+            ('find', lambda: expression.find(data)),
+            ('iter_find', lambda: consume(expression.iter_find(data))),
+            ('first match', lambda: next(expression.iter_find(data))),
+        ):
+            elapsed, peak = measure(function)
+            print('%-36r %-12s %9.1f ms  peak %9.1f KiB' % (string, label, elapsed * 1e3, peak / 1024))
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
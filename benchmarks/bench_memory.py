@@ -0,0 +1,38 @@
+"""
+Memory held by the matches of `find()`: the bytes traced by tracemalloc
+per match (the `DatumInContext`, its path node and the list entry) for a
+query matching every node of a generated document.
+
+Usage: PYTHONPATH=. python benchmarks/bench_memory.py [nodes]
+"""
+import sys
+import tracemalloc
+
+from jsonpath_ng import parse
+
+EXPRESSIONS = (
+    '$..*',
+    '$.records[*].name',
+)
+
+
+def document(nodes):
+    records = nodes // 4
+    return {'records': [{'name': 'record%d' % i, 'tags': ['a', 'b']} for i in range(records)]}
+
+
+def main(nodes=200000):
+    data = document(int(nodes))
+    for string in EXPRESSIONS:
+        expression = parse(string)
+        expression.find({})
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        matches = expression.find(data)
+        held = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+        print('%-24r %8d matches  %8.1f bytes per match' % (string, len(matches), held / len(matches)))
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
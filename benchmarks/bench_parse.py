@@ -0,0 +1,84 @@
+"""
+Per-parse cost of the parser backends, bypassing the process-wide parse
+cache, and the cost of tokenizing alone.
+
+"rebuild tables" reproduces the old behaviour of running grammar analysis
+and LALR table construction on every parse: the tables are generated from
+the grammar each time, not loaded from the shipped parsetab modules.
+"shared tables" is the current behaviour where each parser class loads its
+tables once;
+"descent" is the recursive-descent backend parsing the same expression,
+with its own tokenizer rather than the PLY lexer.
+
+Usage: PYTHONPATH=. python benchmarks/bench_parse.py [number]
+"""
+import sys
+import timeit
+
+import ply.yacc
+
+from jsonpath_ng import parser
+from jsonpath_ng.descent import JsonPathDescentParser, get_tokenizer
+from jsonpath_ng.ext.descent import ExtendedJsonPathDescentParser
+from jsonpath_ng.ext.parser import ExtentedJsonPathParser
+
+EXPRESSIONS = {
+    parser.JsonPathParser: '$.store.book[*].author',
+    ExtentedJsonPathParser: '$.store.book[?(@.price < 10)].title',
+}
+
+DESCENT_PARSERS = {
+    parser.JsonPathParser: JsonPathDescentParser,
+    ExtentedJsonPathParser: ExtendedJsonPathDescentParser,
+}
+
+
+# A table module that does not exist, so that PLY generates the tables
+NO_TABLES = 'jsonpath_ng_bench_no_parsetab'
+
+
+def parse_rebuilding_tables(parser_class, expression):
+    instance = parser_class()
+    built = ply.yacc.yacc(module=instance, debug=False, tabmodule=NO_TABLES, write_tables=False,
+                          start='jsonpath', errorlog=ply.yacc.NullLogger())
+    tokens = instance.lexer_class().tokenize(expression)
+    return built.parse(lexer=parser.IteratorToTokenStream(tokens))
+
+
+def bench(parser_class, expression, number, rebuild):
+    def run():
+        if rebuild:
+            parse_rebuilding_tables(parser_class, expression)
+        else:
+            parser_class().parse(expression)
+
+    run()
+    return min(timeit.repeat(run, number=number, repeat=5)) / number
+
+
+def bench_tokenize(parser_class, expression, number):
+    lexer = parser_class().lexer_class()
+    return min(timeit.repeat(lambda: list(lexer.tokenize(expression)), number=number, repeat=5)) / number
+
+
+def bench_descent_tokenize(parser_class, expression, number):
+    tokenizer = get_tokenizer(DESCENT_PARSERS[parser_class].tokenizer_class)
+    return min(timeit.repeat(lambda: tokenizer.tokenize(expression), number=number, repeat=5)) / number
+
+
+def main(number=200):
+    for parser_class, expression in EXPRESSIONS.items():
+        before = bench(parser_class, expression, max(1, number // 20), rebuild=True)
+        after = bench(parser_class, expression, number, rebuild=False)
+        print('%-24s %-40r rebuild tables: %8.1f us  shared tables: %8.1f us  (%.0fx)'
+              % (parser_class.__name__, expression, before * 1e6, after * 1e6, before / after))
+        descent = bench(DESCENT_PARSERS[parser_class], expression, number, rebuild=False)
+        print('%-24s %-40r descent: %8.1f us  (%.1fx shared tables)'
+              % (parser_class.__name__, expression, descent * 1e6, after / descent))
+        print('%-24s %-40r tokenize: %8.1f us  descent tokenize: %8.1f us'
+              % (parser_class.__name__, expression, bench_tokenize(parser_class, expression, number) * 1e6,
+                 bench_descent_tokenize(parser_class, expression, number) * 1e6))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,42 @@
+"""
+Warm-up cost of a large rule set: `parse()` called once per rule versus
+`parse_many()` on the whole set, in process and with a process pool.
+
+The rule set repeats each distinct expression `repeat` times, and holds more
+distinct expressions than the process-wide parse cache.
+
+Usage: PYTHONPATH=. python benchmarks/bench_parse_many.py [rules] [repeat] [workers]
+"""
+import sys
+import time
+
+from jsonpath_ng.cache import parse_cache
+from jsonpath_ng.ext import parse, parse_many
+
+
+def rule_set(rules, repeat):
+    unique = ['$.routes[?(@.name == route%d)].targets[%d].host' % (i, i % 7)
+              for i in range(rules // repeat)]
+    return unique * repeat
+
+
+def timed(function):
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main(rules=20000, repeat=4, workers=4):
+    strings = rule_set(int(rules), int(repeat))
+    parse_cache.clear()
+    one_by_one = timed(lambda: [parse(string) for string in strings])
+    in_process = timed(lambda: parse_many(strings))
+    pooled = timed(lambda: parse_many(strings, workers=int(workers)))
+    print('%d rules, %d distinct' % (len(strings), len(set(strings))))
+    print('parse() per rule:           %8.3f s' % one_by_one)
+    print('parse_many():               %8.3f s' % in_process)
+    print('parse_many(workers=%d):      %8.3f s' % (int(workers), pooled))
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
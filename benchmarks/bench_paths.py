@@ -0,0 +1,40 @@
+"""
+Cost of the paths of the matches of `find()`: `full_path` and `path_tuple`
+for every match of a query over a deep document, and of a `where` clause
+using `$`.
+
+Usage: PYTHONPATH=. python benchmarks/bench_paths.py [depth] [width]
+"""
+import sys
+import time
+
+from jsonpath_ng.ext import parse
+
+
+def document(depth, width):
+    node = {'leaf': [{'value': i} for i in range(width)]}
+    for level in range(depth):
+        node = {'level%d' % level: node, 'limit': width // 2}
+    return node
+
+
+def timed(function):
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main(depth=20, width=20000):
+    data = document(int(depth), int(width))
+    matches = parse('$..value').find(data)
+    print('%d matches at depth %d' % (len(matches), int(depth) + 2))
+    print('full_path:       %8.1f ms' % (timed(lambda: [m.full_path for m in matches]) * 1e3))
+    print('full_path again: %8.1f ms' % (timed(lambda: [m.full_path for m in matches]) * 1e3))
+    print('path_tuple:      %8.1f ms' % (timed(lambda: [m.path_tuple for m in matches]) * 1e3))
+
+    expression = parse('$..leaf[*] where $.limit')
+    print('where with $:    %8.1f ms' % (timed(lambda: expression.find(data)) * 1e3))
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
@@ -0,0 +1,41 @@
+"""
+Filters and `where` whose predicates have many matches in each item, so
+that stopping at the first failing expression, or at the first match of
+each, saves most of their evaluation. Interpreted and compiled.
+
+Usage: PYTHONPATH=. python benchmarks/bench_predicates.py [items]
+"""
+import sys
+import time
+
+from jsonpath_ng.ext import parse
+
+EXPRESSIONS = (
+    '$.items[?a == 1 & b.c..d > 3]',
+    '$.items[?b.c[*].d > 3]',
+    '$.items[?(b.c[*].d)]',
+    '($.items[*]) where (b.c[*].d)',
+)
+
+
+def document(items):
+    return {'items': [{'a': i % 10, 'b': {'c': [{'d': j} for j in range(50)]}} for i in range(items)]}
+
+
+def timed(function, data):
+    start = time.perf_counter()
+    function(data)
+    return time.perf_counter() - start
+
+
+def main(items=5000):
+    data = document(int(items))
+    for string in EXPRESSIONS:
+        expression = parse(string)
+        interpreted = timed(expression.find, data)
+        compiled = timed(expression.compile().find, data)
+        print('%-34r interpreted %8.1f ms  compiled %8.1f ms' % (string, interpreted * 1e3, compiled * 1e3))
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
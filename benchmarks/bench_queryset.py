@@ -0,0 +1,45 @@
+"""
+An extraction step of many rules sharing prefixes, run rule by rule and as
+one `QuerySet`.
+
+Usage: PYTHONPATH=. python benchmarks/bench_queryset.py [items] [rules]
+"""
+import sys
+import time
+
+from jsonpath_ng import parse
+from jsonpath_ng.queryset import QuerySet
+
+
+def document(items):
+    return {'order': {
+        'id': 1,
+        'customer': {'name': 'ann', 'address': {'city': 'x', 'zip': '1'}},
+        'items': [dict({'field%d' % j: j for j in range(20)}, sku=i, meta={'tag': i % 7}) for i in range(items)],
+    }}
+
+
+def rules(count):
+    templates = ('$.order.items[*].field%d', '$.order.customer.address.city', '$..tag', '$.order..sku',
+                 '$.order.items[%d].meta')
+    return [parse(templates[i % len(templates)].replace('%d', str(i % 20))) for i in range(count)]
+
+
+def timed(function):
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main(items=2000, count=200):
+    data = document(int(items))
+    expressions = rules(int(count))
+    queries = QuerySet(expressions)
+
+    print('%d rules' % len(expressions))
+    print('one by one    %8.1f ms' % (timed(lambda: [expression.find(data) for expression in expressions]) * 1e3))
+    print('QuerySet      %8.1f ms' % (timed(lambda: queries.find(data)) * 1e3))
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
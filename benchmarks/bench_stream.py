@@ -0,0 +1,63 @@
+"""
+Time and peak memory (traced by tracemalloc, in a second run as tracing
+slows the pure Python parser down) of `json.load` followed by `find()`,
+and of `iter_stream()`, for queries over a generated JSON file.
+
+Usage: PYTHONPATH=. python benchmarks/bench_stream.py [services]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from jsonpath_ng.ext import parse
+from jsonpath_ng.stream import iter_stream
+
+sys.path.insert(0, os.path.dirname(__file__))
+from bench_descendant_keys import document  # noqa: E402
+
+EXPRESSIONS = (
+    '$.services[*].name',
+    '$.services[?enabled].settings.timeout',
+    '$..price',
+)
+
+
+def measured(function):
+    start = time.perf_counter()
+    count = function()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return count, elapsed, peak / 2 ** 20
+
+
+def main(services=20000):
+    with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as f:
+        json.dump(document(int(services)), f)
+    try:
+        print('%.1f MB file' % (os.path.getsize(f.name) / 2 ** 20))
+        for string in EXPRESSIONS:
+            expression = parse(string)
+
+            def loaded():
+                with open(f.name) as fp:
+                    return len(expression.find(json.load(fp)))
+
+            def streamed():
+                with open(f.name, 'rb') as fp:
+                    return sum(1 for _ in iter_stream(expression, fp))
+
+            for name, function in (('load+find', loaded), ('stream', streamed)):
+                count, elapsed, peak = measured(function)
+                print('%-40r %-10s %7d matches  %6.2f s  %7.1f MB peak' % (string, name, count, elapsed, peak))
+    finally:
+        os.unlink(f.name)
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
@@ -1,5 +1,44 @@
+import sys as _sys
+import types as _types
+
 from .jsonpath import *  # noqa
-from .parser import parse  # noqa
+from . import jsonpath
+
+
+def parse(string, backend=None):
+    """
+    Compiles a JSONPath expression. The parser, and with it PLY, is only
+    loaded on the first call; see `jsonpath_ng.parser.parse`.
+    """
+    from . import parser
+    return parser.parse(string, backend)
+
+
+def parse_many(strings, parser=None, workers=None, backend=None):
+    """
+    Compiles many expressions at once; see `jsonpath_ng.parser.parse_many`.
+    """
+    from .parser import parse_many
+    return parse_many(strings, parser, workers, backend)
+
+
+class _Package(_types.ModuleType):
+    """
+    Forwards `auto_id_field` to `jsonpath_ng.jsonpath`, where it is read, so
+    that reading or setting it on the package keeps working now that the
+    star import leaves it out.
+    """
+
+    @property
+    def auto_id_field(self):
+        return jsonpath.auto_id_field
+
+    @auto_id_field.setter
+    def auto_id_field(self, value):
+        jsonpath.auto_id_field = value
+
+
+_sys.modules[__name__].__class__ = _Package
 
 
 # Current package version
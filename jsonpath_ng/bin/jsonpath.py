@@ -13,8 +13,11 @@ import argparse
 
 # JsonPath-RW imports
 from jsonpath_ng import parse
+from jsonpath_ng.stream import iter_stream
 
-def find_matches_for_file(expr, f):
+def find_matches_for_file(expr, f, stream=False):
+    if stream:
+        return iter_stream(expr, f)
     return expr.find(json.load(f))
 
 def print_matches(matches):
@@ -48,6 +51,8 @@ def main(*argv):
 
     parser.add_argument('expression', help='A JSONPath expression.')
     parser.add_argument('files', metavar='file', nargs='*', help='Files to search (if none, searches stdin)')
+    parser.add_argument('--stream', action='store_true',
+                        help='Read the files as they are searched rather than loading them whole')
 
     args = parser.parse_args(argv[1:])
 
@@ -56,13 +61,13 @@ def main(*argv):
 
     if len(glob_patterns) == 0:
         # stdin mode
-        print_matches(find_matches_for_file(expr, sys.stdin))
+        print_matches(find_matches_for_file(expr, sys.stdin, args.stream))
     else:
         # file paths mode
         for pattern in glob_patterns:
             for filename in glob.glob(pattern):
                 with open(filename) as f:
-                    print_matches(find_matches_for_file(expr, f))
+                    print_matches(find_matches_for_file(expr, f, args.stream))
 
 def entry_point():
     main(*sys.argv)
@@ -0,0 +1,192 @@
+import os
+import pickle
+import threading
+from collections import OrderedDict, namedtuple
+
+from jsonpath_ng import __version__
+from jsonpath_ng.interning import intern
+
+# Number of compiled expressions kept by the process-wide cache
+DEFAULT_CACHE_SIZE = 1024
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'evictions', 'maxsize', 'currsize'])
+
+
+class ParseCache:
+    """
+    A thread-safe, bounded LRU cache of compiled `JSONPath` expressions,
+    keyed by the parser class and the expression string.
+
+    The cached ASTs are shared between callers, and those it parses are
+    interned so that identical subexpressions of different expressions are
+    shared too; AST nodes are immutable. A `maxsize` of 0 disables caching
+    altogether.
+    """
+
+    def __init__(self, maxsize=DEFAULT_CACHE_SIZE, directory=None):
+        if maxsize < 0:
+            raise ValueError('maxsize must be >= 0, got %r' % maxsize)
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.store = None
+        self.persist(directory)
+
+    def parse(self, parser_class, string):
+        """
+        Returns the compiled expression for `string`, parsing it with a fresh
+        `parser_class()` on a miss. Parse errors propagate and are not cached.
+        """
+        key = (parser_class, string)
+        with self._lock:
+            try:
+                result = self._entries[key]
+            except KeyError:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return result
+
+        # Parse outside of the lock; concurrent misses on the same key
+        # simply race to store equivalent results.
+        # Expressions loaded from the store are not interned, which would
+        # take most of the time of a restart: they share no nodes with other
+        # expressions, but each is still cached and shared as a whole
+        store = self.store
+        result = store.get(parser_class, string) if store is not None else None
+        if result is None:
+            result = intern(parser_class().parse(string))
+            if store is not None:
+                store.add(parser_class, string, result)
+
+        with self._lock:
+            if self.maxsize:
+                self._entries[key] = result
+                self._entries.move_to_end(key)
+                self._evict()
+        return result
+
+    def persist(self, directory):
+        """
+        Backs the cache with an `ExpressionStore` in `directory`, so that
+        compiled expressions survive process restarts, or stops doing so if
+        `directory` is None.
+        """
+        self.store = ExpressionStore(directory) if directory is not None else None
+
+    def resize(self, maxsize):
+        """
+        Changes the maximum number of cached expressions, evicting the
+        least recently used ones if the cache shrinks.
+        """
+        if maxsize < 0:
+            raise ValueError('maxsize must be >= 0, got %r' % maxsize)
+        with self._lock:
+            self.maxsize = maxsize
+            self._evict()
+
+    def clear(self):
+        """
+        Drops every cached expression and resets the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def cache_info(self):
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.evictions, self.maxsize, len(self._entries))
+
+    def _evict(self):
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+
+class ExpressionStore:
+    """
+    A persistent, append-only store of compiled expressions, used much like
+    `__pycache__`: each parser class gets one file in `directory`, named
+    after the class and the library version, holding a sequence of pickled
+    (string, pickled expression) records.
+
+    A file is read the first time its parser class is looked up, but each
+    expression is only unpickled when it is requested. Every newly parsed
+    expression is appended with a single write, so that processes sharing
+    the directory do not clobber each other.
+
+    The store is an optimization only: unreadable records are skipped and
+    write errors are ignored. Since loading unpickles the files, the
+    directory must be as trusted as the code itself.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._tables = {}
+        self._lock = threading.Lock()
+
+    def path(self, parser_class):
+        return os.path.join(self.directory, '%s.%s-%s.pickle'
+                            % (parser_class.__module__, parser_class.__qualname__, __version__))
+
+    def get(self, parser_class, string):
+        """
+        Returns the stored expression for `string`, or None.
+        """
+        data = self._table(parser_class).get(string)
+        if data is None:
+            return None
+        try:
+            return pickle.loads(data)
+        except Exception:
+            return None
+
+    def add(self, parser_class, string, expression):
+        table = self._table(parser_class)
+        try:
+            data = pickle.dumps(expression, pickle.HIGHEST_PROTOCOL)
+            record = pickle.dumps((string, data), pickle.HIGHEST_PROTOCOL)
+            os.makedirs(self.directory, exist_ok=True)
+            with open(self.path(parser_class), 'ab') as f:
+                f.write(record)
+        except (OSError, pickle.PicklingError, TypeError, AttributeError):
+            return
+        table[string] = data
+
+    def _table(self, parser_class):
+        try:
+            return self._tables[parser_class]
+        except KeyError:
+            pass
+        with self._lock:
+            if parser_class not in self._tables:
+                self._tables[parser_class] = self._load(self.path(parser_class))
+            return self._tables[parser_class]
+
+    @staticmethod
+    def _load(path):
+        table = {}
+        try:
+            with open(path, 'rb') as f:
+                while True:
+                    string, data = pickle.load(f)
+                    table[string] = data
+        except Exception:
+            # End of file, a record truncated by a crashed writer, or no file yet
+            pass
+        return table
+
+
+# The cache used by `jsonpath_ng.parse` and `jsonpath_ng.ext.parse`, persisted
+# to $JSONPATH_NG_CACHE_DIR if set
+parse_cache = ParseCache(directory=os.environ.get('JSONPATH_NG_CACHE_DIR') or None)
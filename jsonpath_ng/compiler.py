@@ -0,0 +1,613 @@
+"""
+Compilation of `JSONPath` ASTs to chains of Python closures.
+
+The interpreter (`find()`, `find_values()`, `update()` on the nodes) walks
+the AST for every datum and builds intermediate lists or generators at each
+step. `compile()` instead turns the AST into one closure per node, bound to
+the closure of the next step, so that a match flows through the whole chain
+as a plain function call: every step receives a value (or a
+`DatumInContext`) and a list of results, and passes what it matches on to
+the next step, the last of which appends to the list.
+
+Node types without a compiler here, or registered by an extension, are
+evaluated by the interpreter, so any AST can be compiled: from inside the
+chain when they are found, and as the whole subtree containing them when
+they are tested, updated or only their values are wanted. The compiled expression returns the same results as the
+interpreter, including the paths and contexts of the matches.
+"""
+from jsonpath_ng import jsonpath
+from jsonpath_ng.jsonpath import (
+    JSONPath, DatumInContext, IndexedDatum, Root, Child, Where, Descendants, Union,
+    Fields, Index, Slice, NOT_SET, _Wrapped, _needs_context, _set,
+)
+
+# The step compilers of each node type, by exact type, so that subclasses
+# overriding the evaluation methods fall back to the interpreter
+_value_steps = {}
+_find_steps = {}
+_updaters = {}
+
+
+def register(node_class, values=None, find=None, update=None):
+    """
+    Registers the compilers of `node_class`:
+
+    - `values(node, next_step)` and `find(node, next_step)` return a
+      `step(value, out)` function which calls `next_step(match, out)` for
+      each match of `node` in `value`: plain values for `values`, and
+      `DatumInContext`s as built by `node.find()` for `find`;
+    - `update(node)` returns an `update(data, val)` function equivalent to
+      `node.update`.
+    """
+    if values is not None:
+        _value_steps[node_class] = values
+    if find is not None:
+        _find_steps[node_class] = find
+    if update is not None:
+        _updaters[node_class] = update
+
+
+def _compiled(node):
+    """
+    Whether `node` is compiled throughout, rather than having nodes without
+    compilers evaluated by the interpreter from inside its chain. The steps
+    of such nodes see the plain values and matches of the chain, where the
+    interpreter would have passed them its own, so expressions containing
+    them are left to the interpreter where the two could differ.
+    """
+    if type(node) not in _value_steps and type(node) not in _find_steps:
+        return False
+    if type(node) in (Child, Where, Descendants, Union):
+        return _compiled(node.left) and _compiled(node.right)
+    return True
+
+
+def append(value, out):
+    """The last step of every chain"""
+    out.append(value)
+
+
+def values_step(node, next_step):
+    """
+    Compiles `node` to a step producing the values of its matches. `node`
+    must not need the context of the values (see `_needs_context`).
+    """
+    compiler = _value_steps.get(type(node))
+    if compiler is not None:
+        return compiler(node, next_step)
+
+    iter_values = node._iter_values
+
+    def step(value, out):
+        for match in iter_values(value):
+            next_step(match, out)
+    return step
+
+
+def find_step(node, next_step):
+    """Compiles `node` to a step producing its matches."""
+    compiler = _find_steps.get(type(node))
+    if compiler is not None:
+        return compiler(node, next_step)
+
+    iter_find = node.iter_find
+
+    def step(datum, out):
+        for match in iter_find(datum):
+            next_step(match, out)
+    return step
+
+
+def updater(node):
+    """Compiles `node.update`."""
+    compiler = _updaters.get(type(node))
+    return node.update if compiler is None else compiler(node)
+
+
+def values_function(node):
+    """
+    Compiles `[match.value for match in node.find(value)]`, for a plain
+    `value`.
+    """
+    if _needs_context(node) or not _compiled(node):
+        find = node.find
+        return lambda value: [match.value for match in find(value)]
+
+    step = values_step(node, append)
+
+    def values(value):
+        matches = []
+        step(value, matches)
+        return matches
+    return values
+
+
+class _Found(Exception):
+    """Raised by the last step of a predicate at the first match"""
+
+
+def values_predicate(node, test=None):
+    """
+    Compiles the truth of `node.find(value)`, for a plain `value`: whether
+    it has any match, or with `test`, any match whose value passes `test`.
+    The predicate stops evaluating `node` at the first such match.
+    """
+    if _needs_context(node) or not _compiled(node):
+        iter_find = node.iter_find
+        if test is None:
+            return lambda value: next(iter_find(value), NOT_SET) is not NOT_SET
+        return lambda value: any(test(match.value) for match in iter_find(value))
+
+    def found(value, out):
+        if test is None or test(value):
+            raise _Found
+
+    step = values_step(node, found)
+
+    def predicate(value):
+        try:
+            step(value, None)
+        except _Found:
+            return True
+        return False
+    return predicate
+
+
+def find_predicate(node):
+    """
+    Compiles the truth of `node.find(datum)`, stopping at the first match.
+    """
+    def found(match, out):
+        raise _Found
+
+    step = find_step(node, found)
+
+    def predicate(datum):
+        try:
+            step(datum, None)
+        except _Found:
+            return True
+        return False
+    return predicate
+
+
+class CompiledJSONPath(JSONPath):
+    """
+    An expression compiled to closures by `JSONPath.compile()`.
+
+    It evaluates `find()`, `find_values()` and `update()` with the compiled
+    closures, and everything else with the interpreter. When auto ids are
+    enabled it uses the interpreter throughout.
+    """
+
+    __slots__ = ('expression', '_find', '_values', '_update')
+
+    def __init__(self, expression):
+        _set(self, 'expression', expression)
+        _set(self, '_find', find_step(expression, append))
+        _set(self, '_values', None if _needs_context(expression) or not _compiled(expression)
+             else values_step(expression, append))
+        _set(self, '_update', updater(expression))
+
+    def find(self, data):
+        # The interpreter looks matches up in indexes, the compiled steps
+        # would walk the document
+        if jsonpath.auto_id_field is not None or isinstance(data, IndexedDatum):
+            return self.expression.find(data)
+        matches = []
+        self._find(data, matches)
+        return matches
+
+    def iter_find(self, data):
+        return self.expression.iter_find(data)
+
+    def find_or_create(self, data):
+        return self.expression.find_or_create(data)
+
+    def find_values(self, data):
+        if (self._values is None or jsonpath.auto_id_field is not None
+                or isinstance(data, DatumInContext)):
+            return self.expression.find_values(data)
+        values = []
+        self._values(data, values)
+        return values
+
+    def iter_values(self, data):
+        return self.expression.iter_values(data)
+
+    def count(self, data):
+        return self.expression.count(data)
+
+    def update(self, data, val):
+        if jsonpath.auto_id_field is not None:
+            return self.expression.update(data, val)
+        return self._update(data, val)
+
+    def update_or_create(self, data, val):
+        return self.expression.update_or_create(data, val)
+
+    def filter(self, fn, data):
+        return self.expression.filter(fn, data)
+
+    def compile(self):
+        return self
+
+    def __eq__(self, other):
+        return isinstance(other, CompiledJSONPath) and self.expression == other.expression
+
+    def __hash__(self):
+        return hash((CompiledJSONPath, self.expression))
+
+    def __reduce__(self):
+        return self.__class__, (self.expression,)
+
+    def __repr__(self):
+        return '%s(%r)' % (self.__class__.__name__, self.expression)
+
+    def __str__(self):
+        return str(self.expression)
+
+
+# ===================== Values =====================
+
+def _root_values(node, next_step):
+    # Only compiled when `$` starts the expression: the value is the root
+    return next_step
+
+
+def _child_values(node, next_step):
+    return values_step(node.left, values_step(node.right, next_step))
+
+
+def _where_values(node, next_step):
+    if _compiled(node.right):
+        predicate = find_predicate(node.right)
+    else:
+        iter_values = node.right._iter_values
+
+        def predicate(value):
+            # As `Where._iter_values`
+            return next(iter(iter_values(value)), NOT_SET) is not NOT_SET
+
+    def step(value, out):
+        if predicate(value):
+            next_step(value, out)
+    return values_step(node.left, step)
+
+
+def _descendants_values(node, next_step):
+    right = values_step(node.right, next_step)
+    test = jsonpath._descendant_test(node.right)
+
+    def step(value, out):
+        # `jsonpath._walk`, inlined
+        stack = [iter((value,))]
+        while stack:
+            for value in stack[-1]:
+                if test is None or test(value):
+                    right(value, out)
+                if isinstance(value, list):
+                    stack.append(iter(value))
+                    break
+                elif isinstance(value, dict):
+                    stack.append(iter(value.values()))
+                    break
+            else:
+                stack.pop()
+    return values_step(node.left, step)
+
+
+def _union_values(node, next_step):
+    if node.unique:
+        # Matches are told apart by their paths, which the interpreter builds
+        iter_values = node._iter_values
+
+        def step(value, out):
+            for match in iter_values(value):
+                next_step(match, out)
+        return step
+
+    left = values_step(node.left, next_step)
+    right = values_step(node.right, next_step)
+
+    def step(value, out):
+        left(value, out)
+        right(value, out)
+    return step
+
+
+def _fields_values(node, next_step):
+    fields = node.fields
+    if '*' in fields:
+        def step(value, out):
+            try:
+                keys = tuple(value.keys())
+            except AttributeError:
+                return
+            for key in keys:
+                try:
+                    field_value = value.get(key, NOT_SET)
+                except (TypeError, AttributeError):
+                    continue
+                if field_value is not NOT_SET:
+                    next_step(field_value, out)
+        return step
+
+    if len(fields) != 1:
+        def step(value, out):
+            for field in fields:
+                try:
+                    field_value = value.get(field, NOT_SET)
+                except (TypeError, AttributeError):
+                    continue
+                if field_value is not NOT_SET:
+                    next_step(field_value, out)
+        return step
+
+    field, = fields
+    if next_step is append:
+        def step(value, out):
+            try:
+                field_value = value.get(field, NOT_SET)
+            except (TypeError, AttributeError):
+                return
+            if field_value is not NOT_SET:
+                out.append(field_value)
+    else:
+        def step(value, out):
+            try:
+                field_value = value.get(field, NOT_SET)
+            except (TypeError, AttributeError):
+                return
+            if field_value is not NOT_SET:
+                next_step(field_value, out)
+    return step
+
+
+def _index_values(node, next_step):
+    index = node.index
+
+    def step(value, out):
+        if value and len(value) > index:
+            next_step(value[index], out)
+    return step
+
+
+def _slice_values(node, next_step):
+    bounds = slice(node.start, node.end, node.step)
+
+    def step(value, out):
+        if not value:
+            return
+        if isinstance(value, (dict, int, str)):
+            value = [value]
+        for i in range(0, len(value))[bounds]:
+            next_step(value[i], out)
+    return step
+
+
+# ===================== Matches =====================
+
+def _child_find(node, next_step):
+    # Auto ids, which `Child` does not descend into, use the interpreter
+    return find_step(node.left, find_step(node.right, next_step))
+
+
+def _where_find(node, next_step):
+    predicate = find_predicate(node.right) if _compiled(node.right) else node.right.exists
+
+    def step(datum, out):
+        if predicate(datum):
+            next_step(datum, out)
+    return find_step(node.left, step)
+
+
+def _descendants_find(node, next_step):
+    right = find_step(node.right, next_step)
+    test = jsonpath._descendant_test(node.right)
+    if test is not None:
+        walk_hits = jsonpath._walk_hits
+
+        def step(datum, out):
+            for descendant in walk_hits(datum, test):
+                right(descendant, out)
+        return find_step(node.left, step)
+
+    child_data = jsonpath._child_data
+
+    def step(datum, out):
+        # `jsonpath._walk`, inlined
+        stack = [iter((datum,))]
+        while stack:
+            for datum in stack[-1]:
+                right(datum, out)
+                children = child_data(datum)
+                if children is not None:
+                    stack.append(children)
+                    break
+            else:
+                stack.pop()
+    return find_step(node.left, step)
+
+
+def _union_find(node, next_step):
+    if node.unique:
+        left = find_step(node.left, append)
+        right = find_step(node.right, append)
+
+        def step(datum, out):
+            matches = []
+            left(datum, matches)
+            right(datum, matches)
+            for match in jsonpath._unique_paths(matches):
+                next_step(match, out)
+        return step
+
+    left = find_step(node.left, next_step)
+    right = find_step(node.right, next_step)
+
+    def step(datum, out):
+        left(datum, out)
+        right(datum, out)
+    return step
+
+
+def _fields_find(node, next_step):
+    fields = node.fields
+    if '*' in fields or len(fields) != 1:
+        iter_find = node.iter_find
+
+        def step(datum, out):
+            for match in iter_find(datum):
+                next_step(match, out)
+        return step
+
+    field, = fields
+    # Nodes are immutable, so all the matches share a path node
+    path = Fields(field)
+
+    def step(datum, out):
+        if not isinstance(datum, DatumInContext):
+            datum = DatumInContext(datum)
+        try:
+            field_value = datum.value.get(field, NOT_SET)
+        except (TypeError, AttributeError):
+            return
+        if field_value is not NOT_SET:
+            next_step(DatumInContext(field_value, path=path, context=datum), out)
+    return step
+
+
+def _index_find(node, next_step):
+    index = node.index
+
+    def step(datum, out):
+        if not isinstance(datum, DatumInContext):
+            datum = DatumInContext(datum)
+        value = datum.value
+        if value and len(value) > index:
+            next_step(DatumInContext(value[index], path=node, context=datum), out)
+    return step
+
+
+def _slice_find(node, next_step):
+    bounds = slice(node.start, node.end, node.step)
+
+    def step(datum, out):
+        if not isinstance(datum, DatumInContext):
+            datum = DatumInContext(datum)
+        value = datum.value
+        if not value:
+            return
+        if isinstance(value, (dict, int, str)):
+            value = _Wrapped([value])
+            datum = DatumInContext(value, path=datum.path, context=datum.context)
+        for i in range(0, len(value))[bounds]:
+            next_step(DatumInContext(value[i], path=Index(i), context=datum), out)
+    return step
+
+
+# ===================== Updates =====================
+
+def _child_update(node):
+    if _needs_context(node.left) or not _compiled(node):
+        return node.update
+    left = values_step(node.left, append)
+    right = updater(node.right)
+
+    def update(data, val):
+        values = []
+        left(data, values)
+        for value in values:
+            right(value, val)
+        return data
+    return update
+
+
+def _descendants_update(node):
+    if _needs_context(node.left) or not _compiled(node):
+        return node.update
+    left = values_step(node.left, append)
+    right = updater(node.right)
+
+    child_values = jsonpath._child_values
+
+    def update(data, val):
+        values = []
+        left(data, values)
+        for value in values:
+            # `jsonpath._walk`, inlined, over the lists and dicts: only
+            # mutable values corresponding to JSON types are updated
+            stack = [iter((value,))]
+            while stack:
+                for value in stack[-1]:
+                    if isinstance(value, (list, dict)):
+                        right(value, val)
+                        stack.append(child_values(value))
+                        break
+                else:
+                    stack.pop()
+        return data
+    return update
+
+
+def _fields_update(node):
+    fields = node.fields
+    wildcard = '*' in fields
+
+    def update(data, val):
+        if data is not None:
+            if wildcard:
+                try:
+                    keys = tuple(data.keys())
+                except AttributeError:
+                    keys = ()
+            else:
+                keys = fields
+            call = hasattr(val, '__call__')
+            for field in keys:
+                if type(data) is not bool and field in data:
+                    if call:
+                        data[field] = val(data[field], data, field)
+                    else:
+                        data[field] = val
+        return data
+    return update
+
+
+def _index_update(node):
+    index = node.index
+
+    def update(data, val):
+        if hasattr(val, '__call__'):
+            data[index] = val.__call__(data[index], data, index)
+        elif len(data) > index:
+            data[index] = val
+        return data
+    return update
+
+
+def _slice_update(node):
+    bounds = slice(node.start, node.end, node.step)
+
+    def update(data, val):
+        if type(data) is not list or not data:
+            return node.update(data, val)
+        call = hasattr(val, '__call__')
+        for i in range(0, len(data))[bounds]:
+            if call:
+                data[i] = val(data[i], data, i)
+            else:
+                data[i] = val
+        return data
+    return update
+
+
+register(Root, values=_root_values)
+register(Child, values=_child_values, find=_child_find, update=_child_update)
+register(Where, values=_where_values, find=_where_find)
+register(Descendants, values=_descendants_values, find=_descendants_find, update=_descendants_update)
+register(Union, values=_union_values, find=_union_find)
+register(Fields, values=_fields_values, find=_fields_find, update=_fields_update)
+register(Index, values=_index_values, find=_index_find, update=_index_update)
+register(Slice, values=_slice_values, find=_slice_find, update=_slice_update)
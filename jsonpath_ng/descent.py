@@ -0,0 +1,351 @@
+import re
+
+from jsonpath_ng.exceptions import JsonPathLexerError, JsonPathParserError
+from jsonpath_ng.jsonpath import (
+    Child, Descendants, Fields, Index, Intersect, Parent, Root, Slice, This, Union, Where,
+)
+from jsonpath_ng.lexer import JsonPathLexer
+
+
+class Token:
+    """A token of `Tokenizer`, with the attributes the parsers use of PLY's"""
+
+    __slots__ = ('type', 'value', 'lineno', 'lexpos', 'col')
+
+    def __init__(self, type, value, lineno, lexpos, col):
+        self.type = type
+        self.value = value
+        self.lineno = lineno
+        self.lexpos = lexpos
+        self.col = col
+
+    def __repr__(self):
+        return 'Token(%s,%r,%d,%d)' % (self.type, self.value, self.lineno, self.lexpos)
+
+
+class Tokenizer:
+    """
+    Tokenizes expressions for the descent parsers without going through
+    PLY: the rules of `lexer_class` are tried in one regex, in the order PLY
+    tries them (functions by line, then strings by decreasing length), and
+    give the same tokens, positions and errors.
+    """
+
+    lexer_class = JsonPathLexer
+
+    rules = (
+        'ID', 'NUMBER', 'quoted_singlequote', 'quoted_doublequote', 'quoted_backquote',
+        'singlequote', 'doublequote', 'backquote', 'newline', 'DOUBLEDOT',
+    )
+
+    # What the rules that return tokens make of the text they match
+    values = {
+        'NUMBER': int,
+    }
+
+    quotes = {
+        "'": ('ID', 'singlequoted field'),
+        '"': ('ID', 'doublequoted field'),
+        '`': ('NAMED_OPERATOR', 'backquoted operator'),
+    }
+
+    def __init__(self):
+        lexer_class = self.lexer_class
+        regexes = []
+        for name in self.rules:
+            rule = getattr(lexer_class, 't_' + name)
+            regexes.append('(?P<%s>%s)' % (name, getattr(rule, 'regex', rule)))
+        # PLY compiles its rules verbose
+        self.regex = re.compile('|'.join(regexes), re.VERBOSE)
+        self.literals = frozenset(lexer_class.literals)
+        self.ignore = frozenset(lexer_class.t_ignore)
+        self.reserved_words = lexer_class.reserved_words
+        # What the per-character states accept, from the opening quote
+        self.unterminated = {quote: re.compile(r'%s(?:[^%s\\]|\\.)*' % (quote, quote)) for quote in self.quotes}
+
+    def tokenize(self, string):
+        """
+        Returns the tokens of `string`, and the `JsonPathLexerError` the lexer
+        would raise after them, or None.
+        """
+        tokens = []
+        append = tokens.append
+        match = self.regex.match
+        literals, ignore, values = self.literals, self.ignore, self.values
+        lineno, newline, position, end = 1, 0, 0, len(string)
+
+        while position < end:
+            char = string[position]
+            if char in ignore:
+                position += 1
+                continue
+            m = match(string, position)
+            if m is None:
+                if char not in literals:
+                    return tokens, JsonPathLexerError('Error on line %s, col %s: Unexpected character: %s '
+                                                      % (lineno, position - newline, char))
+                append(Token(char, char, lineno, position, position - newline))
+                position += 1
+                continue
+
+            kind, text, next_position = m.lastgroup, m.group(), m.end()
+            if kind == 'ID':
+                append(Token(self.reserved_words.get(text, 'ID'), text, lineno, position, position - newline))
+            elif kind.startswith('quoted_'):
+                # At the closing quote, as `JsonPathLexer` places them
+                position = next_position - 1
+                value = JsonPathLexer.unescape(text[1:-1])
+                append(Token(self.quotes[char][0], value, lineno, position, position - newline))
+            elif kind == 'newline':
+                lineno += 1
+                newline = position
+            elif char in self.quotes:
+                return tokens, self.unterminated_error(string, position, lineno, newline)
+            else:
+                value = values[kind](text) if kind in values else text
+                append(Token(kind, value, lineno, position, position - newline))
+            position = next_position
+
+        return tokens, None
+
+    def unterminated_error(self, string, position, lineno, newline):
+        # The quote was not closed: the per-character state of the lexer
+        # stops either at a backslash it cannot escape or at the end.
+        quote = string[position]
+        position = self.unterminated[quote].match(string, position).end()
+        if position == len(string):
+            return JsonPathLexerError('Unexpected EOF in string literal or identifier')
+        return JsonPathLexerError('Error on line %s, col %s while lexing %s: Unexpected character: %s '
+                                  % (lineno, position - newline, self.quotes[quote][1], string[position]))
+
+
+class TokenStream:
+    """
+    The tokens of one expression, with a cursor. Tokens are pulled from the
+    lexer on demand, or come tokenized with the `error` the lexer raises
+    after them, so that errors surface in the same order as with PLY.
+    """
+
+    def __init__(self, token_iterator=(), tokens=(), error=None):
+        self.token_iterator = iter(token_iterator)
+        self.tokens = list(tokens)
+        self.error = error
+        self.position = 0
+
+    def peek(self, offset=0):
+        index = self.position + offset
+        tokens = self.tokens
+        if index < len(tokens):
+            return tokens[index]
+        while len(tokens) <= index:
+            token = next(self.token_iterator, None)
+            if token is None:
+                if self.error is not None:
+                    raise self.error
+                return None
+            tokens.append(token)
+        return tokens[index]
+
+    def peek_type(self, offset=0):
+        token = self.peek(offset)
+        return None if token is None else token.type
+
+    def next(self):
+        token = self.peek()
+        if token is None:
+            raise_parse_error(None)
+        self.position += 1
+        return token
+
+    def expect(self, token_type):
+        token = self.peek()
+        if token is None or token.type != token_type:
+            raise_parse_error(token)
+        self.position += 1
+        return token
+
+
+_tokenizers = {}
+
+
+def get_tokenizer(tokenizer_class):
+    """The shared instance of `tokenizer_class`, whose regex is compiled once"""
+    tokenizer = _tokenizers.get(tokenizer_class)
+    if tokenizer is None:
+        tokenizer = _tokenizers.setdefault(tokenizer_class, tokenizer_class())
+    return tokenizer
+
+
+def raise_parse_error(token):
+    # Same messages as `JsonPathParser.p_error`
+    if token is None:
+        raise JsonPathParserError('Parse error near the end of string!')
+    raise JsonPathParserError('Parse error at %s:%s near token %s (%s)'
+                              % (token.lineno, token.col, token.value, token.type))
+
+
+class JsonPathDescentParser:
+    '''
+    A hand-written recursive-descent parser for JsonPath.
+
+    It accepts the same language as `JsonPathParser` and builds the same
+    ASTs, including the way PLY resolves the grammar's conflicts, but it
+    needs neither LALR tables nor the grammar docstrings, so it is cheaper
+    to set up and works under ``python -OO``.
+    '''
+
+    # Binding levels of the infix tokens, in the order of
+    # `JsonPathParser.precedence`. All binary operators are left-associative.
+    # Brackets bind loosest: `a.b[0]` is `(a.b)[0]`, as with the LALR parser,
+    # where '[' has no precedence and therefore always loses the conflict.
+    levels = {
+        '[': 0,
+        'DOUBLEDOT': 4,
+        '.': 5,
+        '|': 6,
+        '&': 7,
+        'WHERE': 8,
+    }
+
+    # Types of the tokens that can follow a jsonpath, None being the end: the
+    # lookaheads on which the LALR parser reduces a named operator
+    follow = frozenset([None, ')', '.', 'DOUBLEDOT', 'WHERE', '[', '|', '&'])
+
+    binary_operators = {
+        '.': Child,
+        'DOUBLEDOT': Descendants,
+        '|': Union,
+        '&': Intersect,
+        'WHERE': Where,
+    }
+
+    # Tokenizes for the default lexer class
+    tokenizer_class = Tokenizer
+
+    def __init__(self, debug=False, lexer_class=None):
+        self.debug = debug
+        self.lexer_class = lexer_class or self.tokenizer_class.lexer_class
+
+    def parse(self, string, lexer = None):
+        if lexer is None and self.lexer_class is self.tokenizer_class.lexer_class:
+            tokens, error = get_tokenizer(self.tokenizer_class).tokenize(string)
+            return self.parse_tokens(TokenStream(tokens=tokens, error=error))
+        lexer = lexer or self.lexer_class()
+        return self.parse_token_stream(lexer.tokenize(string))
+
+    def parse_token_stream(self, token_iterator, start_symbol='jsonpath'):
+        return self.parse_tokens(TokenStream(token_iterator))
+
+    def parse_tokens(self, tokens):
+        result = self.parse_jsonpath(tokens)
+        if tokens.peek() is not None:
+            raise_parse_error(tokens.peek())
+        return result
+
+    # ===================== Expressions =====================
+
+    def parse_jsonpath(self, tokens, min_level=-1):
+        """
+        Parses a jsonpath, consuming infix operators that bind tighter than
+        `min_level`; -1 consumes everything that can continue the path.
+        """
+        return self.parse_infix(tokens, self.parse_prefix(tokens), min_level)
+
+    def parse_infix(self, tokens, left, min_level):
+        while True:
+            token = tokens.peek()
+            level = None if token is None else self.levels.get(token.type)
+            if level is None or level <= min_level:
+                return left
+            left = self.parse_operator(tokens, left, token, level)
+
+    def parse_operator(self, tokens, left, token, level):
+        if token.type == '[':
+            tokens.next()
+            return Child(left, self.parse_brackets(tokens, left))
+
+        tokens.next()
+        return self.binary_operators[token.type](left, self.parse_jsonpath(tokens, level))
+
+    def parse_prefix(self, tokens):
+        token = tokens.next()
+
+        if token.type == 'ID':
+            return Fields(*self.parse_fields(tokens, token))
+        elif token.type == '*':
+            return Fields('*')
+        elif token.type == 'NAMED_OPERATOR':
+            # PLY reads the lookahead before reducing, so lexer errors
+            # further on, and tokens that cannot follow a path, win over an
+            # unknown operator
+            following = tokens.peek()
+            if following is not None and following.type not in self.follow:
+                raise_parse_error(following)
+            return self.named_operator(token)
+        elif token.type == '$':
+            return Root()
+        elif token.type == '[':
+            return self.parse_brackets(tokens)
+        elif token.type == '(':
+            result = self.parse_jsonpath(tokens)
+            tokens.expect(')')
+            return result
+
+        raise_parse_error(token)
+
+    def named_operator(self, token):
+        if token.value == 'this':
+            return This()
+        elif token.value == 'parent':
+            return Parent()
+        else:
+            raise JsonPathParserError('Unknown named operator `%s` at %s:%s'
+                                      % (token.value, token.lineno, token.lexpos))
+
+    def parse_fields(self, tokens, first):
+        fields = [first.value]
+        while tokens.peek_type() == ',':
+            tokens.next()
+            fields.append(tokens.expect('ID').value)
+        return fields
+
+    # ===================== Brackets =====================
+
+    def parse_brackets(self, tokens, left=None):
+        """
+        Parses what follows a '[' up to the closing ']'. `left` is the path
+        the brackets apply to, or None for a leading bracket.
+        """
+        token_type = tokens.peek_type()
+
+        if token_type == '*':
+            tokens.next()
+            result = Slice()
+        elif token_type == 'NUMBER' and tokens.peek_type(1) == ']':
+            result = Index(tokens.next().value)
+        elif token_type in ('NUMBER', ':'):
+            result = self.parse_slice(tokens)
+        elif token_type == 'ID':
+            result = Fields(*self.parse_fields(tokens, tokens.next()))
+        else:
+            result = self.parse_extended_brackets(tokens, left)
+
+        tokens.expect(']')
+        return result
+
+    def parse_extended_brackets(self, tokens, left):
+        raise_parse_error(tokens.peek())
+
+    def parse_slice(self, tokens):
+        bounds = [self.parse_maybe_int(tokens)]
+        tokens.expect(':')
+        bounds.append(self.parse_maybe_int(tokens))
+        if tokens.peek_type() == ':':
+            tokens.next()
+            bounds.append(self.parse_maybe_int(tokens))
+        return Slice(*bounds)
+
+    def parse_maybe_int(self, tokens):
+        if tokens.peek_type() == 'NUMBER':
+            return tokens.next().value
+        return None
@@ -12,4 +12,20 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
-from .parser import parse  # noqa
+
+def parse(path, debug=False, backend=None):
+    """
+    Compiles a JSONPath expression with the extended grammar. The parser is
+    only loaded on the first call; see `jsonpath_ng.ext.parser.parse`.
+    """
+    from . import parser
+    return parser.parse(path, debug, backend)
+
+
+def parse_many(strings, parser=None, workers=None, backend=None):
+    """
+    Compiles many expressions at once with the extended grammar; see
+    `jsonpath_ng.parser.parse_many`.
+    """
+    from .parser import parse_many
+    return parse_many(strings, parser, workers, backend)
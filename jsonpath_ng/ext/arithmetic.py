@@ -13,6 +13,7 @@
 
 import operator
 from .. import JSONPath, DatumInContext
+from ..jsonpath import _set
 
 
 OPERATOR_MAP = {
@@ -22,12 +23,21 @@ OPERATOR_MAP = {
     '/': operator.truediv,
 }
 
+OPERATOR_SYMBOLS = dict((op, symbol) for symbol, op in OPERATOR_MAP.items())
+
+
+def _operand_key(operand):
+    # Literal operands compare by type as well: `1 + 1` is not `1.0 + 1.0`
+    return operand if isinstance(operand, JSONPath) else (type(operand), operand)
+
 
 class Operation(JSONPath):
+    __slots__ = ('left', 'op', 'right')
+
     def __init__(self, left, op, right):
-        self.left = left
-        self.op = OPERATOR_MAP[op]
-        self.right = right
+        _set(self, 'left', left)
+        _set(self, 'op', OPERATOR_MAP[op])
+        _set(self, 'right', right)
 
     def find(self, datum):
         result = []
@@ -70,3 +80,15 @@ class Operation(JSONPath):
 
     def __str__(self):
         return '%s%s%s' % (self.left, self.op, self.right)
+
+    def __eq__(self, other):
+        return (isinstance(other, Operation) and
+                self.op is other.op and
+                _operand_key(self.left) == _operand_key(other.left) and
+                _operand_key(self.right) == _operand_key(other.right))
+
+    def __hash__(self):
+        return hash((self.left, self.op, self.right))
+
+    def __reduce__(self):
+        return self.__class__, (self.left, OPERATOR_SYMBOLS[self.op], self.right)
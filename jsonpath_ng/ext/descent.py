@@ -0,0 +1,185 @@
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from .. import Fields, This
+from ..descent import JsonPathDescentParser, Tokenizer, raise_parse_error
+from . import arithmetic as _arithmetic
+from . import filter as _filter
+from . import iterable as _iterable
+from . import prepared as _prepared
+from . import string as _string
+from .parser import ExtendedJsonPathLexer
+
+ARITHMETIC_OPERATORS = ('+', '-', '*', '/')
+LITERALS = ('NUMBER', 'FLOAT')
+
+
+class ExtendedTokenizer(Tokenizer):
+    """`Tokenizer` of `ExtendedJsonPathLexer`"""
+
+    lexer_class = ExtendedJsonPathLexer
+
+    rules = ('BOOL', 'SORT_DIRECTION', 'ID', 'FLOAT', 'PARAMETER') + Tokenizer.rules[1:-1] + ('FILTER_OP', 'DOUBLEDOT')
+
+    values = dict(Tokenizer.values, **{
+        'BOOL': lambda text: text == 'true',
+        'SORT_DIRECTION': lambda text: text[-1],
+        'FLOAT': float,
+        'PARAMETER': lambda text: text[1:],
+    })
+
+
+class ExtendedJsonPathDescentParser(JsonPathDescentParser):
+    """Recursive-descent counterpart of `ExtentedJsonPathParser`"""
+
+    tokenizer_class = ExtendedTokenizer
+
+    # Arithmetic binds looser than any path operator, mirroring
+    # `ExtentedJsonPathParser.precedence`.
+    levels = dict(JsonPathDescentParser.levels, **{
+        '+': 1,
+        '-': 1,
+        '*': 2,
+        '/': 2,
+    })
+
+    follow = JsonPathDescentParser.follow | frozenset(
+        ARITHMETIC_OPERATORS + ('FILTER_OP', 'SORT_DIRECTION', ']'))
+
+    def parse_tokens(self, tokens):
+        result = super(ExtendedJsonPathDescentParser, self).parse_tokens(tokens)
+        # All the tokens are read by now, and only parameters need preparing
+        if any(token.type == 'PARAMETER' for token in tokens.tokens):
+            return _prepared.prepare(result)
+        return result
+
+    def parse_operator(self, tokens, left, token, level):
+        if token.type not in ARITHMETIC_OPERATORS:
+            return super(ExtendedJsonPathDescentParser, self).parse_operator(tokens, left, token, level)
+
+        tokens.next()
+        return self.operation(left, token.type, self.parse_operand(tokens, LITERALS))
+
+    def parse_prefix(self, tokens):
+        token = tokens.peek()
+
+        if token is not None and token.type == '@':
+            tokens.next()
+            return This()
+        elif token is not None and token.type in LITERALS:
+            # A number can only start an arithmetic operation
+            tokens.next()
+            operator = tokens.peek()
+            if operator is None or operator.type not in ARITHMETIC_OPERATORS:
+                raise_parse_error(operator)
+            tokens.next()
+            return self.operation(token.value, operator.type, self.parse_operand(tokens, (token.type,)))
+
+        return super(ExtendedJsonPathDescentParser, self).parse_prefix(tokens)
+
+    def parse_operand(self, tokens, literals):
+        """
+        Parses the right-hand side of an arithmetic operator: either a number
+        of one of the `literals` types or a jsonpath. Operations have no
+        precedence in the LALR grammar, so a jsonpath operand extends as far
+        as possible: `a * b + c` is `a * (b + c)`.
+        """
+        token = tokens.peek()
+        if (token is not None and token.type in LITERALS
+                and tokens.peek_type(1) not in ARITHMETIC_OPERATORS):
+            if token.type not in literals:
+                raise_parse_error(tokens.peek(1))
+            return tokens.next().value
+
+        return self.parse_jsonpath(tokens)
+
+    def operation(self, left, op, right):
+        # NOTE(sileht): If we have choice between a field or a string we
+        # always choice string, because field can be full qualified
+        # like $.foo == foo and where string can't.
+        if isinstance(left, Fields) and len(left.fields) == 1:
+            left = left.fields[0]
+        if isinstance(right, Fields) and len(right.fields) == 1:
+            right = right.fields[0]
+        return _arithmetic.Operation(left, op, right)
+
+    def named_operator(self, token):
+        if token.value == 'len':
+            return _iterable.Len()
+        elif token.value == 'keys':
+            return _iterable.Keys()
+        elif token.value == 'sorted':
+            return _iterable.SortedThis()
+        elif token.value.startswith("split("):
+            return _string.Split(token.value)
+        elif token.value.startswith("sub("):
+            return _string.Sub(token.value)
+        elif token.value.startswith("str("):
+            return _string.Str(token.value)
+        else:
+            return super(ExtendedJsonPathDescentParser, self).named_operator(token)
+
+    # ===================== Filters and sorting =====================
+
+    def parse_extended_brackets(self, tokens, left):
+        # Filters and sorts only apply to a preceding path
+        token_type = tokens.peek_type()
+        if left is not None and token_type == '?':
+            tokens.next()
+            return _filter.Filter(self.parse_expressions(tokens))
+        elif left is not None and token_type == 'SORT_DIRECTION':
+            return _iterable.SortedThis(self.parse_sorts(tokens))
+
+        return super(ExtendedJsonPathDescentParser, self).parse_extended_brackets(tokens, left)
+
+    def parse_expressions(self, tokens):
+        expressions = self.parse_expression_group(tokens)
+        while tokens.peek_type() == '&':
+            tokens.next()
+            expressions += self.parse_expression_group(tokens)
+        return expressions
+
+    def parse_expression_group(self, tokens):
+        if tokens.peek_type() != '(':
+            return [self.parse_expression(tokens, self.parse_jsonpath(tokens))]
+
+        # The parentheses either group expressions, as in `(a = 1 & b)`, or
+        # are part of a path, as in `(@.a).b = 1`; the LALR parser prefers
+        # the path whenever the parentheses hold a single bare path.
+        tokens.next()
+        expressions = self.parse_expressions(tokens)
+        tokens.expect(')')
+
+        if len(expressions) == 1 and expressions[0].op is None:
+            jsonpath = self.parse_infix(tokens, expressions[0].target, -1)
+            return [self.parse_expression(tokens, jsonpath)]
+        return expressions
+
+    def parse_expression(self, tokens, jsonpath):
+        if tokens.peek_type() != 'FILTER_OP':
+            return _filter.Expression(jsonpath, None, None)
+
+        op = tokens.next().value
+        value = tokens.next()
+        if value.type == 'PARAMETER':
+            return _filter.Expression(jsonpath, op, _prepared.Parameter(value.value))
+        elif value.type not in ('ID', 'FLOAT', 'NUMBER', 'BOOL'):
+            raise_parse_error(value)
+        return _filter.Expression(jsonpath, op, value.value)
+
+    def parse_sorts(self, tokens):
+        sorts = []
+        while tokens.peek_type() == 'SORT_DIRECTION':
+            direction = tokens.next().value
+            sorts.append((self.parse_jsonpath(tokens), direction != "/"))
+        return sorts
@@ -17,7 +17,10 @@ try:
 except:
     import re
 
-from .. import JSONPath, DatumInContext, Index
+from .. import JSONPath, DatumInContext, Fields, Index, This
+from .. import compiler
+from ..jsonpath import _set
+from .prepared import Parameter
 
 
 OPERATOR_MAP = {
@@ -35,42 +38,69 @@ OPERATOR_MAP = {
 class Filter(JSONPath):
     """The JSONQuery filter"""
 
+    __slots__ = ('expressions',)
+
     def __init__(self, expressions):
-        self.expressions = expressions
+        _set(self, 'expressions', tuple(expressions))
 
     def find(self, datum):
         if not self.expressions:
             return datum
 
+        return list(self.iter_find(datum))
+
+    def iter_find(self, datum):
+        if not self.expressions:
+            return iter([DatumInContext.wrap(datum)])
+
         datum = DatumInContext.wrap(datum)
+        value = datum.value
+
+        # The values of a dict are filtered in place, and keep their keys
+        if isinstance(value, dict):
+            return (DatumInContext(item, path=Fields(key), context=datum)
+                    for key, item in value.items()
+                    if self._matches(item))
+
+        if not isinstance(value, list):
+            return iter(())
+
+        return (DatumInContext(value[i], path=Index(i), context=datum)
+                for i in range(0, len(value))
+                if self._matches(value[i]))
+
+    def _iter_values(self, value):
+        if not self.expressions:
+            return iter([value])
 
-        if isinstance(datum.value, dict):
-            datum.value = list(datum.value.values())
+        if isinstance(value, dict):
+            value = value.values()
+        elif not isinstance(value, list):
+            return iter(())
 
-        if not isinstance(datum.value, list):
-            return []
+        return (item for item in value if self._matches(item))
 
-        return [DatumInContext(datum.value[i], path=Index(i), context=datum)
-                for i in range(0, len(datum.value))
-                if (len(self.expressions) ==
-                    len(list(filter(lambda x: x.find(datum.value[i]),
-                                    self.expressions))))]
+    def _matches(self, item):
+        """
+        Whether `item` passes every expression: they are evaluated in turn,
+        up to the first failing, and each up to its first match.
+        """
+        for expression in self.expressions:
+            if not expression.exists(item):
+                return False
+        return True
 
     def filter(self, fn, data):
         # NOTE: We reverse the order just to make sure the indexes are preserved upon
         #  removal.
         for datum in reversed(self.find(data)):
-            index_obj = datum.path
-            if isinstance(data, dict):
-                index_obj.index = list(data)[index_obj.index]
-            index_obj.filter(fn, data)
+            datum.path.filter(fn, data)
         return data
 
     def update(self, data, val):
         if type(data) is list:
             for index, item in enumerate(data):
-                shouldUpdate = len(self.expressions) == len(list(filter(lambda x: x.find(item), self.expressions)))
-                if shouldUpdate:
+                if self._matches(item):
                     if hasattr(val, '__call__'):
                         val.__call__(data[index], data, index)
                     else:
@@ -78,57 +108,59 @@ class Filter(JSONPath):
         return data
     
     def __repr__(self):
-        return '%s(%r)' % (self.__class__.__name__, self.expressions)
+        return '%s(%r)' % (self.__class__.__name__, list(self.expressions))
 
     def __str__(self):
-        return '[?%s]' % self.expressions
+        return '[?%s]' % list(self.expressions)
 
     def __eq__(self, other):
         return (isinstance(other, Filter)
                 and self.expressions == other.expressions)
 
+    def __hash__(self):
+        return hash(self.expressions)
+
+    def __reduce__(self):
+        return self.__class__, (self.expressions,)
+
 
 class Expression(JSONPath):
     """The JSONQuery expression"""
 
+    __slots__ = ('target', 'op', 'value')
+
     def __init__(self, target, op, value):
-        self.target = target
-        self.op = op
-        self.value = value
+        _set(self, 'target', target)
+        _set(self, 'op', op)
+        _set(self, 'value', value)
 
     def find(self, datum):
-        datum = self.target.find(DatumInContext.wrap(datum))
+        return list(self.iter_find(datum))
 
-        if not datum:
-            return []
+    def iter_find(self, datum):
+        matches = self.target.iter_find(DatumInContext.wrap(datum))
         if self.op is None:
-            return datum
+            return matches
 
-        found = []
-        for data in datum:
-            value = data.value
-            if isinstance(self.value, int):
-                try:
-                    value = int(value)
-                except ValueError:
-                    continue
-            elif isinstance(self.value, bool):
-                try:
-                    value = bool(value)
-                except ValueError:
-                    continue
-
-            if OPERATOR_MAP[self.op](value, self.value):
-                found.append(data)
-
-        return found
+        expected = self.value
+        if isinstance(expected, Parameter):
+            expected = expected.resolve()
+        return (data for data in matches if _compare(data.value, self.op, expected))
 
     def __eq__(self, other):
+        # The type of the value matters: `a == 1` coerces to int, `a == 1.0` does not
         return (isinstance(other, Expression) and
                 self.target == other.target and
                 self.op == other.op and
+                type(self.value) is type(other.value) and
                 self.value == other.value)
 
+    def __hash__(self):
+        return hash((self.target, self.op, self.value))
+
+    def __reduce__(self):
+        return self.__class__, (self.target, self.op, self.value)
+
     def __repr__(self):
         if self.op is None:
             return '%s(%r)' % (self.__class__.__name__, self.target)
@@ -141,3 +173,86 @@ class Expression(JSONPath):
             return '%s' % self.target
         else:
             return '%s %s %s' % (self.target, self.op, self.value)
+
+
+def _compare(value, op, expected):
+    """Whether `value` compares to `expected` by `op`, coerced to its type"""
+    if isinstance(expected, int):
+        try:
+            value = int(value)
+        except ValueError:
+            return False
+    elif isinstance(expected, bool):
+        try:
+            value = bool(value)
+        except ValueError:
+            return False
+    return OPERATOR_MAP[op](value, expected)
+
+
+def _expression_predicate(expression):
+    """Compiles the truth of `expression.find(value)`."""
+    if type(expression) is not Expression:
+        return compiler.values_predicate(expression)
+    if expression.op is None:
+        return compiler.values_predicate(expression.target)
+
+    op = expression.op
+    expected_value = expression.value
+    if not isinstance(expected_value, Parameter):
+        return compiler.values_predicate(expression.target, lambda value: _compare(value, op, expected_value))
+
+    def test(value):
+        return _compare(value, op, expected_value.resolve())
+    return compiler.values_predicate(expression.target, test)
+
+
+def _filter_predicate(node):
+    predicates = [_expression_predicate(expression) for expression in node.expressions]
+
+    def predicate(value):
+        # Like `Filter._matches`, up to the first failing expression
+        for matches in predicates:
+            if not matches(value):
+                return False
+        return True
+    return predicate
+
+
+def _filter_values(node, next_step):
+    if not node.expressions:
+        return next_step
+    predicate = _filter_predicate(node)
+
+    def step(value, out):
+        if isinstance(value, dict):
+            value = value.values()
+        elif not isinstance(value, list):
+            return
+        for item in value:
+            if predicate(item):
+                next_step(item, out)
+    return step
+
+
+def _filter_find(node, next_step):
+    if not node.expressions:
+        return compiler.find_step(This(), next_step)
+    predicate = _filter_predicate(node)
+
+    def step(datum, out):
+        if not isinstance(datum, DatumInContext):
+            datum = DatumInContext(datum)
+        value = datum.value
+        if isinstance(value, dict):
+            for key, item in value.items():
+                if predicate(item):
+                    next_step(DatumInContext(item, path=Fields(key), context=datum), out)
+        elif isinstance(value, list):
+            for i in range(0, len(value)):
+                if predicate(value[i]):
+                    next_step(DatumInContext(value[i], path=Index(i), context=datum), out)
+    return step
+
+
+compiler.register(Filter, values=_filter_values, find=_filter_find)
@@ -13,6 +13,7 @@
 
 import functools
 from .. import This, DatumInContext, JSONPath
+from ..jsonpath import _set
 
 
 class SortedThis(This):
@@ -20,8 +21,11 @@ class SortedThis(This):
 
     Concrete syntax is '`sorted`' or [\\field,/field].
     """
+
+    __slots__ = ('expressions',)
+
     def __init__(self, expressions=None):
-        self.expressions = expressions
+        _set(self, 'expressions', None if expressions is None else tuple(map(tuple, expressions)))
 
     def _compare(self, left, right):
         left = DatumInContext.wrap(left)
@@ -45,24 +49,32 @@ class SortedThis(This):
 
     def find(self, datum):
         """Return sorted value of This if list or dict."""
+        datum = DatumInContext.wrap(datum)
         if isinstance(datum.value, dict) and self.expressions:
-            return datum
+            return [datum]
 
         if isinstance(datum.value, dict) or isinstance(datum.value, list):
             key = (functools.cmp_to_key(self._compare)
                    if self.expressions else None)
             return [DatumInContext.wrap(
                 [value for value in sorted(datum.value, key=key)])]
-        return datum
+        return [datum]
 
     def __eq__(self, other):
-        return isinstance(other, Len)
+        return isinstance(other, SortedThis) and self.expressions == other.expressions
+
+    def __hash__(self):
+        return hash(('sorted', self.expressions))
+
+    def __reduce__(self):
+        return self.__class__, (self.expressions,)
 
     def __repr__(self):
-        return '%s(%r)' % (self.__class__.__name__, self.expressions)
+        return '%s(%r)' % (self.__class__.__name__,
+                           None if self.expressions is None else list(self.expressions))
 
     def __str__(self):
-        return '[?%s]' % self.expressions
+        return '[?%s]' % (None if self.expressions is None else list(self.expressions))
 
 
 class Len(JSONPath):
@@ -71,6 +83,8 @@ class Len(JSONPath):
     Concrete syntax is '`len`'.
     """
 
+    __slots__ = ()
+
     def find(self, datum):
         datum = DatumInContext.wrap(datum)
         try:
@@ -85,6 +99,9 @@ class Len(JSONPath):
     def __eq__(self, other):
         return isinstance(other, Len)
 
+    def __hash__(self):
+        return hash('len')
+
     def __str__(self):
         return '`len`'
 
@@ -97,6 +114,8 @@ class Keys(JSONPath):
     Concrete syntax is '`keys`'.
     """
 
+    __slots__ = ()
+
     def find(self, datum):
         datum = DatumInContext.wrap(datum)
         try:
@@ -111,6 +130,9 @@ class Keys(JSONPath):
     def __eq__(self, other):
         return isinstance(other, Keys)
 
+    def __hash__(self):
+        return hash('keys')
+
     def __str__(self):
         return '`keys`'
 
@@ -11,13 +11,18 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+from ply.lex import TOKEN
+
 from .. import lexer
 from .. import parser
 from .. import Fields, This, Child
+from ..cache import parse_cache
+from ..parser import parse_many as _parse_many
 
 from . import arithmetic as _arithmetic
 from . import filter as _filter
 from . import iterable as _iterable
+from . import prepared as _prepared
 from . import string as _string
 
 
@@ -26,32 +31,37 @@ class ExtendedJsonPathLexer(lexer.JsonPathLexer):
     literals = lexer.JsonPathLexer.literals + ['?', '@', '+', '*', '/', '-']
     tokens = (['BOOL'] +
               parser.JsonPathLexer.tokens +
-              ['FILTER_OP', 'SORT_DIRECTION', 'FLOAT'])
+              ['FILTER_OP', 'SORT_DIRECTION', 'FLOAT', 'PARAMETER'])
 
     t_FILTER_OP = r'=~|==?|<=|>=|!=|<|>'
 
+    @TOKEN(r'true|false')
     def t_BOOL(self, t):
-        r'true|false'
         t.value = True if t.value == 'true' else False
         return t
 
+    @TOKEN(r',?\s*(/|\\)')
     def t_SORT_DIRECTION(self, t):
-        r',?\s*(/|\\)'
         t.value = t.value[-1]
         return t
 
+    @TOKEN(r'@?[a-zA-Z_][a-zA-Z0-9_@\-]*')
     def t_ID(self, t):
-        r'@?[a-zA-Z_][a-zA-Z0-9_@\-]*'
         # NOTE(sileht): This fixes the ID expression to be
         # able to use @ for `This` like any json query
         t.type = self.reserved_words.get(t.value, 'ID')
         return t
 
+    @TOKEN(r'-?\d+\.\d+')
     def t_FLOAT(self, t):
-        r'-?\d+\.\d+'
         t.value = float(t.value)
         return t
 
+    @TOKEN(r':[a-zA-Z_][a-zA-Z0-9_]*')
+    def t_PARAMETER(self, t):
+        t.value = t.value[1:]
+        return t
+
 
 class ExtentedJsonPathParser(parser.JsonPathParser):
     """Custom LALR-parser for JsonPath"""
@@ -62,6 +72,9 @@ class ExtentedJsonPathParser(parser.JsonPathParser):
         lexer_class = lexer_class or ExtendedJsonPathLexer
         super(ExtentedJsonPathParser, self).__init__(debug, lexer_class)
 
+    def parse(self, string, lexer=None):
+        return _prepared.prepare(super(ExtentedJsonPathParser, self).parse(string, lexer))
+
     def p_jsonpath_operator_jsonpath(self, p):
         """jsonpath : NUMBER operator NUMBER
                     | FLOAT operator FLOAT
@@ -113,11 +126,14 @@ class ExtentedJsonPathParser(parser.JsonPathParser):
                       | jsonpath FILTER_OP FLOAT
                       | jsonpath FILTER_OP NUMBER
                       | jsonpath FILTER_OP BOOL
+                      | jsonpath FILTER_OP PARAMETER
         """
         if len(p) == 2:
             left, op, right = p[1], None, None
         else:
             __, left, op, right = p
+            if p.slice[3].type == 'PARAMETER':
+                right = _prepared.Parameter(right)
         p[0] = _filter.Expression(left, op, right)
 
     def p_expressions_expression(self, p):
@@ -170,5 +186,22 @@ class ExtentedJsonPathParser(parser.JsonPathParser):
     ]
 
 
-def parse(path, debug=False):
-    return ExtentedJsonPathParser(debug=debug).parse(path)
+def parse(path, debug=False, backend=None):
+    if debug:
+        return parser_class(backend)(debug=debug).parse(path)
+    return parse_cache.parse(parser_class(backend), path)
+
+
+def parse_many(strings, parser=None, workers=None, backend=None):
+    return _parse_many(strings, parser or parser_class(backend), workers)
+
+
+def parser_class(backend=None):
+    backend = backend or parser.default_backend
+    if backend == 'ply':
+        return ExtentedJsonPathParser
+    elif backend == 'descent':
+        from .descent import ExtendedJsonPathDescentParser
+        return ExtendedJsonPathDescentParser
+    raise ValueError('Unknown parser backend %r, expected one of %s'
+                     % (backend, ', '.join(parser.BACKENDS)))
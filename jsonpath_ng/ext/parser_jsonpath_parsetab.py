@@ -0,0 +1,84 @@
+
+# parser_jsonpath_parsetab.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = "jsonpathleft+-left*/left,leftDOUBLEDOTleft.left|left&leftWHEREnonassocIDBOOL DOUBLEDOT FILTER_OP FLOAT ID NAMED_OPERATOR NUMBER PARAMETER SORT_DIRECTION WHEREjsonpath : NUMBER operator NUMBER\n                    | FLOAT operator FLOAT\n                    | ID operator ID\n                    | NUMBER operator jsonpath\n                    | FLOAT operator jsonpath\n                    | jsonpath operator NUMBER\n                    | jsonpath operator FLOAT\n                    | jsonpath operator jsonpath\n        operator : '+'\n                    | '-'\n                    | '*'\n                    | '/'\n        jsonpath : NAMED_OPERATORexpression : jsonpath\n                      | jsonpath FILTER_OP ID\n                      | jsonpath FILTER_OP FLOAT\n                      | jsonpath FILTER_OP NUMBER\n                      | jsonpath FILTER_OP BOOL\n                      | jsonpath FILTER_OP PARAMETER\n        expressions : expressionexpressions : expressions '&' expressionsexpressions : '(' expressions ')'filter : '?' expressions jsonpath : jsonpath '[' filter ']'sort : SORT_DIRECTION jsonpathsorts : sortsorts : sorts sortsjsonpath : jsonpath '[' sorts ']'jsonpath : '@'jsonpath : jsonpath '.' jsonpath\n                    | jsonpath DOUBLEDOT jsonpath\n                    | jsonpath WHERE jsonpath\n                    | jsonpath '|' jsonpath\n                    | jsonpath '&' jsonpathjsonpath : fields_or_anyjsonpath : '$'jsonpath : '[' idx ']'jsonpath : '[' slice ']'jsonpath : '[' fields ']'jsonpath : jsonpath '[' fields ']'jsonpath : jsonpath '[' idx ']'jsonpath : jsonpath '[' slice ']'jsonpath : '(' jsonpath ')'fields_or_any : fields\n                         | '*'    fields : IDfields : fields ',' fieldsidx : NUMBERslice : '*'slice : maybe_int ':' maybe_int\n                 | maybe_int ':' maybe_int ':' maybe_int maybe_int : NUMBER\n                     | emptyempty :"
+    
+_lr_action_items = {'NUMBER':([0,6,11,13,14,15,16,17,18,19,20,21,22,23,24,25,45,47,61,72,77,80,81,],[2,30,2,38,30,2,2,2,2,2,-9,-10,-11,-12,53,2,2,2,76,2,2,86,76,]),'FLOAT':([0,11,13,15,16,17,18,19,20,21,22,23,24,25,45,47,72,77,80,],[3,3,39,3,3,3,3,3,-9,-10,-11,-12,3,55,3,3,3,3,85,]),'ID':([0,6,11,13,14,15,16,17,18,19,20,21,22,23,24,25,26,35,45,47,72,77,80,],[4,33,4,4,33,4,4,4,4,4,-9,-10,-11,-12,4,4,57,33,4,4,4,4,84,]),'NAMED_OPERATOR':([0,11,13,15,16,17,18,19,20,21,22,23,24,25,45,47,72,77,],[5,5,5,5,5,5,5,5,-9,-10,-11,-12,5,5,5,5,5,5,]),'@':([0,11,13,15,16,17,18,19,20,21,22,23,24,25,45,47,72,77,],[7,7,7,7,7,7,7,7,-9,-10,-11,-12,7,7,7,7,7,7,]),'$':([0,11,13,15,16,17,18,19,20,21,22,23,24,25,45,47,72,77,],[9,9,9,9,9,9,9,9,-9,-10,-11,-12,9,9,9,9,9,9,]),'[':([0,1,4,5,7,8,9,10,11,12,13,15,16,17,18,19,20,21,22,23,24,25,33,36,37,38,39,45,47,48,49,50,51,52,53,54,55,56,57,58,59,60,62,63,64,66,67,68,69,72,73,74,77,79,],[6,14,-46,-13,-29,-35,-36,-44,6,-45,6,6,6,6,6,6,-9,-10,-11,-12,6,6,-46,14,14,-6,-7,6,6,-30,-31,-32,-33,-34,-1,14,-2,14,-3,-37,-38,-39,-47,-43,-24,-28,-40,-41,-42,6,14,14,6,14,]),'(':([0,11,13,15,16,17,18,19,20,21,22,23,24,25,45,47,72,77,],[11,11,11,11,11,11,11,11,-9,-10,-11,-12,11,11,72,11,72,72,]),'*':([0,1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,33,36,37,38,39,45,47,48,49,50,51,52,53,54,55,56,57,58,59,60,62,63,64,66,67,68,69,72,73,74,77,79,],[12,22,22,22,-46,-13,31,-29,-35,-36,-44,12,-45,12,31,12,12,12,12,12,-9,-10,-11,-12,12,12,-46,22,22,22,22,12,12,-30,-31,-32,-33,-34,22,22,22,22,-3,-37,-38,-39,-47,-43,-24,-28,-40,-41,-42,12,22,22,12,22,]),'$end':([1,4,5,7,8,9,10,12,33,37,38,39,48,49,50,51,52,53,54,55,56,57,58,59,60,62,63,64,66,67,68,69,],[0,-46,-13,-29,-35,-36,-44,-45,-46,-8,-6,-7,-30,-31,-32,-33,-34,-1,-4,-2,-5,-3,-37,-38,-39,-47,-43,-24,-28,-40,-41,-42,]),'.':([1,4,5,7,8,9,10,12,33,36,37,38,39,48,49,50,51,52,53,54,55,56,57,58,59,60,62,63,64,66,67,68,69,73,74,79,],[15,-46,-13,-29,-35,-36,-44,-45,-46,15,15,-6,-7,-30,15,-32,-33,-34,-1,15,-2,15,-3,-37,-38,-39,-47,-43,-24,-28,-40,-41,-42,15,15,15,]),'DOUBLEDOT':([1,4,5,7,8,9,10,12,33,36,37,38,39,48,49,50,51,52,53,54,55,56,57,58,59,60,62,63,64,66,67,68,69,73,74,79,],[16,-46,-13,-29,-35,-36,-44,-45,-46,16,16,-6,-7,-30,-31,-32,-33,-34,-1,16,-2,16,-3,-37,-38,-39,-47,-43,-24,-28,-40,-41,-42,16,16,16,]),'WHERE':([1,4,5,7,8,9,10,12,33,36,37,38,39,48,49,50,51,52,53,54,55,56,57,58,59,60,62,63,64,66,67,68,69,73,74,79,],[17,-46,-13,-29,-35,-36,-44,-45,-46,17,17,-6,-7,17,17,-32,17,17,-1,17,-2,17,-3,-37,-38,-39,-47,-43,-24,-28,-40,-41,-42,17,17,17,]),'|':([1,4,5,7,8,9,10,12,33,36,37,38,39,48,49,50,51,52,53,54,55,56,57,58,59,60,62,63,64,66,67,68,69,73,74,79,],[18,-46,-13,-29,-35,-36,-44,-45,-46,18,18,-6,-7,18,18,-32,-33,-34,-1,18,-2,18,-3,-37,-38,-39,-47,-43,-24,-28,-40,-41,-42,18,18,18,]),'&':([1,4,5,7,8,9,10,12,33,36,37,38,39,48,49,50,51,52,53,54,55,56,57,58,59,60,62,63,64,66,67,68,69,70,71,73,74,78,79,82,83,84,85,86,87,88,],[19,-46,-13,-29,-35,-36,-44,-45,-46,19,19,-6,-7,19,19,-32,19,-34,-1,19,-2,19,-3,-37,-38,-39,-47,-43,-24,-28,-40,-41,-42,77,-20,19,19,77,19,-21,-22,-15,-16,-17,-18,-19,]),'+':([1,2,3,4,5,7,8,9,10,12,33,36,37,38,39,48,49,50,51,52,53,54,55,56,57,58,59,60,62,63,64,66,67,68,69,73,74,79,],[20,20,20,-46,-13,-29,-35,-36,-44,-45,-46,20,20,20,20,-30,-31,-32,-33,-34,20,20,20,20,-3,-37,-38,-39,-47,-43,-24,-28,-40,-41,-42,20,20,20,]),'-':([1,2,3,4,5,7,8,9,10,12,33,36,37,38,39,48,49,50,51,52,53,54,55,56,57,58,59,60,62,63,64,66,67,68,69,73,74,79,],[21,21,21,-46,-13,-29,-35,-36,-44,-45,-46,21,21,21,21,-30,-31,-32,-33,-34,21,21,21,21,-3,-37,-38,-39,-47,-43,-24,-28,-40,-41,-42,21,21,21,]),'/':([1,2,3,4,5,7,8,9,10,12,33,36,37,38,39,48,49,50,51,52,53,54,55,56,57,58,59,60,62,63,64,66,67,68,69,73,74,79,],[23,23,23,-46,-13,-29,-35,-36,-44,-45,-46,23,23,23,23,-30,-31,-32,-33,-34,23,23,23,23,-3,-37,-38,-39,-47,-43,-24,-28,-40,-41,-42,23,23,23,]),',':([4,10,29,33,42,62,],[-46,35,35,-46,35,-47,]),')':([4,5,7,8,9,10,12,33,36,37,38,39,48,49,50,51,52,53,54,55,56,57,58,59,60,62,63,64,66,67,68,69,71,73,78,79,82,83,84,85,86,87,88,],[-46,-13,-29,-35,-36,-44,-45,-46,63,-8,-6,-7,-30,-31,-32,-33,-34,-1,-4,-2,-5,-3,-37,-38,-39,-47,-43,-24,-28,-40,-41,-42,-20,-14,83,63,-21,-22,-15,-16,-17,-18,-19,]),'FILTER_OP':([4,5,7,8,9,10,12,33,37,38,39,48,49,50,51,52,53,54,55,56,57,58,59,60,62,63,64,66,67,68,69,73,79,],[-46,-13,-29,-35,-36,-44,-45,-46,-8,-6,-7,-30,-31,-32,-33,-34,-1,-4,-2,-5,-3,-37,-38,-39,-47,-43,-24,-28,-40,-41,-42,80,80,]),']':([4,5,7,8,9,10,12,27,28,29,30,31,33,34,37,38,39,40,41,42,43,44,46,48,49,50,51,52,53,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,73,74,75,76,81,82,83,84,85,86,87,88,89,],[-46,-13,-29,-35,-36,-44,-45,58,59,60,-48,-49,-46,-53,-8,-6,-7,64,66,67,68,69,-26,-30,-31,-32,-33,-34,-1,-4,-2,-5,-3,-37,-38,-39,-54,-47,-43,-24,-27,-28,-40,-41,-42,-23,-20,-14,-25,-50,-52,-54,-21,-22,-15,-16,-17,-18,-19,-51,]),'SORT_DIRECTION':([4,5,7,8,9,10,12,14,33,37,38,39,41,46,48,49,50,51,52,53,54,55,56,57,58,59,60,62,63,64,65,66,67,68,69,74,],[-46,-13,-29,-35,-36,-44,-45,47,-46,-8,-6,-7,47,-26,-30,-31,-32,-33,-34,-1,-4,-2,-5,-3,-37,-38,-39,-47,-43,-24,47,-28,-40,-41,-42,-25,]),':':([6,14,30,32,34,61,75,76,],[-54,-54,-52,61,-53,-54,81,-52,]),'?':([14,],[45,]),'BOOL':([80,],[87,]),'PARAMETER':([80,],[88,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'jsonpath':([0,11,13,15,16,17,18,19,24,25,45,47,72,77,],[1,36,37,48,49,50,51,52,54,56,73,74,79,73,]),'fields_or_any':([0,11,13,15,16,17,18,19,24,25,45,47,72,77,],[8,8,8,8,8,8,8,8,8,8,8,8,8,8,]),'fields':([0,6,11,13,14,15,16,17,18,19,24,25,35,45,47,72,77,],[10,29,10,10,42,10,10,10,10,10,10,10,62,10,10,10,10,]),'operator':([1,2,3,4,36,37,38,39,48,49,50,51,52,53,54,55,56,73,74,79,],[13,24,25,26,13,13,24,25,13,13,13,13,13,24,13,25,13,13,13,13,]),'idx':([6,14,],[27,43,]),'slice':([6,14,],[28,44,]),'maybe_int':([6,14,61,81,],[32,32,75,89,]),'empty':([6,14,61,81,],[34,34,34,34,]),'filter':([14,],[40,]),'sorts':([14,41,65,],[41,65,65,]),'sort':([14,41,65,],[46,46,46,]),'expressions':([45,72,77,],[70,78,82,]),'expression':([45,72,77,],[71,71,71,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> jsonpath","S'",1,None,None,None),
+  ('jsonpath -> NUMBER operator NUMBER','jsonpath',3,'p_jsonpath_operator_jsonpath','parser.py',79),
+  ('jsonpath -> FLOAT operator FLOAT','jsonpath',3,'p_jsonpath_operator_jsonpath','parser.py',80),
+  ('jsonpath -> ID operator ID','jsonpath',3,'p_jsonpath_operator_jsonpath','parser.py',81),
+  ('jsonpath -> NUMBER operator jsonpath','jsonpath',3,'p_jsonpath_operator_jsonpath','parser.py',82),
+  ('jsonpath -> FLOAT operator jsonpath','jsonpath',3,'p_jsonpath_operator_jsonpath','parser.py',83),
+  ('jsonpath -> jsonpath operator NUMBER','jsonpath',3,'p_jsonpath_operator_jsonpath','parser.py',84),
+  ('jsonpath -> jsonpath operator FLOAT','jsonpath',3,'p_jsonpath_operator_jsonpath','parser.py',85),
+  ('jsonpath -> jsonpath operator jsonpath','jsonpath',3,'p_jsonpath_operator_jsonpath','parser.py',86),
+  ('operator -> +','operator',1,'p_operator','parser.py',99),
+  ('operator -> -','operator',1,'p_operator','parser.py',100),
+  ('operator -> *','operator',1,'p_operator','parser.py',101),
+  ('operator -> /','operator',1,'p_operator','parser.py',102),
+  ('jsonpath -> NAMED_OPERATOR','jsonpath',1,'p_jsonpath_named_operator','parser.py',107),
+  ('expression -> jsonpath','expression',1,'p_expression','parser.py',124),
+  ('expression -> jsonpath FILTER_OP ID','expression',3,'p_expression','parser.py',125),
+  ('expression -> jsonpath FILTER_OP FLOAT','expression',3,'p_expression','parser.py',126),
+  ('expression -> jsonpath FILTER_OP NUMBER','expression',3,'p_expression','parser.py',127),
+  ('expression -> jsonpath FILTER_OP BOOL','expression',3,'p_expression','parser.py',128),
+  ('expression -> jsonpath FILTER_OP PARAMETER','expression',3,'p_expression','parser.py',129),
+  ('expressions -> expression','expressions',1,'p_expressions_expression','parser.py',140),
+  ('expressions -> expressions & expressions','expressions',3,'p_expressions_and','parser.py',144),
+  ('expressions -> ( expressions )','expressions',3,'p_expressions_parens','parser.py',149),
+  ('filter -> ? expressions','filter',2,'p_filter','parser.py',153),
+  ('jsonpath -> jsonpath [ filter ]','jsonpath',4,'p_jsonpath_filter','parser.py',157),
+  ('sort -> SORT_DIRECTION jsonpath','sort',2,'p_sort','parser.py',161),
+  ('sorts -> sort','sorts',1,'p_sorts_sort','parser.py',165),
+  ('sorts -> sorts sorts','sorts',2,'p_sorts_comma','parser.py',169),
+  ('jsonpath -> jsonpath [ sorts ]','jsonpath',4,'p_jsonpath_sort','parser.py',173),
+  ('jsonpath -> @','jsonpath',1,'p_jsonpath_this','parser.py',178),
+  ('jsonpath -> jsonpath . jsonpath','jsonpath',3,'p_jsonpath_binop','parser.py',194),
+  ('jsonpath -> jsonpath DOUBLEDOT jsonpath','jsonpath',3,'p_jsonpath_binop','parser.py',195),
+  ('jsonpath -> jsonpath WHERE jsonpath','jsonpath',3,'p_jsonpath_binop','parser.py',196),
+  ('jsonpath -> jsonpath | jsonpath','jsonpath',3,'p_jsonpath_binop','parser.py',197),
+  ('jsonpath -> jsonpath & jsonpath','jsonpath',3,'p_jsonpath_binop','parser.py',198),
+  ('jsonpath -> fields_or_any','jsonpath',1,'p_jsonpath_fields','parser.py',213),
+  ('jsonpath -> $','jsonpath',1,'p_jsonpath_root','parser.py',227),
+  ('jsonpath -> [ idx ]','jsonpath',3,'p_jsonpath_idx','parser.py',231),
+  ('jsonpath -> [ slice ]','jsonpath',3,'p_jsonpath_slice','parser.py',235),
+  ('jsonpath -> [ fields ]','jsonpath',3,'p_jsonpath_fieldbrackets','parser.py',239),
+  ('jsonpath -> jsonpath [ fields ]','jsonpath',4,'p_jsonpath_child_fieldbrackets','parser.py',243),
+  ('jsonpath -> jsonpath [ idx ]','jsonpath',4,'p_jsonpath_child_idxbrackets','parser.py',247),
+  ('jsonpath -> jsonpath [ slice ]','jsonpath',4,'p_jsonpath_child_slicebrackets','parser.py',251),
+  ('jsonpath -> ( jsonpath )','jsonpath',3,'p_jsonpath_parens','parser.py',255),
+  ('fields_or_any -> fields','fields_or_any',1,'p_fields_or_any','parser.py',260),
+  ('fields_or_any -> *','fields_or_any',1,'p_fields_or_any','parser.py',261),
+  ('fields -> ID','fields',1,'p_fields_id','parser.py',268),
+  ('fields -> fields , fields','fields',3,'p_fields_comma','parser.py',272),
+  ('idx -> NUMBER','idx',1,'p_idx','parser.py',276),
+  ('slice -> *','slice',1,'p_slice_any','parser.py',280),
+  ('slice -> maybe_int : maybe_int','slice',3,'p_slice','parser.py',284),
+  ('slice -> maybe_int : maybe_int : maybe_int','slice',5,'p_slice','parser.py',285),
+  ('maybe_int -> NUMBER','maybe_int',1,'p_maybe_int','parser.py',289),
+  ('maybe_int -> empty','maybe_int',1,'p_maybe_int','parser.py',290),
+  ('empty -> <empty>','empty',0,'p_empty','parser.py',294),
+]
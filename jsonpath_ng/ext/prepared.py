@@ -0,0 +1,181 @@
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import contextvars
+
+from .. import JSONPath
+from ..jsonpath import NOT_SET, _set
+
+# The values bound by the `Prepared` expression being evaluated
+_bound_params = contextvars.ContextVar('jsonpath_ng_params', default=None)
+
+
+class Parameter:
+    """A placeholder for a filter value, bound when evaluating.
+
+    Concrete syntax is ':name', as in '$.users[?id == :uid]'.
+    """
+
+    __slots__ = ('name',)
+
+    def __init__(self, name):
+        self.name = name
+
+    def resolve(self):
+        params = _bound_params.get()
+        if params is None or self.name not in params:
+            raise ValueError('No value bound for parameter :%s' % self.name)
+        return params[self.name]
+
+    def __eq__(self, other):
+        return isinstance(other, Parameter) and self.name == other.name
+
+    def __hash__(self):
+        return hash((Parameter, self.name))
+
+    def __repr__(self):
+        return '%s(%r)' % (self.__class__.__name__, self.name)
+
+    def __str__(self):
+        return ':%s' % self.name
+
+
+class Prepared(JSONPath):
+    """An expression with parameters, compiled once and evaluated with
+    different values: `find(data, params={'uid': 1234})`.
+
+    The ext parsers return one for every expression holding a `Parameter`.
+    """
+
+    __slots__ = ('expression', 'parameters')
+
+    def __init__(self, expression, parameters):
+        _set(self, 'expression', expression)
+        _set(self, 'parameters', tuple(parameters))
+
+    def _bind(self, params):
+        params = params or {}
+        missing = [name for name in self.parameters if name not in params]
+        if missing:
+            raise ValueError('No value bound for parameter%s %s'
+                             % ('s' if len(missing) > 1 else '',
+                                ', '.join(':%s' % name for name in missing)))
+        return _bound_params.set(params)
+
+    def find(self, data, params=None):
+        token = self._bind(params)
+        try:
+            return self.expression.find(data)
+        finally:
+            _bound_params.reset(token)
+
+    def iter_find(self, data, params=None):
+        # The matches are produced after this returns, possibly interleaved
+        # with other evaluations: bind the values in a context of their own.
+        context = contextvars.copy_context()
+        context.run(self._bind, params)
+        return _iter_in_context(context, context.run(self.expression.iter_find, data))
+
+    def find_values(self, data, params=None):
+        return list(self.iter_values(data, params))
+
+    def iter_values(self, data, params=None):
+        context = contextvars.copy_context()
+        context.run(self._bind, params)
+        return _iter_in_context(context, context.run(self.expression.iter_values, data))
+
+    def find_first(self, data, params=None):
+        return next(self.iter_find(data, params), None)
+
+    def exists(self, data, params=None):
+        return next(self.iter_find(data, params), NOT_SET) is not NOT_SET
+
+    def count(self, data, params=None):
+        token = self._bind(params)
+        try:
+            return self.expression.count(data)
+        finally:
+            _bound_params.reset(token)
+
+    def find_or_create(self, data, params=None):
+        token = self._bind(params)
+        try:
+            return self.expression.find_or_create(data)
+        finally:
+            _bound_params.reset(token)
+
+    def update(self, data, val, params=None):
+        token = self._bind(params)
+        try:
+            return self.expression.update(data, val)
+        finally:
+            _bound_params.reset(token)
+
+    def update_or_create(self, data, val, params=None):
+        token = self._bind(params)
+        try:
+            return self.expression.update_or_create(data, val)
+        finally:
+            _bound_params.reset(token)
+
+    def filter(self, fn, data, params=None):
+        token = self._bind(params)
+        try:
+            return self.expression.filter(fn, data)
+        finally:
+            _bound_params.reset(token)
+
+    def compile(self):
+        return Prepared(self.expression.compile(), self.parameters)
+
+    def __eq__(self, other):
+        return isinstance(other, Prepared) and self.expression == other.expression
+
+    def __hash__(self):
+        return hash((Prepared, self.expression))
+
+    def __reduce__(self):
+        return self.__class__, (self.expression, self.parameters)
+
+    def __repr__(self):
+        return '%s(%r, %r)' % (self.__class__.__name__, self.expression, self.parameters)
+
+    def __str__(self):
+        return str(self.expression)
+
+
+def _iter_in_context(context, iterator):
+    while True:
+        try:
+            yield context.run(next, iterator)
+        except StopIteration:
+            return
+
+
+def parameters(value):
+    """Returns the names of the parameters in an expression, in order."""
+    names = []
+    if isinstance(value, Parameter):
+        names.append(value.name)
+    elif isinstance(value, JSONPath):
+        names.extend(parameters(value.__reduce__()[1]))
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            names.extend(name for name in parameters(item) if name not in names)
+    return names
+
+
+def prepare(expression):
+    """Wraps `expression` in a `Prepared` if it holds any parameter."""
+    names = parameters(expression)
+    return Prepared(expression, names) if names else expression
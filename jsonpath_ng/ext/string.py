@@ -17,6 +17,7 @@ except:
     import re
 
 from .. import DatumInContext, This
+from ..jsonpath import _set
 
 
 SUB = re.compile(r"sub\(/(.*)/,\s+(.*)\)")
@@ -34,14 +35,16 @@ class Sub(This):
     Concrete syntax is '`sub(/regex/, repl)`'
     """
 
+    __slots__ = ('expr', 'repl', 'regex', 'method')
+
     def __init__(self, method=None):
         m = SUB.match(method)
         if m is None:
             raise DefintionInvalid("%s is not valid" % method)
-        self.expr = m.group(1).strip()
-        self.repl = m.group(2).strip()
-        self.regex = re.compile(self.expr)
-        self.method = method
+        _set(self, 'expr', m.group(1).strip())
+        _set(self, 'repl', m.group(2).strip())
+        _set(self, 'regex', re.compile(self.expr))
+        _set(self, 'method', method)
 
     def find(self, datum):
         datum = DatumInContext.wrap(datum)
@@ -54,6 +57,12 @@ class Sub(This):
     def __eq__(self, other):
         return (isinstance(other, Sub) and self.method == other.method)
 
+    def __hash__(self):
+        return hash((self.__class__.__name__, self.method))
+
+    def __reduce__(self):
+        return self.__class__, (self.method,)
+
     def __repr__(self):
         return '%s(%r)' % (self.__class__.__name__, self.method)
 
@@ -67,14 +76,16 @@ class Split(This):
     Concrete syntax is '`split(char, segment, max_split)`'
     """
 
+    __slots__ = ('char', 'segment', 'max_split', 'method')
+
     def __init__(self, method=None):
         m = SPLIT.match(method)
         if m is None:
             raise DefintionInvalid("%s is not valid" % method)
-        self.char = m.group(1)
-        self.segment = int(m.group(2))
-        self.max_split = int(m.group(3))
-        self.method = method
+        _set(self, 'char', m.group(1))
+        _set(self, 'segment', int(m.group(2)))
+        _set(self, 'max_split', int(m.group(3)))
+        _set(self, 'method', method)
 
     def find(self, datum):
         datum = DatumInContext.wrap(datum)
@@ -87,6 +98,12 @@ class Split(This):
     def __eq__(self, other):
         return (isinstance(other, Split) and self.method == other.method)
 
+    def __hash__(self):
+        return hash((self.__class__.__name__, self.method))
+
+    def __reduce__(self):
+        return self.__class__, (self.method,)
+
     def __repr__(self):
         return '%s(%r)' % (self.__class__.__name__, self.method)
 
@@ -100,11 +117,13 @@ class Str(This):
     Concrete syntax is '`str()`'
     """
 
+    __slots__ = ('method',)
+
     def __init__(self, method=None):
         m = STR.match(method)
         if m is None:
             raise DefintionInvalid("%s is not valid" % method)
-        self.method = method
+        _set(self, 'method', method)
 
     def find(self, datum):
         datum = DatumInContext.wrap(datum)
@@ -114,6 +133,12 @@ class Str(This):
     def __eq__(self, other):
         return (isinstance(other, Str) and self.method == other.method)
 
+    def __hash__(self):
+        return hash((self.__class__.__name__, self.method))
+
+    def __reduce__(self):
+        return self.__class__, (self.method,)
+
     def __repr__(self):
         return '%s(%r)' % (self.__class__.__name__, self.method)
 
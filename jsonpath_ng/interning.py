@@ -0,0 +1,85 @@
+import threading
+import weakref
+
+from jsonpath_ng.jsonpath import JSONPath
+
+
+class InternTable:
+    """
+    A table of canonical `JSONPath` nodes, so that structurally identical
+    (sub)expressions share a single node object.
+
+    Nodes are identified by their class and constructor arguments, as given
+    by `JSONPath.__reduce__`, with literal arguments compared by type as
+    well as value. The table only holds weak references: a canonical node
+    is dropped once no expression uses it anymore.
+    """
+
+    def __init__(self):
+        self._nodes = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+
+    def intern(self, node):
+        """
+        Returns the canonical node equal to `node`, registering `node`
+        (rebuilt over canonical children if needed) when there is none yet.
+        """
+        node_class, args = node.__reduce__()[:2]
+        interned_args, key = self._intern_values(args)
+        key = (node_class, key)
+
+        try:
+            canonical = self._nodes.get(key)
+        except TypeError:
+            # Unhashable constructor arguments; such nodes are not shared
+            return node
+        if canonical is not None:
+            return canonical
+
+        if interned_args is not args:
+            node = node_class(*interned_args)
+
+        with self._lock:
+            return self._nodes.setdefault(key, node)
+
+    def clear(self):
+        with self._lock:
+            self._nodes.clear()
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def _intern_values(self, values):
+        """
+        Interns the nodes among `values`, a list or tuple, returning the
+        interned values (`values` itself if unchanged) and their key.
+        """
+        interned = []
+        key = []
+        changed = False
+        for value in values:
+            if isinstance(value, JSONPath):
+                new_value = self.intern(value)
+                # Children are canonical, so they can be told apart by identity.
+                # They live as long as their parent, and with it the key.
+                key.append(id(new_value))
+            elif isinstance(value, (list, tuple)):
+                new_value, value_key = self._intern_values(value)
+                key.append((type(value), value_key))
+            else:
+                new_value = value
+                key.append((type(value), value))
+            changed = changed or new_value is not value
+            interned.append(new_value)
+        return (type(values)(interned) if changed else values), tuple(key)
+
+
+# The table used by `intern` and by the process-wide parse cache
+intern_table = InternTable()
+
+
+def intern(node):
+    """
+    Returns the canonical node equal to `node` from the process-wide table.
+    """
+    return intern_table.intern(node)
@@ -1,9 +1,13 @@
-import logging
-from itertools import *  # noqa
-from jsonpath_ng.lexer import JsonPathLexer
+import bisect
+import sys
+import time
+import weakref
+from types import MemberDescriptorType
 
-# Get logger name
-logger = logging.getLogger(__name__)
+__all__ = [
+    'JSONPath', 'DatumInContext', 'AutoIdForDatum', 'IndexedDatum', 'JsonIndex', 'Root', 'This', 'Child', 'Parent',
+    'Where', 'Descendants', 'Union', 'Intersect', 'Fields', 'Index', 'Slice',
+]
 
 # Turn on/off the automatic creation of id attributes
 # ... could be a kwarg pervasively but uses are rare and simple today
@@ -12,14 +16,58 @@ auto_id_field = None
 NOT_SET = object()
 LIST_KEY = object()
 
+# Sets an attribute of a node being constructed, without the checks of
+# `JSONPath.__setattr__`
+_set = object.__setattr__
+
+
+class _Wrapped(list):
+    """
+    The list of one item that `Slice` puts a dict or a scalar in, told apart
+    from the lists of the data by `_locations`.
+    """
+
+    __slots__ = ()
+
 
 class JSONPath:
     """
     The base class for JSONPath abstract syntax; those
     methods stubbed here are the interface to supported
     JSONPath semantics.
+
+    Nodes are immutable: their attributes are set once, by the constructor,
+    so that a node can be shared by many expressions (see
+    `jsonpath_ng.interning`). `__reduce__` returns the constructor arguments
+    of a node, which is how nodes are pickled, compared for interning and
+    rebuilt; subclasses taking arguments must override it.
+
+    Nodes keep their attributes in `__slots__` rather than a `__dict__`, so
+    each subclass declares the attributes it sets.
+
+    `__setattr__` lets each attribute be set once. The nodes of the library
+    bypass it in their constructors, with `_set`, as paths such as
+    `Fields(key)` are built for every match and expressions by the thousand
+    when loaded from the persistent cache.
     """
 
+    __slots__ = ('__weakref__',)
+
+    def __setattr__(self, name, value):
+        slot = getattr(type(self), name, None)
+        if (name in getattr(self, '__dict__', ())
+                or isinstance(slot, MemberDescriptorType) and hasattr(self, name)):
+            raise AttributeError('%s nodes are immutable, cannot reassign %r'
+                                 % (self.__class__.__name__, name))
+        object.__setattr__(self, name, value)
+
+    def __delattr__(self, name):
+        raise AttributeError('%s nodes are immutable, cannot delete %r'
+                             % (self.__class__.__name__, name))
+
+    def __reduce__(self):
+        return self.__class__, ()
+
     def find(self, data):
         """
         All `JSONPath` types support `find()`, which returns an iterable of `DatumInContext`s.
@@ -28,6 +76,65 @@ class JSONPath:
         """
         raise NotImplementedError()
 
+    def iter_find(self, data):
+        """
+        Like `find()`, but returns an iterator producing the matches one at a
+        time, so that the caller can stop early and large results are never
+        held in memory at once. Nodes whose matches can be computed lazily
+        override this and implement `find()` as `list(self.iter_find(data))`.
+        """
+        return iter(self.find(data))
+
+    def find_values(self, data):
+        """
+        Returns the values of the matches of `find()`, as
+        `[match.value for match in self.find(data)]` would.
+        """
+        return list(self.iter_values(data))
+
+    def iter_values(self, data):
+        """
+        Like `find_values()`, but returns an iterator.
+
+        Unless the expression needs the context of the data it walks (it
+        uses `parent`, or `$` anywhere but at its start) or auto ids are
+        enabled, the values are found without creating the `DatumInContext`
+        and path of each match and intermediate result.
+        """
+        if (auto_id_field is not None or isinstance(data, DatumInContext)
+                or _needs_context(self)):
+            return (datum.value for datum in self.iter_find(data))
+        return self._iter_values(data)
+
+    def _iter_values(self, value):
+        """
+        Produces the values `iter_find()` would match in `value`, a plain
+        value without context. Nodes that can do so without building their
+        matches override this.
+        """
+        return (datum.value for datum in self.iter_find(DatumInContext(value)))
+
+    def find_first(self, data):
+        """
+        Returns the first match of `find()`, or None if there is none,
+        evaluating no further than that match.
+        """
+        return next(self.iter_find(data), None)
+
+    def exists(self, data):
+        """
+        Returns whether `find()` has any match, evaluating no further than
+        the first one.
+        """
+        return next(self.iter_find(data), NOT_SET) is not NOT_SET
+
+    def count(self, data):
+        """
+        Returns the number of matches of `find()`. Nodes that can count
+        their matches without building them override this.
+        """
+        return sum(1 for _ in self.iter_find(data))
+
     def find_or_create(self, data):
         return self.find(data)
 
@@ -55,6 +162,15 @@ class JSONPath:
 
         raise NotImplementedError()
 
+    def compile(self):
+        """
+        Returns an equivalent expression whose `find()`, `find_values()` and
+        `update()` run as a chain of Python closures generated for this AST,
+        rather than by walking it. See `jsonpath_ng.compiler`.
+        """
+        from jsonpath_ng.compiler import CompiledJSONPath
+        return CompiledJSONPath(self)
+
     def child(self, child):
         """
         Equivalent to Child(self, next) but with some canonicalization
@@ -91,7 +207,13 @@ class DatumInContext:
     which extends the path. If the datum already has a context, it places the entire
     context within that passed in, so an object can be built from the inside
     out.
+
+    The full path, root and path tuple of a datum are computed on first use
+    and kept, so a datum's `path` and `context` must not be changed.
     """
+
+    __slots__ = ('value', 'path', 'context', '_full_path', '_root', '_path_tuple')
+
     @classmethod
     def wrap(cls, data):
         if isinstance(data, cls):
@@ -103,6 +225,7 @@ class DatumInContext:
         self.value = value
         self.path = path or This()
         self.context = None if context is None else DatumInContext.wrap(context)
+        self._full_path = self._root = self._path_tuple = None
 
     def in_context(self, context, path):
         context = DatumInContext.wrap(context)
@@ -114,7 +237,38 @@ class DatumInContext:
 
     @property
     def full_path(self):
-        return self.path if self.context is None else self.context.full_path.child(self.path)
+        if self._full_path is None:
+            self._full_path = self.path if self.context is None else self.context.full_path.child(self.path)
+        return self._full_path
+
+    @property
+    def root(self):
+        """
+        The topmost datum of the context chain, which `$` refers to.
+        """
+        if self._root is None:
+            self._root = self if self.context is None else self.context.root
+        return self._root
+
+    @property
+    def path_tuple(self):
+        """
+        The full path as a tuple of field names and list indices, such as
+        `('foo', 0, 'bar')` for `foo.[0].bar`. Steps that are not a single
+        field or an index appear as their path node; `$` and `this` are left
+        out.
+        """
+        if self._path_tuple is None:
+            path_tuple = () if self.context is None else self.context.path_tuple
+            path = self.path
+            if isinstance(path, Fields) and len(path.fields) == 1:
+                path_tuple += path.fields
+            elif isinstance(path, Index):
+                path_tuple += (path.index,)
+            elif not isinstance(path, (Root, This)):
+                path_tuple += (path,)
+            self._path_tuple = path_tuple
+        return self._path_tuple
 
     @property
     def id_pseudopath(self):
@@ -153,6 +307,8 @@ class AutoIdForDatum(DatumInContext):
     than `None`.
     """
 
+    __slots__ = ('datum', 'id_field')
+
     def __init__(self, datum, id_field=None):
         """
         Invariant is that datum.path is the path from context to datum. The auto id
@@ -164,6 +320,7 @@ class AutoIdForDatum(DatumInContext):
         """
         self.datum = datum
         self.id_field = id_field or auto_id_field
+        self._full_path = self._root = self._path_tuple = None
 
     @property
     def value(self):
@@ -187,20 +344,218 @@ class AutoIdForDatum(DatumInContext):
         return isinstance(other, AutoIdForDatum) and other.datum == self.datum and self.id_field == other.id_field
 
 
+class IndexedDatum(DatumInContext):
+    """
+    A datum of a `JsonIndex`, at `position` in the document order of the
+    index. Fields, indices, slices and descendants of an indexed datum are
+    looked up in the index rather than found by walking its value.
+    """
+
+    __slots__ = ('index', 'position')
+
+    def __init__(self, value, path, context, index, position):
+        DatumInContext.__init__(self, value, path, context)
+        self.index = index
+        self.position = position
+
+    @property
+    def depth(self):
+        """The number of steps from the root of the index to this datum"""
+        return self.index.depths[self.position]
+
+
+class JsonIndex(IndexedDatum):
+    """
+    An index of a document, built in a single traversal, for evaluating many
+    expressions against the same document. `find()` (and the other
+    evaluation methods) take the index in place of the document, and return
+    the same matches, whose datums are those of the index rather than new
+    ones. The index itself is the datum of the document, as
+    `DatumInContext.wrap(data)` would be, and `root_datum` that of `$`. The
+    matches have the one they were found from at the top of their context,
+    as on the document, so their full paths are the same:
+
+        index = JsonIndex(data)
+        prices = parse('$..price').find(index)
+
+    The index holds a datum for every value of the document in document
+    order (`nodes`), with the position following its last descendant
+    (`ends`), its depth (`depths`) and the positions of its items if it is
+    a list or a dict (`children`); and, by field name, the positions of the
+    values of that field (`fields`), in the document order of the dicts
+    holding them. `..field` is thus a lookup and a slice, and `parent` a
+    pointer, as for any datum. The datums of `nodes` have `root_datum` at
+    the top of their context; those found from the index itself, or below
+    a negative index, are made from them when first found (`rebase()`).
+
+    The index is a snapshot: the document must not be changed while it is in
+    use. `build_time` is the time the index took to build, in seconds, and
+    `memory_size()` estimates the memory it takes.
+    """
+
+    __slots__ = ('root_datum', 'nodes', 'ends', 'depths', 'children', 'fields', 'plain', 'build_time', '_relative')
+
+    def __init__(self, data):
+        start = time.perf_counter()
+        IndexedDatum.__init__(self, data, None, None, self, 0)
+        # What `$` finds: the same position, with the path of `$`
+        self.root_datum = IndexedDatum(data, Root(), None, self, 0)
+
+        # The datums found from the index rather than through `$`, by position
+        self._relative = {0: self}
+
+        nodes, ends, depths, children = [self.root_datum], [1], [0], [None]
+        fields = {}
+        # Whether the dicts and lists are all of exactly those types, whose
+        # items are known to be what `Fields` and `Slice` find
+        plain = True
+        # Paths are immutable, so the datums of the same key share theirs
+        paths = {}
+
+        items = _child_items(data)
+        stack = []
+        if items is not None:
+            children[0] = []
+            stack.append((self.root_datum, items))
+            plain = type(data) is dict or type(data) is list
+        while stack:
+            parent, items = stack[-1]
+            is_list = isinstance(parent.value, list)
+            for key, value in items:
+                position = len(nodes)
+                path = paths.get((is_list, key))
+                if path is None:
+                    path = paths[is_list, key] = Index(key) if is_list else Fields(key)
+                datum = IndexedDatum(value, path, parent, self, position)
+                nodes.append(datum)
+                ends.append(position + 1)
+                depths.append(depths[parent.position] + 1)
+                children[parent.position].append(position)
+                if not is_list:
+                    fields.setdefault(key, []).append((parent.position, position))
+
+                items = _child_items(value)
+                if items is None:
+                    children.append(None)
+                else:
+                    children.append([])
+                    stack.append((datum, items))
+                    plain = plain and (type(value) is dict or type(value) is list)
+                    break
+            else:
+                stack.pop()
+                ends[parent.position] = len(nodes)
+
+        # The values of a field, by position of the dicts holding them
+        for key, positions in fields.items():
+            positions.sort()
+            fields[key] = ([parent for parent, _ in positions], [position for _, position in positions])
+
+        self.nodes = nodes
+        self.ends = ends
+        self.depths = depths
+        self.children = children
+        self.fields = fields
+        self.plain = plain
+        self.build_time = time.perf_counter() - start
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __repr__(self):
+        return '%s(<%d nodes>)' % (self.__class__.__name__, len(self.nodes))
+
+    def memory_size(self):
+        """
+        An estimate of the memory taken by the index, in bytes, leaving out
+        the document itself.
+        """
+        size = sys.getsizeof
+        total = sum(map(size, (self.nodes, self.ends, self.depths, self.children, self.fields)))
+        total += sum(size(datum) for datum in self.nodes)
+        total += size(self._relative) + sum(size(datum) for datum in self._relative.values())
+        total += sum(size(positions) for positions in self.children if positions is not None)
+        total += sum(size(parents) + size(positions) for parents, positions in self.fields.values())
+        total += sum(size(path) for path in {id(datum.path): datum.path for datum in self.nodes}.values())
+        return total
+
+    def field(self, position, field):
+        """The datum of `field` in the dict at `position`, or None"""
+        entry = self.fields.get(field)
+        if entry is None:
+            return None
+        parents, positions = entry
+        i = bisect.bisect_left(parents, position)
+        if i < len(parents) and parents[i] == position:
+            return self.nodes[positions[i]]
+        return None
+
+    def descendant_fields(self, position, fields):
+        """
+        The datums of `fields` in the dicts at or below `position`, in the
+        order `..` finds them: by dict, then in the order of `fields`.
+        """
+        end = self.ends[position]
+        ranges = []
+        for order, field in enumerate(fields):
+            entry = self.fields.get(field)
+            if entry is not None:
+                parents, positions = entry
+                i, j = bisect.bisect_left(parents, position), bisect.bisect_left(parents, end)
+                ranges.append((parents, positions, i, j, order))
+
+        nodes = self.nodes
+        if len(ranges) == 1:
+            _, positions, i, j, _ = ranges[0]
+            return [nodes[positions[k]] for k in range(i, j)]
+        matches = sorted((parents[k], order, positions[k])
+                         for parents, positions, i, j, order in ranges for k in range(i, j))
+        return [nodes[match[2]] for match in matches]
+
+    def rebase(self, node, datum):
+        """
+        `node`, a datum of `nodes` at or below `datum`, with `datum` rather
+        than `root_datum` above it: the same node found from `datum`.
+        """
+        if datum is self.nodes[datum.position]:
+            return node
+        # Those under the index are kept, to be found again without copies
+        relative = self._relative if self._relative.get(datum.position) is datum else None
+        chain = []
+        while node.position != datum.position:
+            if relative is not None and node.position in relative:
+                top = relative[node.position]
+                break
+            chain.append(node)
+            node = node.context
+        else:
+            top = datum
+        for node in reversed(chain):
+            top = IndexedDatum(node.value, node.path, top, self, node.position)
+            if relative is not None:
+                relative[node.position] = top
+        return top
+
+
 class Root(JSONPath):
     """
     The JSONPath referring to the "root" object. Concrete syntax is '$'.
     The root is the topmost datum without any context attached.
     """
 
+    __slots__ = ()
+
     def find(self, data):
         if not isinstance(data, DatumInContext):
             return [DatumInContext(data, path=Root(), context=None)]
+        elif isinstance(data, IndexedDatum):
+            return [data.index.root_datum]
         else:
-            if data.context is None:
-                return [DatumInContext(data.value, context=None, path=Root())]
-            else:
-                return Root().find(data.context)
+            return [DatumInContext(data.root.value, context=None, path=Root())]
+
+    def _iter_values(self, value):
+        # Only reached when `$` starts the expression: `value` is the root
+        yield value
 
     def update(self, data, val):
         return val
@@ -226,6 +581,8 @@ class This(JSONPath):
     The JSONPath referring to the current datum. Concrete syntax is '@'.
     """
 
+    __slots__ = ()
+
     def find(self, datum):
         return [DatumInContext.wrap(datum)]
 
@@ -254,20 +611,36 @@ class Child(JSONPath):
     Concrete syntax is <left> '.' <right>
     """
 
+    __slots__ = ('left', 'right')
+
     def __init__(self, left, right):
-        self.left = left
-        self.right = right
+        _set(self, 'left', left)
+        _set(self, 'right', right)
 
     def find(self, datum):
+        return list(self.iter_find(datum))
+
+    def iter_find(self, datum):
         """
         Extra special case: auto ids do not have children,
         so cut it off right now rather than auto id the auto id
         """
 
-        return [submatch
-                for subdata in self.left.find(datum)
-                if not isinstance(subdata, AutoIdForDatum)
-                for submatch in self.right.find(subdata)]
+        for subdata in self.left.iter_find(datum):
+            if not isinstance(subdata, AutoIdForDatum):
+                yield from self.right.iter_find(subdata)
+
+    def _iter_values(self, value):
+        for subvalue in self.left._iter_values(value):
+            yield from self.right._iter_values(subvalue)
+
+    def count(self, datum):
+        if (auto_id_field is None and not isinstance(datum, DatumInContext)
+                and not _needs_context(self)):
+            return sum(1 for _ in self._iter_values(datum))
+        return sum(self.right.count(subdata)
+                   for subdata in self.left.iter_find(datum)
+                   if not isinstance(subdata, AutoIdForDatum))
 
     def update(self, data, val):
         for datum in self.left.find(data):
@@ -308,6 +681,9 @@ class Child(JSONPath):
     def __hash__(self):
         return hash((self.left, self.right))
 
+    def __reduce__(self):
+        return self.__class__, (self.left, self.right)
+
 
 class Parent(JSONPath):
     """
@@ -316,6 +692,8 @@ class Parent(JSONPath):
     Available via named operator `parent`.
     """
 
+    __slots__ = ()
+
     def find(self, datum):
         datum = DatumInContext.wrap(datum)
         return [datum.context]
@@ -343,12 +721,23 @@ class Where(JSONPath):
     or some other better word for it.
     """
 
+    __slots__ = ('left', 'right')
+
     def __init__(self, left, right):
-        self.left = left
-        self.right = right
+        _set(self, 'left', left)
+        _set(self, 'right', right)
 
     def find(self, data):
-        return [subdata for subdata in self.left.find(data) if self.right.find(subdata)]
+        return list(self.iter_find(data))
+
+    def iter_find(self, data):
+        # Only whether the right side has a match matters, so it is
+        # evaluated no further than its first one
+        return (subdata for subdata in self.left.iter_find(data) if self.right.exists(subdata))
+
+    def _iter_values(self, value):
+        return (subvalue for subvalue in self.left._iter_values(value)
+                if next(iter(self.right._iter_values(subvalue)), NOT_SET) is not NOT_SET)
 
     def update(self, data, val):
         for datum in self.find(data):
@@ -363,57 +752,92 @@ class Where(JSONPath):
     def __str__(self):
         return '%s where %s' % (self.left, self.right)
 
+    def __repr__(self):
+        return '%s(%r, %r)' % (self.__class__.__name__, self.left, self.right)
+
     def __eq__(self, other):
         return isinstance(other, Where) and other.left == self.left and other.right == self.right
 
     def __hash__(self):
         return hash((self.left, self.right))
 
+    def __reduce__(self):
+        return self.__class__, (self.left, self.right)
+
+
 class Descendants(JSONPath):
     """
     JSONPath that matches first the left expression then any descendant
     of it which matches the right expression.
     """
 
+    __slots__ = ('left', 'right')
+
     def __init__(self, left, right):
-        self.left = left
-        self.right = right
+        _set(self, 'left', left)
+        _set(self, 'right', right)
 
     def find(self, datum):
+        return list(self.iter_find(datum))
+
+    def iter_find(self, datum):
         # <left> .. <right> ==> <left> . (<right> | *..<right> | [*]..<right>)
         #
         # With with a wonky caveat that since Slice() has funky coercions
         # we cannot just delegate to that equivalence or we'll hit an
         # infinite loop. So right here we implement the coercion-free version.
-
-        # Get all left matches into a list
-        left_matches = self.left.find(datum)
-        if not isinstance(left_matches, list):
-            left_matches = [left_matches]
-
-        def match_recursively(datum):
-            right_matches = self.right.find(datum)
-
-            # Manually do the * or [*] to avoid coercion and recurse just the right-hand pattern
-            if isinstance(datum.value, list):
-                recursive_matches = [submatch
-                                     for i in range(0, len(datum.value))
-                                     for submatch in match_recursively(DatumInContext(datum.value[i], context=datum, path=Index(i)))]
-
-            elif isinstance(datum.value, dict):
-                recursive_matches = [submatch
-                                     for field in datum.value.keys()
-                                     for submatch in match_recursively(DatumInContext(datum.value[field], context=datum, path=Fields(field)))]
-
+        #
+        # The descendants are walked with an explicit stack rather than by
+        # recursion, so that the depth of the data is not limited by the
+        # Python stack.
+        #
+        # When the right side is a field, index or slice, the descendants it
+        # cannot match are skipped by looking at their values alone, and
+        # only the matches and their ancestors get a `DatumInContext`.
+        test = _descendant_test(self.right)
+        for left_match in self.left.iter_find(datum):
+            if isinstance(left_match, IndexedDatum):
+                yield from self._iter_indexed(left_match, test)
+            elif test is None:
+                for descendant in _walk(left_match, _child_data):
+                    yield from self.right.iter_find(descendant)
             else:
-                recursive_matches = []
-
-            return right_matches + list(recursive_matches)
-
-        # TODO: repeatable iterator instead of list?
-        return [submatch
-                for left_match in left_matches
-                for submatch in match_recursively(left_match)]
+                for descendant in _walk_hits(left_match, test):
+                    yield from self.right.iter_find(descendant)
+
+    def _iter_indexed(self, left_match, test):
+        index, position = left_match.index, left_match.position
+        rebased = left_match is not index.nodes[position]
+        if test is not None and type(self.right) is Fields and index.plain:
+            matches = index.descendant_fields(position, self.right.fields)
+            yield from (index.rebase(match, left_match) for match in matches) if rebased else matches
+            return
+        for descendant in index.nodes[position:index.ends[position]]:
+            if test is None or test(descendant.value):
+                yield from self.right.iter_find(index.rebase(descendant, left_match) if rebased else descendant)
+
+    def _iter_values(self, value):
+        test = _descendant_test(self.right)
+        for left_value in self.left._iter_values(value):
+            for descendant in _walk(left_value, _child_values):
+                if test is None or test(descendant):
+                    yield from self.right._iter_values(descendant)
+
+    def count(self, datum):
+        if (auto_id_field is None and not isinstance(datum, DatumInContext)
+                and not _needs_context(self)):
+            return sum(1 for _ in self._iter_values(datum))
+        test = _descendant_test(self.right)
+        if isinstance(datum, IndexedDatum):
+            return sum(1 for _ in self.iter_find(datum))
+        if test is None:
+            return sum(self.right.count(descendant)
+                       for left_match in self.left.iter_find(datum)
+                       for descendant in _walk(left_match, _child_data))
+        return sum(self.right.count(descendant)
+                   for left_match in self.left.iter_find(datum)
+                   for descendant in _walk(left_match.value, _child_values)
+                   if test(descendant))
 
     def is_singular(self):
         return False
@@ -424,24 +848,11 @@ class Descendants(JSONPath):
         if not isinstance(left_matches, list):
             left_matches = [left_matches]
 
-        def update_recursively(data):
-            # Update only mutable values corresponding to JSON types
-            if not (isinstance(data, list) or isinstance(data, dict)):
-                return
-
-            self.right.update(data, val)
-
-            # Manually do the * or [*] to avoid coercion and recurse just the right-hand pattern
-            if isinstance(data, list):
-                for i in range(0, len(data)):
-                    update_recursively(data[i])
-
-            elif isinstance(data, dict):
-                for field in data.keys():
-                    update_recursively(data[field])
-
         for submatch in left_matches:
-            update_recursively(submatch.value)
+            for descendant in _walk(submatch.value, _child_values):
+                # Update only mutable values corresponding to JSON types
+                if isinstance(descendant, list) or isinstance(descendant, dict):
+                    self.right.update(descendant, val)
 
         return data
 
@@ -451,24 +862,11 @@ class Descendants(JSONPath):
         if not isinstance(left_matches, list):
             left_matches = [left_matches]
 
-        def filter_recursively(data):
-            # Update only mutable values corresponding to JSON types
-            if not (isinstance(data, list) or isinstance(data, dict)):
-                return
-
-            self.right.filter(fn, data)
-
-            # Manually do the * or [*] to avoid coercion and recurse just the right-hand pattern
-            if isinstance(data, list):
-                for i in range(0, len(data)):
-                    filter_recursively(data[i])
-
-            elif isinstance(data, dict):
-                for field in data.keys():
-                    filter_recursively(data[field])
-
         for submatch in left_matches:
-            filter_recursively(submatch.value)
+            for descendant in _walk(submatch.value, _child_values):
+                # Update only mutable values corresponding to JSON types
+                if isinstance(descendant, list) or isinstance(descendant, dict):
+                    self.right.filter(fn, descendant)
 
         return data
 
@@ -484,6 +882,9 @@ class Descendants(JSONPath):
     def __hash__(self):
         return hash((self.left, self.right))
 
+    def __reduce__(self):
+        return self.__class__, (self.left, self.right)
+
 
 class Union(JSONPath):
     """
@@ -494,22 +895,72 @@ class Union(JSONPath):
 
     WARNING: Any appearance of this being the _concatenation_ is
     coincidence. It may even be a bug! (or laziness)
+
+    With `unique`, a match of the right side at the same path as an earlier
+    match (such as `$.x.a` in `$..a|$.x.a`) is left out, which takes the
+    paths of the matches, and so their contexts, even for `find_values()`.
+
+    `update()` and `filter()` apply to each location matched by either
+    side once, however many times it is matched.
     """
-    def __init__(self, left, right):
-        self.left = left
-        self.right = right
+
+    __slots__ = ('left', 'right', 'unique')
+
+    def __init__(self, left, right, unique=False):
+        _set(self, 'left', left)
+        _set(self, 'right', right)
+        _set(self, 'unique', unique)
 
     def is_singular(self):
         return False
 
     def find(self, data):
-        return self.left.find(data) + self.right.find(data)
+        return list(self.iter_find(data))
+
+    def iter_find(self, data):
+        matches = self._iter_both(data)
+        return _unique_paths(matches) if self.unique else matches
+
+    def _iter_both(self, data):
+        yield from self.left.iter_find(data)
+        yield from self.right.iter_find(data)
+
+    def _iter_values(self, value):
+        if self.unique:
+            yield from super()._iter_values(value)
+            return
+        yield from self.left._iter_values(value)
+        yield from self.right._iter_values(value)
+
+    def count(self, data):
+        if self.unique:
+            return sum(1 for _ in self.iter_find(data))
+        return self.left.count(data) + self.right.count(data)
+
+    def update(self, data, val):
+        return _update_locations(self._iter_both(data), data, val)
+
+    def filter(self, fn, data):
+        return _filter_locations(self._iter_both(data), fn, data)
+
+    def __str__(self):
+        return '%s|%s' % (self.left, self.right)
+
+    def __repr__(self):
+        if self.unique:
+            return '%s(%r, %r, unique=True)' % (self.__class__.__name__, self.left, self.right)
+        return '%s(%r, %r)' % (self.__class__.__name__, self.left, self.right)
 
     def __eq__(self, other):
-        return isinstance(other, Union) and self.left == other.left and self.right == other.right
+        return (isinstance(other, Union) and self.left == other.left and self.right == other.right
+                and self.unique == other.unique)
 
     def __hash__(self):
-        return hash((self.left, self.right))
+        return hash((self.left, self.right, self.unique))
+
+    def __reduce__(self):
+        return self.__class__, (self.left, self.right, self.unique)
+
 
 class Intersect(JSONPath):
     """
@@ -521,16 +972,45 @@ class Intersect(JSONPath):
     intersection of regular languages. The next
     idea is to build a filtered data and match against
     that.
+
+    Here, matches of the left side are produced, in their order, if a match of
+    the right side holds the same location of the data, that is if they
+    are values of the same list or dict at the same key. The locations of
+    the right side are found first and kept in a set.
     """
+
+    __slots__ = ('left', 'right')
+
     def __init__(self, left, right):
-        self.left = left
-        self.right = right
+        _set(self, 'left', left)
+        _set(self, 'right', right)
 
     def is_singular(self):
         return False
 
     def find(self, data):
-        raise NotImplementedError()
+        return list(self.iter_find(data))
+
+    def iter_find(self, data):
+        # The matches of the right side are kept along with their
+        # locations, which they keep alive
+        right_matches = self.right.find(data)
+        right = {_location_key(container, key) for _, container, key in _locations(right_matches)}
+        for match, container, key in _locations(self.left.iter_find(data)):
+            if _location_key(container, key) in right:
+                yield match
+
+    def update(self, data, val):
+        return _update_locations(self.iter_find(data), data, val)
+
+    def filter(self, fn, data):
+        return _filter_locations(self.iter_find(data), fn, data)
+
+    def __str__(self):
+        return '%s&%s' % (self.left, self.right)
+
+    def __repr__(self):
+        return '%s(%r, %r)' % (self.__class__.__name__, self.left, self.right)
 
     def __eq__(self, other):
         return isinstance(other, Intersect) and self.left == other.left and self.right == other.right
@@ -538,6 +1018,9 @@ class Intersect(JSONPath):
     def __hash__(self):
         return hash((self.left, self.right))
 
+    def __reduce__(self):
+        return self.__class__, (self.left, self.right)
+
 
 class Fields(JSONPath):
     """
@@ -548,8 +1031,10 @@ class Fields(JSONPath):
     all be returned.
     """
 
+    __slots__ = ('fields',)
+
     def __init__(self, *fields):
-        self.fields = fields
+        _set(self, 'fields', fields)
 
     @staticmethod
     def get_field_datum(datum, field, create):
@@ -577,7 +1062,63 @@ class Fields(JSONPath):
                 return ()
 
     def find(self, datum):
-        return self._find_base(datum, create=False)
+        return list(self.iter_find(datum))
+
+    def iter_find(self, datum):
+        datum = DatumInContext.wrap(datum)
+        if (isinstance(datum, IndexedDatum) and type(datum.value) is dict
+                and datum.index.plain and auto_id_field is None):
+            index = datum.index
+            rebased = datum is not index.nodes[datum.position]
+            if '*' in self.fields:
+                matches = map(index.nodes.__getitem__, index.children[datum.position])
+                yield from (index.rebase(match, datum) for match in matches) if rebased else matches
+                return
+            for field in self.fields:
+                field_datum = index.field(datum.position, field)
+                if field_datum is not None:
+                    yield index.rebase(field_datum, datum) if rebased else field_datum
+            return
+        for field in self.reified_fields(datum):
+            field_datum = self.get_field_datum(datum, field, create=False)
+            if field_datum is not None:
+                yield field_datum
+
+    def _iter_values(self, value):
+        fields = self.fields
+        if '*' in fields:
+            try:
+                fields = tuple(value.keys())
+            except AttributeError:
+                return
+        for field in fields:
+            try:
+                field_value = value.get(field, NOT_SET)
+            except (TypeError, AttributeError):
+                continue
+            if field_value is not NOT_SET:
+                yield field_value
+
+    def count(self, datum):
+        value = datum.value if isinstance(datum, DatumInContext) else datum
+        fields = self.fields
+        if '*' in fields:
+            try:
+                fields = tuple(value.keys())
+            except AttributeError:
+                return 0
+            if auto_id_field is not None:
+                fields += (auto_id_field,)
+        count = 0
+        for field in fields:
+            if field == auto_id_field:
+                count += 1
+                continue
+            try:
+                count += value.get(field, NOT_SET) is not NOT_SET
+            except (TypeError, AttributeError):
+                pass
+        return count
 
     def find_or_create(self, datum):
         return self._find_base(datum, create=True)
@@ -619,6 +1160,8 @@ class Fields(JSONPath):
         # This avoids unnecessary quotes to keep strings short.
         # Test each field whether it contains a literal and only then add quotes
         # The test loops over all literals, could possibly optimize to short circuit if one found
+        # The lexer is imported here so that importing the AST does not load PLY.
+        from jsonpath_ng.lexer import JsonPathLexer
         fields_as_str = ("'" + str(f) + "'" if any([l in f for l in JsonPathLexer.literals]) else
                          str(f) for f in self.fields)
         return ','.join(fields_as_str)
@@ -633,6 +1176,9 @@ class Fields(JSONPath):
     def __hash__(self):
         return hash(tuple(self.fields))
 
+    def __reduce__(self):
+        return self.__class__, tuple(self.fields)
+
 
 class Index(JSONPath):
     """
@@ -643,8 +1189,10 @@ class Index(JSONPath):
     NOTE: For the concrete syntax of `[*]`, the abstract syntax is a Slice() with no parameters (equiv to `[:]`
     """
 
+    __slots__ = ('index',)
+
     def __init__(self, index):
-        self.index = index
+        _set(self, 'index', index)
 
     def find(self, datum):
         return self._find_base(datum, create=False)
@@ -659,10 +1207,30 @@ class Index(JSONPath):
                 datum.value = _create_list_key(datum.value)
             self._pad_value(datum.value)
         if datum.value and len(datum.value) > self.index:
+            if (not create and isinstance(datum, IndexedDatum)
+                    and type(datum.value) is list and datum.index.plain):
+                index = datum.index
+                match = index.nodes[index.children[datum.position][self.index]]
+                if self.index < 0:
+                    # The same item, with the path it was found by
+                    return [IndexedDatum(match.value, self, datum, index, match.position)]
+                return [index.rebase(match, datum)]
             return [DatumInContext(datum.value[self.index], path=self, context=datum)]
         else:
             return []
 
+    def _iter_values(self, value):
+        if value and len(value) > self.index:
+            yield value[self.index]
+
+    def count(self, datum):
+        value = datum.value if isinstance(datum, DatumInContext) else datum
+        if value and len(value) > self.index:
+            # Looked up as by `find`, to fail the same way on dicts and sets
+            value[self.index]
+            return 1
+        return 0
+
     def update(self, data, val):
         return self._update_base(data, val, create=False)
 
@@ -702,6 +1270,9 @@ class Index(JSONPath):
     def __hash__(self):
         return hash(self.index)
 
+    def __reduce__(self):
+        return self.__class__, (self.index,)
+
 
 class Slice(JSONPath):
     """
@@ -727,28 +1298,66 @@ class Slice(JSONPath):
     an iterator, but dictionaries and other objects may also be iterable,
     so this is the compromise.
     """
+
+    __slots__ = ('start', 'end', 'step')
+
     def __init__(self, start=None, end=None, step=None):
-        self.start = start
-        self.end = end
-        self.step = step
+        _set(self, 'start', start)
+        _set(self, 'end', end)
+        _set(self, 'step', step)
 
     def find(self, datum):
+        return list(self.iter_find(datum))
+
+    def iter_find(self, datum):
         datum = DatumInContext.wrap(datum)
 
         # Used for catching null value instead of empty list in path
         if not datum.value:
-            return []
+            return iter(())
         # Here's the hack. If it is a dictionary or some kind of constant,
         # put it in a single-element list
         if (isinstance(datum.value, dict) or isinstance(datum.value, int) or isinstance(datum.value, str)):
-            return self.find(DatumInContext([datum.value], path=datum.path, context=datum.context))
+            return self.iter_find(DatumInContext(_Wrapped([datum.value]), path=datum.path, context=datum.context))
 
         # Some iterators do not support slicing but we can still
         # at least work for '*'
         if self.start is None and self.end is None and self.step is None:
-            return [DatumInContext(datum.value[i], path=Index(i), context=datum) for i in range(0, len(datum.value))]
+            indices = range(0, len(datum.value))
+        else:
+            indices = range(0, len(datum.value))[self.start:self.end:self.step]
+        if isinstance(datum, IndexedDatum) and type(datum.value) is list and datum.index.plain:
+            index = datum.index
+            nodes, children = index.nodes, index.children[datum.position]
+            if datum is not nodes[datum.position]:
+                return (index.rebase(nodes[children[i]], datum) for i in indices)
+            return (nodes[children[i]] for i in indices)
+        return (DatumInContext(datum.value[i], path=Index(i), context=datum) for i in indices)
+
+    def _iter_values(self, value):
+        if not value:
+            return iter(())
+        if (isinstance(value, dict) or isinstance(value, int) or isinstance(value, str)):
+            value = [value]
+
+        if self.start is None and self.end is None and self.step is None:
+            indices = range(0, len(value))
         else:
-            return [DatumInContext(datum.value[i], path=Index(i), context=datum) for i in range(0, len(datum.value))[self.start:self.end:self.step]]
+            indices = range(0, len(value))[self.start:self.end:self.step]
+        return (value[i] for i in indices)
+
+    def count(self, datum):
+        value = datum.value if isinstance(datum, DatumInContext) else datum
+
+        if not value:
+            return 0
+        if (isinstance(value, dict) or isinstance(value, int) or isinstance(value, str)):
+            value = [value]
+        indices = range(0, len(value))[self.start:self.end:self.step]
+        if indices:
+            # Looked up as by `find`, to fail the same way on sets
+            value[indices[0]]
+        return len(indices)
 
     def update(self, data, val):
         for datum in self.find(data):
@@ -784,6 +1393,290 @@ class Slice(JSONPath):
     def __hash__(self):
         return hash((self.start, self.end, self.step))
 
+    def __reduce__(self):
+        return self.__class__, (self.start, self.end, self.step)
+
+
+def _walk(node, children):
+    """
+    Yields `node` and all its descendants, depth first and in document
+    order, using an explicit stack instead of recursion. `children(node)`
+    returns an iterator over the children of a node, or None for a leaf; it
+    is only called once the caller has processed the node, so the caller may
+    modify a node before its children are visited.
+    """
+    stack = [iter((node,))]
+    while stack:
+        for node in stack[-1]:
+            yield node
+            node_children = children(node)
+            if node_children is not None:
+                stack.append(node_children)
+                break
+        else:
+            stack.pop()
+
+
+def _child_data(datum):
+    """The children of a `DatumInContext` for `_walk`: its items, if any."""
+    value = datum.value
+    if isinstance(value, list):
+        return (DatumInContext(value[i], context=datum, path=Index(i)) for i in range(0, len(value)))
+    elif isinstance(value, dict):
+        return (DatumInContext(value[field], context=datum, path=Fields(field)) for field in value.keys())
+
+
+def _child_values(value):
+    """The children of a plain value for `_walk`: its items, if any."""
+    if isinstance(value, list):
+        return (value[i] for i in range(0, len(value)))
+    elif isinstance(value, dict):
+        return (value[field] for field in value.keys())
+
+
+def _child_items(value):
+    """The children of a plain value with their keys, like `_child_data`."""
+    if isinstance(value, list):
+        return ((i, value[i]) for i in range(0, len(value)))
+    elif isinstance(value, dict):
+        return ((field, value[field]) for field in value.keys())
+
+
+def _walk_hits(datum, test):
+    """
+    Yields the descendants of `datum` (itself included) whose value passes
+    `test`, like `_walk(datum, _child_data)` does for all of them, but only
+    makes the `DatumInContext`s of those descendants and their ancestors.
+    """
+    # The values from `datum` down to the current descendant, the keys
+    # leading to them and their datums, made when first needed
+    values, keys, data = [datum.value], [None], [datum]
+    stack = []
+    while values:
+        value = values[-1]
+        if test(value):
+            depth = len(data) - 1
+            while data[depth] is None:
+                depth -= 1
+            for depth in range(depth + 1, len(data)):
+                key = keys[depth]
+                path = Index(key) if isinstance(values[depth - 1], list) else Fields(key)
+                data[depth] = DatumInContext(values[depth], path=path, context=data[depth - 1])
+            yield data[-1]
+
+        children = _child_items(value)
+        if children is None:
+            del values[-1], keys[-1], data[-1]
+        else:
+            stack.append(children)
+        while stack:
+            for key, value in stack[-1]:
+                values.append(value)
+                keys.append(key)
+                data.append(None)
+                break
+            else:
+                stack.pop()
+                del values[-1], keys[-1], data[-1]
+                continue
+            break
+
+
+_LEAVES = (list, str, int, float, bool, type(None))
+
+
+def _descendant_test(node):
+    """
+    A test of whether `node` may match a value, looking at the value alone,
+    for `Descendants` to skip the values that `node` cannot match; or None
+    when `node` is not a field, index or slice.
+
+    A test passing a value is no promise of a match, it only means that the
+    value is left to `node` to evaluate.
+    """
+    cls = type(node)
+    if cls is Fields:
+        fields = node.fields
+        if '*' in fields or auto_id_field in fields:
+            return None
+
+        def test(value):
+            if isinstance(value, dict):
+                for field in fields:
+                    if value.get(field, NOT_SET) is not NOT_SET:
+                        return True
+                return False
+            # Lists and scalars have no fields
+            return type(value) not in _LEAVES
+        return test
+
+    elif cls is Index:
+        index = node.index
+
+        def test(value):
+            if type(value) is list:
+                return len(value) > index
+            # Strings are indexed too, and other values fail in `node`
+            return bool(value)
+        return test
+
+    elif cls is Slice:
+        start, end, step = node.start, node.end, node.step
+        if start is None and end is None and step is None:
+            # `[*]` matches all but the empty values, there is nothing to skip
+            return None
+        # Dicts, ints and strings are coerced to one-element lists by `node`
+        coerced = len(range(0, 1)[start:end:step]) > 0
+
+        def test(value):
+            if type(value) is list:
+                return len(range(0, len(value))[start:end:step]) > 0
+            elif not value:
+                return False
+            elif isinstance(value, (dict, int, str)):
+                return coerced
+            return True
+        return test
+
+
+def _unique_paths(matches):
+    """The first of `matches` at each path, by the hash of its path tuple"""
+    seen = set()
+    for match in matches:
+        key = match.path_tuple
+        if key not in seen:
+            seen.add(key)
+            yield match
+
+
+def _locations(matches):
+    """
+    The locations of `matches` in the data, each once, as
+    `(match, container, key)` triples for the matches whose value is
+    `container[key]` and `(match, None, None)` for the top of the data.
+    Matches held nowhere in the data (auto ids, or `len` and the like)
+    are left out. Negative indices are counted from the start of their
+    list, and locations are told apart by `_location_key`, so that a
+    location matched at several paths is still produced once.
+    """
+    seen = set()
+    for match in matches:
+        location = _location(match)
+        if location is None:
+            continue
+        container, key = location
+        location = _location_key(container, key)
+        if location not in seen:
+            seen.add(location)
+            yield match, container, key
+
+
+def _location(match):
+    """`(container, key)` of `match` for `_locations`, or None"""
+    if isinstance(match, AutoIdForDatum):
+        return None
+    if match.context is None:
+        return (None, None) if isinstance(match.path, (Root, This)) else None
+    path = match.path
+    if isinstance(path, Fields) and len(path.fields) == 1:
+        key = path.fields[0]
+    elif isinstance(path, Index):
+        key = path.index
+    else:
+        return None
+    container = match.context.value
+    if type(container) is _Wrapped:
+        # The list is made anew by each slice: the dict or scalar in it is
+        # where the datum of the list is
+        return _location(match.context)
+    if isinstance(path, Index) and key < 0:
+        # `[-1]` and `[len - 1]` are the same item
+        key += len(container)
+    return container, key
+
+
+def _location_key(container, key):
+    """The hashable identity of `container[key]`"""
+    return id(container), key
+
+
+def _update_locations(matches, data, val):
+    """Updates the location of each of `matches` once, as `update()`"""
+    for match, container, key in _locations(matches):
+        if container is None:
+            data = This().update(data, val)
+        elif hasattr(val, '__call__'):
+            container[key] = val(container[key], container, key)
+        else:
+            container[key] = val
+    return data
+
+
+def _filter_locations(matches, fn, data):
+    """Filters the location of each of `matches` once, as `filter()`"""
+    # Every location is tested before any is removed, as removing an item
+    # of a list moves the items after it
+    removed = []
+    for match, container, key in _locations(matches):
+        if container is None:
+            data = This().filter(fn, data)
+        elif fn(match.value):
+            removed.append((container, key))
+    # Later items of a list first, for the same reason
+    removed.sort(key=lambda location: location[1] if isinstance(location[0], list) else 0, reverse=True)
+    for container, key in removed:
+        container.pop(key)
+    return data
+
+
+# `_needs_context` of each node, by the identity of the node, which is
+# immutable, and whether it leads: (weak reference to the node, result)
+_context_needs = {}
+
+
+def _needs_context(node, leading=True):
+    """
+    Whether evaluating `node` looks at the context of the data: `parent`
+    does, and so does `$` unless it is evaluated against the data passed to
+    the expression, that is unless it starts the expression. So do unions
+    leaving out repeated paths, and intersections.
+
+    Results are kept for as long as their node lives. Nodes are told apart
+    by identity, as a node defined outside this module may be unhashable.
+    """
+    key = (id(node), leading)
+    known = _context_needs.get(key)
+    if known is not None and known[0]() is node:
+        return known[1]
+    result = _find_context_need(node, leading)
+    try:
+        reference = weakref.ref(node, lambda _, key=key: _context_needs.pop(key, None))
+    except TypeError:
+        return result
+    _context_needs[key] = (reference, result)
+    return result
+
+
+def _find_context_need(node, leading):
+    if isinstance(node, Parent):
+        return True
+    elif isinstance(node, Root):
+        return not leading
+    elif isinstance(node, Union) and node.unique or isinstance(node, Intersect):
+        # Matches are told apart by their paths or locations
+        return True
+    elif isinstance(node, (Child, Where, Descendants)):
+        return _needs_context(node.left, leading) or _needs_context(node.right, False)
+
+    def children(values):
+        for value in values:
+            if isinstance(value, JSONPath):
+                yield value
+            elif isinstance(value, (list, tuple)):
+                yield from children(value)
+
+    return any(_needs_context(child, leading) for child in children(node.__reduce__()[1]))
+
 
 def _create_list_key(dict_):
     """
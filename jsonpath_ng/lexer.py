@@ -1,5 +1,7 @@
+import re
 import sys
 import logging
+import threading
 
 import ply.lex
 
@@ -7,6 +9,12 @@ from jsonpath_ng.exceptions import JsonPathLexerError
 
 logger = logging.getLogger(__name__)
 
+# Master PLY lexers built by `JsonPathLexer.get_lexer`, keyed by lexer class
+_built_lexers = {}
+_built_lexers_lock = threading.Lock()
+
+ESCAPE = re.compile(r'\\(.)')
+
 
 class JsonPathLexer:
     '''
@@ -15,15 +23,13 @@ class JsonPathLexer:
 
     def __init__(self, debug=False):
         self.debug = debug
-        if self.__doc__ is None:
-            raise JsonPathLexerError('Docstrings have been removed! By design of PLY, jsonpath-rw requires docstrings. You must not use PYTHONOPTIMIZE=2 or python -OO.')
 
     def tokenize(self, string):
         '''
         Maps a string to an iterator over tokens. In other words: [char] -> [token]
         '''
 
-        new_lexer = ply.lex.lex(module=self, debug=self.debug, errorlog=logger)
+        new_lexer = self.get_lexer()
         new_lexer.latest_newline = 0
         new_lexer.string_value = None
         new_lexer.input(string)
@@ -38,6 +44,29 @@ class JsonPathLexer:
         if new_lexer.string_value is not None:
             raise JsonPathLexerError('Unexpected EOF in string literal or identifier')
 
+    def get_lexer(self):
+        '''
+        Returns a PLY lexer ready for new input. The master regex built from
+        the `t_*` rules is compiled once per lexer class; each call only
+        clones the per-input state.
+        '''
+        if self.debug:
+            return ply.lex.lex(module=self, debug=self.debug, errorlog=logger)
+
+        cls = self.__class__
+        try:
+            master = _built_lexers[cls]
+        except KeyError:
+            with _built_lexers_lock:
+                if cls not in _built_lexers:
+                    _built_lexers[cls] = ply.lex.lex(module=self, errorlog=logger)
+                master = _built_lexers[cls]
+
+        new_lexer = master.clone()
+        # `clone` is a shallow copy, so the state stack must not be shared
+        new_lexer.lexstatestack = []
+        return new_lexer
+
     # ============== PLY Lexer specification ==================
     #
     # This probably should be private but:
@@ -60,35 +89,64 @@ class JsonPathLexer:
     t_DOUBLEDOT = r'\.\.'
     t_ignore = ' \t'
 
+    @ply.lex.TOKEN(r'[a-zA-Z_@][a-zA-Z0-9_@\-]*')
     def t_ID(self, t):
-        r'[a-zA-Z_@][a-zA-Z0-9_@\-]*'
         t.type = self.reserved_words.get(t.value, 'ID')
         return t
 
+    @ply.lex.TOKEN(r'-?\d+')
     def t_NUMBER(self, t):
-        r'-?\d+'
         t.value = int(t.value)
         return t
 
 
+    # Quoted strings and operators that are terminated on the same input
+    # are matched in one go; anything else falls through to the
+    # per-character states below, which report the errors. Their tokens
+    # are placed at the closing quote, as those of the states are.
+    @ply.lex.TOKEN(r"'[^'\\]*(?:\\.[^'\\]*)*'")
+    def t_quoted_singlequote(self, t):
+        t.lexpos = t.lexer.lexpos - 1
+        t.value = self.unescape(t.value[1:-1])
+        t.type = 'ID'
+        return t
+
+    @ply.lex.TOKEN(r'"[^"\\]*(?:\\.[^"\\]*)*"')
+    def t_quoted_doublequote(self, t):
+        t.lexpos = t.lexer.lexpos - 1
+        t.value = self.unescape(t.value[1:-1])
+        t.type = 'ID'
+        return t
+
+    @ply.lex.TOKEN(r'`[^`\\]*(?:\\.[^`\\]*)*`')
+    def t_quoted_backquote(self, t):
+        t.lexpos = t.lexer.lexpos - 1
+        t.value = self.unescape(t.value[1:-1])
+        t.type = 'NAMED_OPERATOR'
+        return t
+
+    @staticmethod
+    def unescape(value):
+        return ESCAPE.sub(r'\1', value) if '\\' in value else value
+
     # Single-quoted strings
     t_singlequote_ignore = ''
+    @ply.lex.TOKEN(r"'")
     def t_singlequote(self, t):
-        r"'"
         t.lexer.string_start = t.lexer.lexpos
         t.lexer.string_value = ''
         t.lexer.push_state('singlequote')
 
+    @ply.lex.TOKEN(r"[^'\\]+")
     def t_singlequote_content(self, t):
-        r"[^'\\]+"
         t.lexer.string_value += t.value
 
+    @ply.lex.TOKEN(r'\\.')
     def t_singlequote_escape(self, t):
-        r'\\.'
         t.lexer.string_value += t.value[1]
 
+    @ply.lex.TOKEN(r"'")
     def t_singlequote_end(self, t):
-        r"'"
         t.value = t.lexer.string_value
         t.type = 'ID'
         t.lexer.string_value = None
@@ -101,22 +159,22 @@ class JsonPathLexer:
 
     # Double-quoted strings
     t_doublequote_ignore = ''
+    @ply.lex.TOKEN(r'"')
     def t_doublequote(self, t):
-        r'"'
         t.lexer.string_start = t.lexer.lexpos
         t.lexer.string_value = ''
         t.lexer.push_state('doublequote')
 
+    @ply.lex.TOKEN(r'[^"\\]+')
     def t_doublequote_content(self, t):
-        r'[^"\\]+'
         t.lexer.string_value += t.value
 
+    @ply.lex.TOKEN(r'\\.')
     def t_doublequote_escape(self, t):
-        r'\\.'
         t.lexer.string_value += t.value[1]
 
+    @ply.lex.TOKEN(r'"')
     def t_doublequote_end(self, t):
-        r'"'
         t.value = t.lexer.string_value
         t.type = 'ID'
         t.lexer.string_value = None
@@ -129,22 +187,22 @@ class JsonPathLexer:
 
     # Back-quoted "magic" operators
     t_backquote_ignore = ''
+    @ply.lex.TOKEN(r'`')
     def t_backquote(self, t):
-        r'`'
         t.lexer.string_start = t.lexer.lexpos
         t.lexer.string_value = ''
         t.lexer.push_state('backquote')
 
+    @ply.lex.TOKEN(r'\\.')
     def t_backquote_escape(self, t):
-        r'\\.'
         t.lexer.string_value += t.value[1]
 
+    @ply.lex.TOKEN(r"[^`\\]+")
     def t_backquote_content(self, t):
-        r"[^`\\]+"
         t.lexer.string_value += t.value
 
+    @ply.lex.TOKEN(r'`')
     def t_backquote_end(self, t):
-        r'`'
         t.value = t.lexer.string_value
         t.type = 'NAMED_OPERATOR'
         t.lexer.string_value = None
@@ -156,8 +214,8 @@ class JsonPathLexer:
 
 
     # Counting lines, handling errors
+    @ply.lex.TOKEN(r'\n')
     def t_newline(self, t):
-        r'\n'
         t.lexer.lineno += 1
         t.lexer.latest_newline = t.lexpos
 
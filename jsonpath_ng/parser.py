@@ -1,18 +1,95 @@
 import logging
 import sys
 import os.path
+import threading
+from collections import namedtuple
 
-import ply.yacc
-
+from jsonpath_ng.cache import parse_cache
 from jsonpath_ng.exceptions import JsonPathParserError
-from jsonpath_ng.jsonpath import *
+from jsonpath_ng.interning import intern
+from jsonpath_ng.jsonpath import (
+    Child, Descendants, Fields, Index, Intersect, Parent, Root, Slice, This, Union, Where,
+)
 from jsonpath_ng.lexer import JsonPathLexer
 
 logger = logging.getLogger(__name__)
 
+# The parser used by `parse()` unless a backend is given explicitly: the
+# LALR parser built with PLY, or the hand-written recursive-descent parser.
+# PLY's grammar lives in docstrings, so `python -OO` requires the latter.
+BACKENDS = ('ply', 'descent')
+default_backend = 'descent' if sys.flags.optimize >= 2 else 'ply'
+
+# PLY parsers built by `JsonPathParser.get_parser`, keyed by (parser class, start symbol)
+_built_parsers = {}
+_built_parsers_lock = threading.Lock()
+
+
+def parse(string, backend=None):
+    return parse_cache.parse(parser_class(backend), string)
+
+
+# Result of `parse_many`: the compiled expressions and the exceptions raised
+# by the strings that failed to parse, both keyed by expression string
+ParseResults = namedtuple('ParseResults', ['expressions', 'errors'])
+
+
+def parse_many(strings, parser=None, workers=None, backend=None):
+    """
+    Compiles many expressions at once, e.g. a rule set loaded at startup.
+
+    Each distinct string is parsed once, by a single parser instance of class
+    `parser` (by default the one selected by `backend`). With `workers` > 1
+    the distinct strings are split among a pool of that many processes.
+    A string that fails to parse does not abort the batch: its exception is
+    reported in `errors` instead. The compiled expressions are interned, but
+    not added to the process-wide parse cache.
+    """
+    parser = parser or parser_class(backend)
+    unique = list(dict.fromkeys(strings))
+
+    if workers is not None and workers > 1 and len(unique) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        chunk_size = -(-len(unique) // (workers * 4))
+        chunks = [unique[i:i + chunk_size] for i in range(0, len(unique), chunk_size)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = [result
+                       for chunk_results in executor.map(_parse_chunk, [parser] * len(chunks), chunks)
+                       for result in chunk_results]
+    else:
+        results = _parse_chunk(parser, unique)
+
+    expressions = {}
+    errors = {}
+    for string, expression, error in results:
+        if error is None:
+            expressions[string] = intern(expression)
+        else:
+            errors[string] = error
+    return ParseResults(expressions, errors)
+
+
+def _parse_chunk(parser_class, strings):
+    parser = parser_class()
+    lexer = parser.lexer_class()
+    results = []
+    for string in strings:
+        try:
+            results.append((string, parser.parse(string, lexer), None))
+        except Exception as e:
+            results.append((string, None, e))
+    return results
+
 
-def parse(string):
-    return JsonPathParser().parse(string)
+def parser_class(backend=None):
+    backend = backend or default_backend
+    if backend == 'ply':
+        return JsonPathParser
+    elif backend == 'descent':
+        from jsonpath_ng.descent import JsonPathDescentParser
+        return JsonPathDescentParser
+    raise ValueError('Unknown parser backend %r, expected one of %s' % (backend, ', '.join(BACKENDS)))
 
 
 class JsonPathParser:
@@ -38,28 +115,63 @@ class JsonPathParser:
         return self.parse_token_stream(lexer.tokenize(string))
 
     def parse_token_stream(self, token_iterator, start_symbol='jsonpath'):
+        if self.debug:
+            # Debug builds log their grammar report, so never share them
+            new_parser = self.build_parser(start_symbol)
+        else:
+            new_parser = self.get_parser(start_symbol)
+
+        return new_parser.parse(lexer = IteratorToTokenStream(token_iterator))
 
-        # Since PLY has some crufty aspects and dumps files, we try to keep them local
-        # However, we need to derive the name of the output Python file :-/
-        output_directory = os.path.dirname(__file__)
+    def get_parser(self, start_symbol='jsonpath'):
+        """
+        Returns the PLY parser for this parser class, building the LALR
+        tables on first use only. The result is shared by every instance
+        of the class (subclasses get their own), which is safe because
+        `p_error` raises instead of relying on PLY's error recovery state.
+        """
+        key = (self.__class__, start_symbol)
         try:
-            module_name = os.path.splitext(os.path.split(__file__)[1])[0]
-        except:
-            module_name = __name__
+            return _built_parsers[key]
+        except KeyError:
+            pass
+
+        with _built_parsers_lock:
+            if key not in _built_parsers:
+                _built_parsers[key] = self.build_parser(start_symbol)
+            return _built_parsers[key]
+
+    def build_parser(self, start_symbol='jsonpath'):
+        """
+        Builds the PLY parser for this parser class.
+
+        The LALR tables are loaded from `<module>_<start_symbol>_parsetab.py`
+        next to the module defining the class. PLY checks them against the
+        signature of the grammar below and regenerates them when they are
+        missing or stale. The package ships the tables of its own grammars,
+        and only those are written back; tables of parser classes defined
+        elsewhere are rebuilt in memory.
+        """
+        # Imported here so that the recursive-descent backend never loads it
+        import ply.yacc
+
+        class_module = self.__class__.__module__
+        try:
+            output_directory = os.path.dirname(sys.modules[class_module].__file__)
+        except (KeyError, AttributeError):
+            output_directory = os.path.dirname(__file__)
 
+        module_name = class_module.rsplit('.', 1)[-1]
         parsing_table_module = '_'.join([module_name, start_symbol, 'parsetab'])
 
-        # And we regenerate the parse table every time;
-        # it doesn't actually take that long!
-        new_parser = ply.yacc.yacc(module=self,
-                                   debug=self.debug,
-                                   tabmodule = parsing_table_module,
-                                   outputdir = output_directory,
-                                   write_tables=0,
-                                   start = start_symbol,
-                                   errorlog = logger)
-
-        return new_parser.parse(lexer = IteratorToTokenStream(token_iterator))
+        return ply.yacc.yacc(module=self,
+                             debug=self.debug,
+                             tabmodule = parsing_table_module,
+                             outputdir = output_directory,
+                             write_tables=class_module.startswith('jsonpath_ng.'),
+                             debuglog = logger, # Never write parser.out into the package
+                             start = start_symbol,
+                             errorlog = logger)
 
     # ===================== PLY Parser specification =====================
 
@@ -0,0 +1,56 @@
+
+# parser_jsonpath_parsetab.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = "jsonpathleft,leftDOUBLEDOTleft.left|left&leftWHEREDOUBLEDOT ID NAMED_OPERATOR NUMBER WHEREjsonpath : jsonpath '.' jsonpath\n                    | jsonpath DOUBLEDOT jsonpath\n                    | jsonpath WHERE jsonpath\n                    | jsonpath '|' jsonpath\n                    | jsonpath '&' jsonpathjsonpath : fields_or_anyjsonpath : NAMED_OPERATORjsonpath : '$'jsonpath : '[' idx ']'jsonpath : '[' slice ']'jsonpath : '[' fields ']'jsonpath : jsonpath '[' fields ']'jsonpath : jsonpath '[' idx ']'jsonpath : jsonpath '[' slice ']'jsonpath : '(' jsonpath ')'fields_or_any : fields\n                         | '*'    fields : IDfields : fields ',' fieldsidx : NUMBERslice : '*'slice : maybe_int ':' maybe_int\n                 | maybe_int ':' maybe_int ':' maybe_int maybe_int : NUMBER\n                     | emptyempty :"
+    
+_lr_action_items = {'NAMED_OPERATOR':([0,7,10,11,12,13,14,],[3,3,3,3,3,3,3,]),'$':([0,7,10,11,12,13,14,],[4,4,4,4,4,4,4,]),'[':([0,1,2,3,4,6,7,8,9,10,11,12,13,14,24,25,26,27,28,29,33,34,35,37,38,39,40,41,],[5,15,-6,-7,-8,-16,5,-17,-18,5,5,5,5,5,15,-1,-2,-3,-4,-5,-9,-10,-11,-19,-15,-12,-13,-14,]),'(':([0,7,10,11,12,13,14,],[7,7,7,7,7,7,7,]),'*':([0,5,7,10,11,12,13,14,15,],[8,20,8,8,8,8,8,8,20,]),'ID':([0,5,7,10,11,12,13,14,15,23,],[9,9,9,9,9,9,9,9,9,9,]),'$end':([1,2,3,4,6,8,9,25,26,27,28,29,33,34,35,37,38,39,40,41,],[0,-6,-7,-8,-16,-17,-18,-1,-2,-3,-4,-5,-9,-10,-11,-19,-15,-12,-13,-14,]),'.':([1,2,3,4,6,8,9,24,25,26,27,28,29,33,34,35,37,38,39,40,41,],[10,-6,-7,-8,-16,-17,-18,10,-1,10,-3,-4,-5,-9,-10,-11,-19,-15,-12,-13,-14,]),'DOUBLEDOT':([1,2,3,4,6,8,9,24,25,26,27,28,29,33,34,35,37,38,39,40,41,],[11,-6,-7,-8,-16,-17,-18,11,-1,-2,-3,-4,-5,-9,-10,-11,-19,-15,-12,-13,-14,]),'WHERE':([1,2,3,4,6,8,9,24,25,26,27,28,29,33,34,35,37,38,39,40,41,],[12,-6,-7,-8,-16,-17,-18,12,12,12,-3,12,12,-9,-10,-11,-19,-15,-12,-13,-14,]),'|':([1,2,3,4,6,8,9,24,25,26,27,28,29,33,34,35,37,38,39,40,41,],[13,-6,-7,-8,-16,-17,-18,13,13,13,-3,-4,-5,-9,-10,-11,-19,-15,-12,-13,-14,]),'&':([1,2,3,4,6,8,9,24,25,26,27,28,29,33,34,35,37,38,39,40,41,],[14,-6,-7,-8,-16,-17,-18,14,14,14,-3,14,-5,-9,-10,-11,-19,-15,-12,-13,-14,]),')':([2,3,4,6,8,9,24,25,26,27,28,29,33,34,35,37,38,39,40,41,],[-6,-7,-8,-16,-17,-18,38,-1,-2,-3,-4,-5,-9,-10,-11,-19,-15,-12,-13,-14,]),'NUMBER':([5,15,36,44,],[19,19,43,43,]),':':([5,15,19,21,22,36,42,43,],[-26,-26,-24,36,-25,-26,44,-24,]),',':([6,9,18,30,37,],[23,-18,23,23,-19,]),']':([9,16,17,18,19,20,22,30,31,32,36,37,42,43,44,45,],[-18,33,34,35,-20,-21,-25,39,40,41,-26,-19,-22,-24,-26,-23,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'jsonpath':([0,7,10,11,12,13,14,],[1,24,25,26,27,28,29,]),'fields_or_any':([0,7,10,11,12,13,14,],[2,2,2,2,2,2,2,]),'fields':([0,5,7,10,11,12,13,14,15,23,],[6,18,6,6,6,6,6,6,30,37,]),'idx':([5,15,],[16,31,]),'slice':([5,15,],[17,32,]),'maybe_int':([5,15,36,44,],[21,21,42,45,]),'empty':([5,15,36,44,],[22,22,22,22,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> jsonpath","S'",1,None,None,None),
+  ('jsonpath -> jsonpath . jsonpath','jsonpath',3,'p_jsonpath_binop','parser.py',194),
+  ('jsonpath -> jsonpath DOUBLEDOT jsonpath','jsonpath',3,'p_jsonpath_binop','parser.py',195),
+  ('jsonpath -> jsonpath WHERE jsonpath','jsonpath',3,'p_jsonpath_binop','parser.py',196),
+  ('jsonpath -> jsonpath | jsonpath','jsonpath',3,'p_jsonpath_binop','parser.py',197),
+  ('jsonpath -> jsonpath & jsonpath','jsonpath',3,'p_jsonpath_binop','parser.py',198),
+  ('jsonpath -> fields_or_any','jsonpath',1,'p_jsonpath_fields','parser.py',213),
+  ('jsonpath -> NAMED_OPERATOR','jsonpath',1,'p_jsonpath_named_operator','parser.py',217),
+  ('jsonpath -> $','jsonpath',1,'p_jsonpath_root','parser.py',227),
+  ('jsonpath -> [ idx ]','jsonpath',3,'p_jsonpath_idx','parser.py',231),
+  ('jsonpath -> [ slice ]','jsonpath',3,'p_jsonpath_slice','parser.py',235),
+  ('jsonpath -> [ fields ]','jsonpath',3,'p_jsonpath_fieldbrackets','parser.py',239),
+  ('jsonpath -> jsonpath [ fields ]','jsonpath',4,'p_jsonpath_child_fieldbrackets','parser.py',243),
+  ('jsonpath -> jsonpath [ idx ]','jsonpath',4,'p_jsonpath_child_idxbrackets','parser.py',247),
+  ('jsonpath -> jsonpath [ slice ]','jsonpath',4,'p_jsonpath_child_slicebrackets','parser.py',251),
+  ('jsonpath -> ( jsonpath )','jsonpath',3,'p_jsonpath_parens','parser.py',255),
+  ('fields_or_any -> fields','fields_or_any',1,'p_fields_or_any','parser.py',260),
+  ('fields_or_any -> *','fields_or_any',1,'p_fields_or_any','parser.py',261),
+  ('fields -> ID','fields',1,'p_fields_id','parser.py',268),
+  ('fields -> fields , fields','fields',3,'p_fields_comma','parser.py',272),
+  ('idx -> NUMBER','idx',1,'p_idx','parser.py',276),
+  ('slice -> *','slice',1,'p_slice_any','parser.py',280),
+  ('slice -> maybe_int : maybe_int','slice',3,'p_slice','parser.py',284),
+  ('slice -> maybe_int : maybe_int : maybe_int','slice',5,'p_slice','parser.py',285),
+  ('maybe_int -> NUMBER','maybe_int',1,'p_maybe_int','parser.py',289),
+  ('maybe_int -> empty','maybe_int',1,'p_maybe_int','parser.py',290),
+  ('empty -> <empty>','empty',0,'p_empty','parser.py',294),
+]
@@ -0,0 +1,154 @@
+"""
+Evaluation of many expressions against the same data at once.
+
+Each expression is a chain of steps, `a.b[*]..c` being `a`, then `b`, then
+`[*]`, then `..c`, and the expressions of a `QuerySet` are merged into a
+trie of those steps, so that a prefix common to several expressions (such
+as `$.order.items[*]`) is evaluated once for all of them. The descendants
+searched by the `..` steps that follow the same prefix are walked once as
+well.
+"""
+from jsonpath_ng.interning import InternTable
+from jsonpath_ng.jsonpath import (
+    JSONPath, DatumInContext, AutoIdForDatum, IndexedDatum, This, Child, Where, Descendants,
+    _child_data, _descendant_test, _walk, _walk_hits,
+)
+
+
+class QuerySet:
+    """
+    A set of expressions evaluated together: `find(data)` returns the
+    matches of each expression, in the order of `expressions`, as
+    `[expression.find(data) for expression in expressions]` would, with
+    each step shared by several expressions evaluated once.
+
+        rules = QuerySet([parse('$.order.items[*].sku'), parse('$.order.items[*].price')])
+        skus, prices = rules.find_values(order)
+    """
+
+    __slots__ = ('expressions', '_trie')
+
+    def __init__(self, expressions):
+        self.expressions = tuple(expressions)
+        # Steps are told apart by their interned node, which compares
+        # literals by type as well as value
+        table = InternTable()
+        self._trie = _Trie()
+        for number, expression in enumerate(self.expressions):
+            if not isinstance(expression, JSONPath):
+                raise TypeError('QuerySet takes JSONPath expressions, not %r' % (expression,))
+            trie = self._trie
+            for node, child in _steps(expression, False):
+                trie = trie.add(table.intern(node), child)
+            trie.ends.append(number)
+
+    def __len__(self):
+        return len(self.expressions)
+
+    def __repr__(self):
+        return '%s(%r)' % (self.__class__.__name__, list(self.expressions))
+
+    def find(self, data):
+        """The list of the matches of each expression"""
+        results = [None] * len(self.expressions)
+        stack = [(self._trie, [DatumInContext.wrap(data)])]
+        while stack:
+            trie, matches = stack.pop()
+            for number in trie.ends:
+                results[number] = list(matches)
+
+            descendants = []
+            for node, child, subtrie in trie.steps.values():
+                if type(node) is Descendants and type(node.left) is This and not child:
+                    descendants.append((node.right, subtrie))
+                    continue
+                if child:
+                    # `Child` does not descend into auto ids
+                    step_matches = [match for datum in matches if not isinstance(datum, AutoIdForDatum)
+                                    for match in node.iter_find(datum)]
+                else:
+                    step_matches = [match for datum in matches for match in node.iter_find(datum)]
+                stack.append((subtrie, step_matches))
+
+            if descendants:
+                stack.extend(_find_descendants(descendants, matches))
+        return results
+
+    def find_values(self, data):
+        """The list of the values of the matches of each expression"""
+        return [[match.value for match in matches] for matches in self.find(data)]
+
+
+class _Trie:
+    """
+    A node of the trie of steps of a `QuerySet`: the expressions ending
+    here, by number, and the following steps, as (node, child, trie)
+    triples keyed by the identity of their interned node and `child`.
+    """
+
+    __slots__ = ('ends', 'steps')
+
+    def __init__(self):
+        self.ends = []
+        self.steps = {}
+
+    def add(self, node, child):
+        key = (id(node), child)
+        step = self.steps.get(key)
+        if step is None:
+            step = self.steps[key] = (node, child, _Trie())
+        return step[2]
+
+
+def _steps(node, child):
+    """
+    The steps of `node` as (node, child) pairs, where `child` tells that the
+    step is the right side of a `Child`. `l.r`, `l..r` and `l where r` apply
+    `r`, `..r` and `where r` to each match of `l` in turn, so they are the
+    steps of `l` followed by those.
+    """
+    if type(node) is Child:
+        right = _steps(node.right, True)
+        right[0] = (right[0][0], True)
+        return _steps(node.left, child) + right
+    elif type(node) is Descendants:
+        return _steps(node.left, child) + [(Descendants(This(), node.right), False)]
+    elif type(node) is Where:
+        return _steps(node.left, child) + [(Where(This(), node.right), False)]
+    return [(node, child)]
+
+
+def _find_descendants(descendants, matches):
+    """
+    Evaluates several `..right` steps following the same step, as pairs of
+    `right` and the trie after the step, on `matches`, walking the
+    descendants of each match once for all the steps. Returns the tries
+    with the matches of their step.
+    """
+    tests = [_descendant_test(right) for right, _ in descendants]
+    results = [[] for _ in descendants]
+    steps = list(zip(descendants, tests, results))
+
+    def any_test(value):
+        for test in tests:
+            if test(value):
+                return True
+        return False
+
+    def walk(datum):
+        if None in tests:
+            return _walk(datum, _child_data)
+        return _walk_hits(datum, any_test)
+
+    for datum in matches:
+        if isinstance(datum, IndexedDatum):
+            # Indexes look descendants up rather than walk them
+            for (right, _), _, step_matches in steps:
+                step_matches.extend(Descendants(This(), right).iter_find(datum))
+            continue
+        for descendant in walk(datum):
+            for (right, _), test, step_matches in steps:
+                if test is None or test(descendant.value):
+                    step_matches.extend(right.iter_find(descendant))
+
+    return [(subtrie, step_matches) for (_, subtrie), step_matches in zip(descendants, results)]
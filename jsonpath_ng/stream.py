@@ -0,0 +1,416 @@
+"""
+Evaluation of expressions over a JSON document as it is read, without
+loading it whole.
+
+`iter_events(fp)` is an incremental JSON parser: it reads a file-like
+object chunk by chunk and produces the events of the document (the start
+and end of each object and array, the keys of objects and the scalar
+values) as `(event, value)` pairs.
+
+`iter_stream(expression, fp)` runs an expression over those events. The
+expression is broken into its steps (see `jsonpath_ng.queryset`), and the
+fields, indices, slices and descendants it goes through are followed event
+by event: the values they do not lead to are skipped without being built,
+and a match is built as it is read and produced as soon as it ends. Filters
+are evaluated on each element of the array they filter once the element
+is complete. Any other step is evaluated by the interpreter on the value
+it applies to, once that value is complete, so every expression can be
+streamed, but only the steps above keep the memory bounded by the largest
+value matched (or filtered).
+"""
+import codecs
+import re
+from json.decoder import scanstring
+
+from jsonpath_ng.exceptions import JSONPathError
+from jsonpath_ng.jsonpath import (
+    DatumInContext, Root, This, Child, Descendants, Fields, Index, Slice, _needs_context,
+)
+
+__all__ = ['iter_events', 'iter_stream']
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_STRING = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+_NUMBER = re.compile(r'-?(?:0|[1-9][0-9]*)(\.[0-9]+)?([eE][-+]?[0-9]+)?')
+_WORD = re.compile(r'[-+.0-9a-zA-Z]*')
+_LITERALS = {'true': True, 'false': False, 'null': None,
+             'NaN': float('nan'), 'Infinity': float('inf'), '-Infinity': float('-inf')}
+
+# What the parser expects next
+_VALUE, _VALUE_OR_CLOSE, _KEY, _KEY_OR_CLOSE, _COLON, _COMMA_OR_CLOSE, _END = range(7)
+
+
+def _chunks(fp, chunk_size):
+    """The text read from `fp`, decoding bytes as UTF-8"""
+    decoder = codecs.getincrementaldecoder('utf-8-sig')()
+    while True:
+        chunk = fp.read(chunk_size)
+        if not chunk:
+            if isinstance(chunk, bytes):
+                yield decoder.decode(chunk, final=True)
+            return
+        # A chunk may end within a character, which the decoder keeps
+        yield decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+
+
+def iter_events(fp, chunk_size=65536):
+    """
+    Parses the JSON document read from `fp` (in text or binary mode),
+    yielding `(event, value)` pairs: `('start_map', None)`,
+    `('map_key', key)`, `('end_map', None)`, `('start_array', None)`,
+    `('end_array', None)` and `('value', value)` for scalars, which are
+    decoded as `json.load` would. Raises `ValueError` on malformed JSON.
+    """
+    chunks = _chunks(fp, chunk_size)
+    buffer, pos, eof = '', 0, False
+    expect = _VALUE
+    stack = []
+
+    while True:
+        pos = _WHITESPACE.match(buffer, pos).end()
+        if pos == len(buffer):
+            if eof:
+                break
+            buffer, pos, eof = _refill(buffer, pos, chunks)
+            continue
+
+        char = buffer[pos]
+        if char in '{[':
+            if expect != _VALUE and expect != _VALUE_OR_CLOSE:
+                _fail(buffer, pos)
+            pos += 1
+            if char == '{':
+                stack.append(True)
+                expect = _KEY_OR_CLOSE
+                yield 'start_map', None
+            else:
+                stack.append(False)
+                expect = _VALUE_OR_CLOSE
+                yield 'start_array', None
+        elif char in '}]':
+            in_map = char == '}'
+            if (not stack or stack[-1] is not in_map
+                    or expect != _COMMA_OR_CLOSE and expect != (_KEY_OR_CLOSE if in_map else _VALUE_OR_CLOSE)):
+                _fail(buffer, pos)
+            pos += 1
+            stack.pop()
+            expect = _COMMA_OR_CLOSE if stack else _END
+            yield ('end_map' if in_map else 'end_array'), None
+        elif char == ',':
+            if expect != _COMMA_OR_CLOSE:
+                _fail(buffer, pos)
+            pos += 1
+            expect = _KEY if stack[-1] else _VALUE
+        elif char == ':':
+            if expect != _COLON:
+                _fail(buffer, pos)
+            pos += 1
+            expect = _VALUE
+        elif char == '"':
+            match = _STRING.match(buffer, pos)
+            if match is None:
+                if eof:
+                    _fail(buffer, pos)
+                buffer, pos, eof = _refill(buffer, pos, chunks)
+                continue
+            token = match.group()
+            string = token[1:-1] if '\\' not in token else _decode_string(buffer, pos)
+            pos = match.end()
+            if expect == _KEY or expect == _KEY_OR_CLOSE:
+                expect = _COLON
+                yield 'map_key', string
+            elif expect == _VALUE or expect == _VALUE_OR_CLOSE:
+                expect = _COMMA_OR_CLOSE if stack else _END
+                yield 'value', string
+            else:
+                _fail(buffer, match.start())
+        else:
+            if expect != _VALUE and expect != _VALUE_OR_CLOSE:
+                _fail(buffer, pos)
+            # Numbers and literals end at the first character that is not
+            # theirs, which may be in the next chunk
+            end = _WORD.match(buffer, pos).end()
+            if end == len(buffer) and not eof:
+                buffer, pos, eof = _refill(buffer, pos, chunks)
+                continue
+            word = buffer[pos:end]
+            if word in _LITERALS:
+                value = _LITERALS[word]
+            else:
+                match = _NUMBER.fullmatch(word)
+                if match is None:
+                    _fail(buffer, pos)
+                value = float(word) if match.group(1) or match.group(2) else int(word)
+            pos = end
+            expect = _COMMA_OR_CLOSE if stack else _END
+            yield 'value', value
+
+    if expect != _END:
+        raise ValueError('Invalid JSON: unexpected end of document')
+
+
+def _refill(buffer, pos, chunks):
+    """Appends the next chunk to what is left of `buffer` from `pos`"""
+    chunk = next(chunks, None)
+    return buffer[pos:] + (chunk or ''), 0, chunk is None
+
+
+def _decode_string(buffer, pos):
+    try:
+        return scanstring(buffer, pos + 1)[0]
+    except ValueError:
+        _fail(buffer, pos)
+
+
+def _fail(buffer, pos):
+    raise ValueError('Invalid JSON: unexpected %r' % buffer[pos:pos + 20])
+
+
+# The kinds of steps
+_DESCENDANTS, _FIELDS, _INDEX, _SLICE, _FILTER, _OTHER = range(6)
+
+
+def _steps(node):
+    """
+    The steps of `node`, as (kind, node) pairs: a `Descendants` node is its
+    left side, a `_DESCENDANTS` step and the steps of its right side.
+    """
+    if type(node) is Child:
+        return _steps(node.left) + _steps(node.right)
+    elif type(node) is Descendants:
+        return _steps(node.left) + [(_DESCENDANTS, node)] + _steps(node.right)
+
+    from jsonpath_ng.ext.filter import Filter
+    if type(node) is Fields:
+        return [(_FIELDS, node)]
+    elif type(node) is Index and node.index >= 0:
+        return [(_INDEX, node)]
+    elif (type(node) is Slice and all(bound is None or bound >= 0 for bound in (node.start, node.end))
+          and (node.step is None or node.step > 0)):
+        return [(_SLICE, node)]
+    elif type(node) is Filter and node.expressions:
+        return [(_FILTER, node)]
+    return [(_OTHER, node)]
+
+
+def _suffix(steps, i):
+    """The expression made of `steps[i:]`, or None if there are none"""
+    if i == len(steps):
+        return None
+    kind, node = steps[i]
+    rest = _suffix(steps, i + 1)
+    if kind == _DESCENDANTS:
+        return Descendants(This(), rest)
+    return node if rest is None else Child(node, rest)
+
+
+def _selects(node, index):
+    """Whether the `Slice` `node` selects `index` of a long enough list"""
+    start = node.start or 0
+    return index >= start and (node.end is None or index < node.end) and (index - start) % (node.step or 1) == 0
+
+
+class _Node:
+    """
+    A value being read: its key in its parent, whether that parent is a
+    dict (None at the top), whether the value is a dict, the value itself
+    if it is built, what to do at its end (`actions`: `_YIELD` or a
+    (`_SUFFIX` or `_TEST`, step) pair) and the states its items start in.
+    """
+
+    __slots__ = ('key', 'in_map', 'is_map', 'value', 'actions',
+                 'fields', 'any_field', 'indices', 'descendants', 'filters', 'count')
+
+    def __init__(self, key, in_map, is_map):
+        self.key = key
+        self.in_map = in_map
+        self.is_map = is_map
+        self.value = None
+        self.actions = []
+        # The states of the items of a dict: by field, and for any field
+        self.fields = {}
+        self.any_field = []
+        # The `Index` and `Slice` steps on the items of a list
+        self.indices = []
+        # The `..` states, which go on in every item
+        self.descendants = []
+        # The `Filter` steps on the items of a list
+        self.filters = []
+        self.count = 0
+
+    def follows(self):
+        """Whether any item of the value may lead to a match"""
+        return bool(self.fields or self.any_field or self.indices or self.descendants or self.filters)
+
+
+_YIELD, _SUFFIX, _TEST = range(3)
+
+
+def iter_stream(expression, fp, chunk_size=65536):
+    """
+    Yields the matches of `expression` in the JSON document read from `fp`,
+    as `DatumInContext`s whose path is their full path (they have no
+    context), each as soon as the end of its value is read. The matches
+    are those of `expression.find(json.load(fp))`, but in the order their
+    values end, so that a match inside another comes first.
+
+    Expressions looking at the context of their matches (`parent`, or `$`
+    past their start) and auto ids cannot be streamed.
+    """
+    from jsonpath_ng import jsonpath
+    if jsonpath.auto_id_field is not None or _needs_context(expression):
+        raise JSONPathError('%s cannot be evaluated on a stream' % expression)
+
+    steps = _steps(expression)
+    root_path = This()
+    if type(steps[0][1]) in (Root, This):
+        root_path = steps.pop(0)[1]
+    return _iter_stream(steps, root_path, iter_events(fp, chunk_size))
+
+
+def _iter_stream(steps, root_path, events):
+    suffixes = {}
+
+    def act(node, value, stack):
+        """The matches at the end of `node`, whose value is `value`"""
+        datum = _datum(root_path, stack, node, value)
+        for action in node.actions:
+            if action is _YIELD:
+                yield DatumInContext(value, path=datum.full_path)
+                continue
+
+            kind, i = action
+            if kind == _TEST:
+                if not steps[i][1]._matches(value):
+                    continue
+                i += 1
+                if i == len(steps):
+                    yield DatumInContext(value, path=datum.full_path)
+                    continue
+            if i not in suffixes:
+                suffixes[i] = _suffix(steps, i)
+            for match in suffixes[i].iter_find(datum):
+                yield DatumInContext(match.value, path=match.full_path)
+
+    stack = []
+    key = None
+    skipped = 0
+    for event, value in events:
+        if skipped:
+            if event == 'start_map' or event == 'start_array':
+                skipped += 1
+            elif event == 'end_map' or event == 'end_array':
+                skipped -= 1
+            continue
+
+        if event == 'map_key':
+            key = value
+            continue
+        elif event == 'end_map' or event == 'end_array':
+            node = stack.pop()
+            if node.actions:
+                yield from act(node, node.value, stack)
+            continue
+
+        # A value starts
+        if stack:
+            parent = stack[-1]
+            if not parent.is_map:
+                key = parent.count
+                parent.count += 1
+            node = _Node(key, parent.is_map, event == 'start_map')
+            states, filters = _item_states(parent, key, steps)
+            building = parent.value is not None
+        else:
+            node = _Node(None, None, event == 'start_map')
+            states, filters = [0], ()
+            building = False
+        _enter(node, steps, states, filters, event == 'start_array')
+
+        if event == 'value':
+            if building:
+                _add(parent, key, value)
+            if node.actions:
+                yield from act(node, value, stack)
+            continue
+
+        if not (building or node.actions or node.follows()):
+            skipped = 1
+            continue
+        if building or node.actions:
+            node.value = {} if node.is_map else []
+            if building:
+                _add(parent, key, node.value)
+        stack.append(node)
+
+
+def _item_states(parent, key, steps):
+    """The states an item of `parent` at `key` starts in, and its filters"""
+    if parent.is_map:
+        states = parent.any_field + parent.fields.get(key, [])
+        return states + parent.descendants, ()
+
+    states = []
+    for i in parent.indices:
+        kind, node = steps[i]
+        if node.index == key if kind == _INDEX else _selects(node, key):
+            states.append(i + 1)
+    return states + parent.descendants, parent.filters
+
+
+def _enter(node, steps, states, filters, is_list):
+    """Sets what `node` does with its items and at its end"""
+    end = len(steps)
+    for i in states:
+        while i < end and steps[i][0] == _DESCENDANTS:
+            # `..` applies the next step here, and goes on in the items
+            node.descendants.append(i)
+            i += 1
+        if i == end:
+            node.actions.append(_YIELD)
+            continue
+
+        kind, step = steps[i]
+        if kind == _FIELDS:
+            # Only dicts have fields
+            if node.is_map:
+                if '*' in step.fields:
+                    node.any_field.append(i + 1)
+                else:
+                    for field in step.fields:
+                        node.fields.setdefault(field, []).append(i + 1)
+        elif kind in (_INDEX, _SLICE) and is_list:
+            node.indices.append(i)
+        elif kind == _FILTER and is_list:
+            node.filters.append(i)
+        else:
+            # Including indices, slices and filters on other values, which
+            # they coerce in their own ways
+            node.actions.append((_SUFFIX, i))
+    for i in filters:
+        node.actions.append((_TEST, i))
+
+
+def _add(parent, key, value):
+    if parent.is_map:
+        parent.value[key] = value
+    else:
+        parent.value.append(value)
+
+
+def _datum(root_path, stack, node, value):
+    """
+    A datum of `value`, the value of `node`, whose ancestors are `stack`.
+    Evaluating the rest of an expression on it gives the matches their
+    full paths: its context has those of the ancestors, though not their
+    values, which the rest of a streamed expression does not look at.
+    """
+    datum = None
+    for ancestor in stack + [node]:
+        if ancestor.in_map is None:
+            path = root_path
+        else:
+            path = Fields(ancestor.key) if ancestor.in_map else Index(ancestor.key)
+        datum = DatumInContext(None, path=path, context=datum)
+    datum.value = value
+    return datum
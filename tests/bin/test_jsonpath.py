@@ -35,3 +35,13 @@ def test_filename_mode(capsys):
 
     stdout, _ = capsys.readouterr()
     assert stdout == "1\n2\n3\n4\n"
+
+
+def test_stream_mode(capsys):
+    test1 = os.path.join(os.path.dirname(__file__), "test1.json")
+    test2 = os.path.join(os.path.dirname(__file__), "test2.json")
+
+    main("jsonpath.py", "--stream", "foo..baz", test1, test2)
+
+    stdout, _ = capsys.readouterr()
+    assert stdout == "1\n2\n3\n4\n"
@@ -0,0 +1,176 @@
+import os
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from jsonpath_ng import cache as cache_module
+from jsonpath_ng.cache import ExpressionStore, ParseCache, parse_cache
+from jsonpath_ng.exceptions import JsonPathParserError
+from jsonpath_ng.ext.parser import ExtentedJsonPathParser
+from jsonpath_ng.ext.parser import parse as ext_parse
+from jsonpath_ng.jsonpath import Child, Fields
+from jsonpath_ng.parser import JsonPathParser
+from jsonpath_ng.parser import parse as base_parse
+
+
+def test_hit_returns_same_object():
+    cache = ParseCache(maxsize=4)
+    first = cache.parse(JsonPathParser, "foo.bar")
+    second = cache.parse(JsonPathParser, "foo.bar")
+    assert first is second
+    assert first == Child(Fields("foo"), Fields("bar"))
+    info = cache.cache_info()
+    assert (info.hits, info.misses, info.evictions, info.currsize) == (1, 1, 0, 1)
+
+
+def test_keyed_by_parser_class():
+    cache = ParseCache(maxsize=4)
+    cache.parse(JsonPathParser, "foo")
+    cache.parse(ExtentedJsonPathParser, "foo")
+    assert (JsonPathParser, "foo") in cache
+    assert (ExtentedJsonPathParser, "foo") in cache
+    assert cache.cache_info().misses == 2
+
+
+def test_lru_eviction():
+    cache = ParseCache(maxsize=2)
+    cache.parse(JsonPathParser, "a")
+    cache.parse(JsonPathParser, "b")
+    cache.parse(JsonPathParser, "a")
+    cache.parse(JsonPathParser, "c")
+    assert (JsonPathParser, "a") in cache
+    assert (JsonPathParser, "b") not in cache
+    assert cache.cache_info().evictions == 1
+
+
+def test_resize_and_clear():
+    cache = ParseCache(maxsize=8)
+    for string in ("a", "b", "c", "d"):
+        cache.parse(JsonPathParser, string)
+    cache.resize(1)
+    assert len(cache) == 1
+    assert (JsonPathParser, "d") in cache
+    assert cache.cache_info().evictions == 3
+
+    cache.clear()
+    assert cache.cache_info() == (0, 0, 0, 1, 0)
+
+
+def test_disabled_cache():
+    cache = ParseCache(maxsize=0)
+    cache.parse(JsonPathParser, "a")
+    cache.parse(JsonPathParser, "a")
+    assert cache.cache_info().misses == 2
+    assert len(cache) == 0
+
+
+def test_invalid_size():
+    with pytest.raises(ValueError):
+        ParseCache(maxsize=-1)
+    with pytest.raises(ValueError):
+        ParseCache().resize(-1)
+
+
+def test_errors_are_not_cached():
+    cache = ParseCache(maxsize=4)
+    for _ in range(2):
+        with pytest.raises(JsonPathParserError):
+            cache.parse(JsonPathParser, "foo[*")
+    assert cache.cache_info().misses == 2
+    assert len(cache) == 0
+
+
+@pytest.mark.parametrize("parse", (base_parse, ext_parse))
+def test_parse_uses_process_cache(parse):
+    parse_cache.clear()
+    assert parse("$.cached.expression") is parse("$.cached.expression")
+    assert parse_cache.cache_info().hits == 1
+
+
+def test_thread_safety():
+    cache = ParseCache(maxsize=16)
+    strings = ["field%d" % i for i in range(32)]
+    errors = []
+
+    def worker():
+        try:
+            for string in strings * 4:
+                assert cache.parse(JsonPathParser, string) == Fields(string)
+        except Exception as e:  # pragma: no cover
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    info = cache.cache_info()
+    assert info.currsize <= 16
+    assert info.hits + info.misses == 4 * 4 * 32
+
+
+def test_persistent_cache(tmp_path, monkeypatch):
+    first = ParseCache(directory=str(tmp_path))
+    expression = first.parse(ExtentedJsonPathParser, "a[?b > 1].c")
+
+    # A new process starts with an empty in-memory cache, and loads the
+    # expression from disk instead of parsing it
+    def fail(self, string, lexer=None):
+        raise AssertionError("parsed %r" % string)
+
+    monkeypatch.setattr(ExtentedJsonPathParser, "parse", fail)
+    # Nor does it intern it, which would take most of the time of a restart
+    monkeypatch.setattr(cache_module, "intern", lambda node: fail(None, "interned"))
+    second = ParseCache(directory=str(tmp_path))
+    loaded = second.parse(ExtentedJsonPathParser, "a[?b > 1].c")
+    assert loaded == expression
+    assert loaded.find({"a": [{"b": 2, "c": 3}]})[0].value == 3
+    assert second.cache_info().misses == 1
+
+
+def test_persistent_cache_keys(tmp_path, monkeypatch):
+    store = ExpressionStore(str(tmp_path))
+    store.add(JsonPathParser, "a", Fields("a"))
+    assert ExpressionStore(str(tmp_path)).get(JsonPathParser, "a") == Fields("a")
+    assert ExpressionStore(str(tmp_path)).get(ExtentedJsonPathParser, "a") is None
+
+    monkeypatch.setattr(cache_module, "__version__", "0.0.0")
+    assert ExpressionStore(str(tmp_path)).get(JsonPathParser, "a") is None
+
+
+def test_persistent_cache_skips_errors(tmp_path):
+    cache = ParseCache(directory=str(tmp_path))
+    with pytest.raises(JsonPathParserError):
+        cache.parse(JsonPathParser, "foo[*")
+    assert ExpressionStore(str(tmp_path)).get(JsonPathParser, "foo[*") is None
+
+
+def test_persistent_cache_truncated_file(tmp_path):
+    store = ExpressionStore(str(tmp_path))
+    for string in ("a", "b"):
+        store.add(JsonPathParser, string, Fields(string))
+    path = store.path(JsonPathParser)
+    with open(path, "rb+") as f:
+        f.truncate(os.path.getsize(path) - 3)
+
+    loaded = ExpressionStore(str(tmp_path))
+    assert loaded.get(JsonPathParser, "a") == Fields("a")
+    assert loaded.get(JsonPathParser, "b") is None
+
+
+def test_persistent_cache_unwritable_directory(tmp_path):
+    not_a_directory = tmp_path / "file"
+    not_a_directory.write_text("")
+    cache = ParseCache(directory=str(not_a_directory))
+    assert cache.parse(JsonPathParser, "a") == Fields("a")
+
+
+def test_persistent_cache_from_environment(tmp_path):
+    code = "from jsonpath_ng.cache import parse_cache; print(parse_cache.store.directory)"
+    env = dict(os.environ, JSONPATH_NG_CACHE_DIR=str(tmp_path))
+    output = subprocess.check_output([sys.executable, "-c", code], env=env, universal_newlines=True)
+    assert output.strip() == str(tmp_path)
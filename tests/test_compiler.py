@@ -0,0 +1,177 @@
+"""
+Differential tests of compiled expressions against the interpreter.
+"""
+
+import copy
+import pickle
+import random
+
+import pytest
+
+from jsonpath_ng.compiler import CompiledJSONPath
+from jsonpath_ng.exceptions import JSONPathError
+from jsonpath_ng.ext import parse
+from jsonpath_ng.ext.prepared import Prepared
+from jsonpath_ng.ext.string import DefintionInvalid
+from jsonpath_ng.jsonpath import Child, DatumInContext, Fields, JSONPath, Where
+
+from .test_descent import corpus, generated_cases
+from .test_jsonpath import find_test_cases, find_test_cases_with_auto_id, update_test_cases
+from .test_jsonpath_rw_ext import test_cases as ext_test_cases
+
+documents = (
+    {"a": 1, "b": {"c": [1, 2, {"a": "x"}]}, "c": [{"a": 2, "b": 3}, {"a": "2"}, None]},
+    {"a": [{"b": 1, "c": 2.5}, {"b": 2}, {"b": "q r"}], "q r": {"a": True}},
+    [{"a": {"b": {"a": 1}}}, [1, [2, 3]], "a", 0],
+    {"a": {"a": {"a": {"b": [0, 1, 2, 3]}}}, "$": 1, "@": 2},
+    "text",
+    12,
+    None,
+)
+
+
+def random_document(generator, depth=0):
+    roll = generator.random() if depth < 4 else 1
+    if roll < 0.3:
+        return {generator.choice("abc"): random_document(generator, depth + 1) for _ in range(generator.randint(0, 3))}
+    if roll < 0.5:
+        return [random_document(generator, depth + 1) for _ in range(generator.randint(0, 3))]
+    return generator.choice([0, 1, 2, 2.5, "a", "1", "q r", True, None])
+
+
+def outcome(function, *args):
+    try:
+        return function(*args)
+    except Exception as e:
+        return type(e)
+
+
+def parsed(string):
+    try:
+        return parse(string)
+    except (JSONPathError, DefintionInvalid):
+        return None
+
+
+def check(expression, data):
+    """Compare the compiled `expression` with the interpreter on `data`."""
+    compiled = expression.compile()
+
+    expected = outcome(expression.find, copy.deepcopy(data))
+    assert outcome(compiled.find, copy.deepcopy(data)) == expected
+
+    expected = outcome(lambda data: [match.value for match in expression.find(data)], copy.deepcopy(data))
+    assert outcome(compiled.find_values, copy.deepcopy(data)) == expected
+
+    for value in (0, lambda value, data, field: [value]):
+        interpreted = copy.deepcopy(data)
+        expected = outcome(expression.update, interpreted, value)
+        updated = copy.deepcopy(data)
+        assert outcome(compiled.update, updated, value) == expected
+        assert updated == interpreted
+
+
+@pytest.mark.parametrize("path, data, expected_values, expected_full_paths", find_test_cases)
+def test_find_test_cases(path, data, expected_values, expected_full_paths):
+    check(parse(path), data)
+
+
+@pytest.mark.parametrize("path, data, expected_values", find_test_cases_with_auto_id)
+def test_auto_id_test_cases(auto_id_field, path, data, expected_values):
+    check(parse(path), data)
+
+
+@pytest.mark.parametrize("path, data, update_value, expected_value", update_test_cases)
+def test_update_test_cases(path, data, update_value, expected_value):
+    check(parse(path), data)
+    assert parse(path).compile().update(copy.deepcopy(data), update_value) == expected_value
+
+
+@pytest.mark.parametrize("path, data, expected_values", ext_test_cases)
+def test_ext_test_cases(path, data, expected_values):
+    check(parse(path), data)
+
+
+@pytest.mark.parametrize("string", corpus)
+def test_corpus(string):
+    expression = parsed(string)
+    if expression is not None and not isinstance(expression, Prepared):
+        for data in documents:
+            check(expression, data)
+
+
+def test_generated():
+    generator = random.Random(1)
+    for string in generated_cases(1000, seed=2):
+        expression = parsed(string)
+        if expression is not None:
+            for _ in range(3):
+                check(expression, random_document(generator))
+
+
+def test_datum_input():
+    expression = parse("b.`parent`.a")
+    datum = DatumInContext({"a": 1, "b": 2}, path=Fields("x"), context={"x": None})
+    assert expression.compile().find(datum) == expression.find(datum)
+    assert expression.compile().find_values(datum) == expression.find_values(datum)
+
+
+def test_prepared():
+    expression = parse("$.users[?id == :uid].name").compile()
+    assert isinstance(expression, Prepared)
+    assert isinstance(expression.expression, CompiledJSONPath)
+    users = {"users": [{"id": 1, "name": "ann"}, {"id": 2, "name": "bob"}]}
+    assert expression.find_values(users, params={"uid": 2}) == ["bob"]
+    assert [match.value for match in expression.find(users, params={"uid": 1})] == ["ann"]
+
+
+def test_compiled_expression():
+    expression = parse("a[*].b")
+    compiled = expression.compile()
+    assert isinstance(compiled, JSONPath)
+    assert compiled == expression.compile()
+    assert compiled.compile() is compiled
+    assert str(compiled) == str(expression)
+    assert pickle.loads(pickle.dumps(compiled)) == compiled
+    assert compiled.find_first({"a": [{"b": 1}, {"b": 2}]}).value == 1
+    assert compiled.count({"a": [{"b": 1}, {"b": 2}]}) == 2
+
+
+def test_unknown_node():
+    from .test_jsonpath import Upper
+
+    # Node types the compiler does not know, even unhashable ones, are
+    # evaluated by the interpreter
+    expression = Child(Fields("a"), Upper())
+    compiled = expression.compile()
+    assert compiled.find({"a": "x"}) == expression.find({"a": "x"})
+    assert compiled.find_values({"a": "x"}) == ["X"]
+    assert Child(Upper(), Fields("upper")).compile().find_values("x") == []
+
+
+class Truthy(JSONPath):
+    """A node defined outside the library, which only expects the datums the interpreter passes."""
+
+    def find(self, datum):
+        return [datum] if datum.value else []
+
+
+@pytest.mark.parametrize("expression", (
+    Where(Fields("a"), Truthy()),
+    Child(Fields("a"), Where(Fields("b"), Truthy())),
+    Child(Fields("a"), Child(Truthy(), Fields("b"))),
+    Child(Where(Fields("a"), Child(Truthy(), Fields("b"))), Fields("c")),
+    parse("($) where (`sorted`[:2]).a[?a == 1]"),
+    parse("a where (`sorted`[1:]).b"),
+    parse("a.`sorted`[0].b"),
+    parse("(a where `len`).b[?(@.`sorted`)]"),
+))
+@pytest.mark.parametrize("data", documents + (
+    {"a": {"a": 1, "b": {"b": 1, "c": 2}}},
+    {"a": [{"a": 1}, {"a": 2}], "b": [{"b": 2}, {"b": 1}]},
+    [{"a": [{"a": 1}]}, {"a": [{"a": 1}]}],
+))
+def test_nodes_without_compilers(expression, data):
+    # Expressions made of nodes the compiler does not know give the results
+    # of the interpreter, whichever steps around them are compiled
+    check(expression, data)
@@ -0,0 +1,307 @@
+"""
+Differential tests of the recursive-descent parsers against the PLY parsers.
+"""
+
+import random
+import re
+import subprocess
+import sys
+
+import pytest
+
+from jsonpath_ng import parser
+from jsonpath_ng.descent import JsonPathDescentParser
+from jsonpath_ng.exceptions import JSONPathError, JsonPathLexerError, JsonPathParserError
+from jsonpath_ng.ext import parser as ext_parser
+from jsonpath_ng.ext.descent import ExtendedJsonPathDescentParser
+from jsonpath_ng.ext.string import DefintionInvalid
+from jsonpath_ng.jsonpath import JSONPath
+
+from .test_jsonpath import find_test_cases, update_test_cases
+from .test_jsonpath_rw_ext import test_cases as ext_test_cases
+from .test_parser import parser_test_cases
+
+corpus = sorted(
+    {case[0] for case in parser_test_cases + find_test_cases + update_test_cases}
+    | {case.values[0] for case in ext_test_cases}
+    | {
+        # Precedence and associativity
+        "a.b.c",
+        "a..b..c",
+        "a.b..c.d",
+        "a|b.c",
+        "a.b|c",
+        "a&b|c",
+        "a|b&c",
+        "a where b.c",
+        "a.b where c",
+        "a where b where c",
+        "a|b.c[0]",
+        "a..b[0].c",
+        "(a.b)[0]",
+        "[0][1]",
+        "[0].a[1:2][*]",
+        "a.[b,c].d",
+        "a,b.c",
+        "a.b,c",
+        "[a,b]",
+        "$['a']['b'][0]",
+        "`this`.a.`parent`",
+        "a[::-1]",
+        "a[1:2:3]",
+        "a[:]",
+        "[:3]",
+        # Extensions
+        "1 + 2 + 3",
+        "1 + 2 * 3",
+        "1 * 2 + 3",
+        "1.5 * 2.5",
+        "a + 1",
+        "a.b + c.d",
+        "a + b.c[0]",
+        "a.b * 2 + c",
+        "(a + b).c",
+        "(1 + 2)[0]",
+        "a * *",
+        "$.a - $.b",
+        "a[?b]",
+        "a[?b & c]",
+        "a[?b == 1 & c]",
+        "a[?(b == 1) & c > 2]",
+        "a[?(b) & c]",
+        "a[?(b).c == 1]",
+        "a[?((b == 1))]",
+        "a[?((b)) == 1]",
+        "a[?(b == 1 & (c == 2 & d))]",
+        "a[?b.c..d > 3]",
+        "a[?@ == true]",
+        "a[?@.b =~ 'x.*']",
+        "a[?b == 1][0]",
+        "a[?b == :c]",
+        "a[?b == :c & (d > :e)].f",
+        "a[/b]",
+        "a[\\b]",
+        "a[/b,\\c.d]",
+        "a[/b[0]]",
+        "a.`sorted`",
+        "a.`len`",
+        "a.`keys`",
+        "a.`str()`",
+        "a.`split(,, 0, -1)`",
+        "@",
+        "@.a",
+        "@a",
+    }
+)
+
+invalid = (
+    "",
+    "a.",
+    ".a",
+    "a..",
+    "a[",
+    "a[]",
+    "a[0",
+    "a[0,1]",
+    "a[b,]",
+    "a,",
+    "(a",
+    "a)",
+    "a b",
+    "1",
+    "a[?]",
+    "a[?b ==]",
+    "[?b]",
+    "[/b]",
+    "1 + 2.5",
+    "1.5 + 2",
+    "a + ",
+    "a[?b == c == d]",
+    "a[?(b == 1).c]",
+    "`grandparent`",
+    "`len`b",
+    "`grandparent` b",
+    "`foo`(",
+    "`foo`)",
+    "`foo`]",
+    "`foo` + 1",
+    "a.`sub(x)`",
+    "a[?b == :]",
+    "a[?:b == 1]",
+    "a[:b]",
+)
+
+vocabulary = (
+    "a", "b", "'c d'", "$", "*", ".", "..", "[", "]", "(", ")", "0", "1", "-1",
+    ":", ",", "|", "&", "where", "`this`", "`parent`", "`len`", "?", "@", "==",
+    ">", "+", "-", "/", "\\", "2.5", "true",
+)
+
+
+def attributes(node):
+    return {
+        name: getattr(node, name)
+        for cls in type(node).__mro__
+        for name in getattr(cls, "__slots__", ())
+        if name != "__weakref__"
+    }
+
+
+def structure(node):
+    """Make ASTs comparable regardless of which node types define __eq__."""
+    if isinstance(node, JSONPath):
+        return type(node), {name: structure(value) for name, value in attributes(node).items()}
+    if isinstance(node, (list, tuple)):
+        return type(node)(structure(value) for value in node)
+    return node
+
+
+def outcome(parser_class, string):
+    try:
+        return structure(parser_class().parse(string))
+    except (JSONPathError, DefintionInvalid) as e:
+        return type(e)
+
+
+def fuzz_cases(count, seed):
+    generator = random.Random(seed)
+    return [
+        " ".join(generator.choice(vocabulary) for _ in range(generator.randint(1, 7)))
+        for _ in range(count)
+    ]
+
+
+def generated_cases(count, seed):
+    """Mostly valid expressions, nesting every construct of both grammars."""
+    generator = random.Random(seed)
+    choice = generator.choice
+
+    def path(depth):
+        roll = generator.random() if depth < 4 else 1
+        if roll < 0.15:
+            operator = choice([".", "..", "|", "&", " where ", " + ", " - ", " * ", " / "])
+            return path(depth + 1) + operator + path(depth + 1)
+        if roll < 0.3:
+            return "%s[%s]" % (path(depth + 1), choice([
+                "0", "*", "1:2", "::-1", "a,b",
+                "?" + expression(depth + 1),
+                "/" + path(depth + 1),
+                "\\%s,/%s" % (path(depth + 1), path(depth + 1)),
+            ]))
+        if roll < 0.4:
+            return "(%s)" % path(depth + 1)
+        if roll < 0.45:
+            return "[%s]" % choice(["0", "*", ":3", "a"])
+        return choice(["a", "b", "$", "*", "@", "`this`", "`parent`", "`len`", "a,b", "'q r'", "1", "2.5"])
+
+    def expression(depth):
+        roll = generator.random()
+        if roll < 0.3:
+            return path(depth + 1) + choice(["", " == 1", " > 2.5", " =~ x", " != true"])
+        if roll < 0.5:
+            return expression(depth + 1) + " & " + expression(depth + 1)
+        if roll < 0.7:
+            return "(%s)%s" % (expression(depth + 1), choice(["", ".a", " == 1"]))
+        return path(depth + 1) + " == " + choice(["a", "1", "true", "2.5"])
+
+    return [path(0) for _ in range(count)]
+
+
+backends = pytest.mark.parametrize(
+    "ply_class, descent_class",
+    (
+        pytest.param(parser.JsonPathParser, JsonPathDescentParser, id="base"),
+        pytest.param(ext_parser.ExtentedJsonPathParser, ExtendedJsonPathDescentParser, id="ext"),
+    ),
+)
+
+
+@backends
+@pytest.mark.parametrize("string", corpus)
+def test_corpus(ply_class, descent_class, string):
+    assert outcome(descent_class, string) == outcome(ply_class, string)
+
+
+@backends
+@pytest.mark.parametrize("string", invalid)
+def test_invalid(ply_class, descent_class, string):
+    expected = outcome(ply_class, string)
+    assert isinstance(expected, type)
+    assert outcome(descent_class, string) == expected
+
+
+@backends
+def test_fuzz(ply_class, descent_class):
+    for string in fuzz_cases(3000, seed=1):
+        assert outcome(descent_class, string) == outcome(ply_class, string), string
+
+
+@backends
+def test_generated(ply_class, descent_class):
+    for string in generated_cases(3000, seed=1):
+        assert outcome(descent_class, string) == outcome(ply_class, string), string
+
+
+@pytest.mark.parametrize("parse", (parser.parse, ext_parser.parse))
+def test_backend_selection(monkeypatch, parse):
+    assert parse("a.b", backend="descent") == parse("a.b", backend="ply")
+
+    monkeypatch.setattr(parser, "default_backend", "descent")
+    assert isinstance(parse("a.b"), JSONPath)
+
+    with pytest.raises(ValueError):
+        parse("a.b", backend="yacc")
+
+
+def test_descent_parser_error_messages():
+    with pytest.raises(JsonPathParserError, match=r"near token \] \(\]\)"):
+        JsonPathDescentParser().parse("a[]")
+    with pytest.raises(JsonPathParserError, match="near the end of string"):
+        JsonPathDescentParser().parse("a.")
+
+
+@backends
+@pytest.mark.parametrize("string", (
+    "`grandparent`", "`len`b", "`grandparent` b", "`foo`(", "`foo` $", "`foo` 'x'", "`foo`)",
+    "`foo`]", "`foo` + 1", "`foo` == 1", "a.`foo` where b", "a.`foo` c", "(`foo`", "`foo`\\",
+))
+def test_named_operator_errors(ply_class, descent_class, string):
+    # An unknown operator is only reported once the token after it is read
+    with pytest.raises(JSONPathError) as expected:
+        ply_class().parse(string)
+    with pytest.raises(type(expected.value), match="^%s$" % re.escape(str(expected.value))):
+        descent_class().parse(string)
+
+
+def test_descent_works_without_docstrings():
+    code = (
+        "import jsonpath_ng, jsonpath_ng.ext;"
+        "assert jsonpath_ng.parse('a.b[0]').find({'a': {'b': [1]}})[0].value == 1;"
+        "assert jsonpath_ng.ext.parse('a[?b > 1].c').find({'a': [{'b': 2, 'c': 3}]})[0].value == 3"
+    )
+    subprocess.check_call([sys.executable, "-OO", "-c", code])
+
+
+def lexed(tokens):
+    """The tokens of an iterator, then the error that ended it"""
+    result = []
+    try:
+        for token in tokens:
+            result.append((token.type, token.value, token.lineno, token.lexpos, token.col))
+    except JsonPathLexerError as e:
+        result.append(str(e))
+    return result
+
+
+@backends
+def test_tokenizer(ply_class, descent_class):
+    tokenizer = descent_class.tokenizer_class()
+    assert tokenizer.lexer_class is ply_class().lexer_class
+    strings = corpus + list(invalid) + fuzz_cases(3000, seed=2) + [
+        "a\n.b\n\n[ 'c\nd' ]\t.`e`", "'a\\'b' \"c\\\\d\"", "a.'b", "a.'b\\", "a.'b\\\nc'", "`x\\`",
+        "\"a\" 'b", "a\n#", "trueish.falsey", "a[/b,\\c, /d]", "a[?b==:c]", "-1.5-2", "@a.b-c",
+    ]
+    for string in strings:
+        tokens, error = tokenizer.tokenize(string)
+        expected = lexed(ply_class().lexer_class().tokenize(string))
+        assert lexed(tokens) + ([str(error)] if error else []) == expected, string
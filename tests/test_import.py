@@ -0,0 +1,58 @@
+import subprocess
+import sys
+
+import pytest
+
+import jsonpath_ng
+
+
+def imported_modules(code):
+    """Runs `code` in a fresh interpreter and returns the modules it imported, per `-X importtime`."""
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                             stderr=subprocess.PIPE, universal_newlines=True, check=True)
+    return [line.rsplit("|", 1)[-1].strip() for line in process.stderr.splitlines()
+            if line.startswith("import time:") and "self [us]" not in line]
+
+
+@pytest.mark.parametrize("package", ("jsonpath_ng", "jsonpath_ng.ext"))
+def test_import_does_not_load_parser(package):
+    modules = imported_modules("import %s" % package)
+    assert package in modules
+    assert not [module for module in modules if module.split(".")[0] in ("ply", "logging")]
+    assert not {"jsonpath_ng.lexer", "jsonpath_ng.parser", "jsonpath_ng.ext.parser"} & set(modules)
+
+
+@pytest.mark.parametrize("package", ("jsonpath_ng", "jsonpath_ng.ext"))
+def test_first_parse_loads_parser(package):
+    modules = imported_modules("import %s; %s.parse('a.b')" % (package, package))
+    assert "ply.lex" in modules
+    assert "jsonpath_ng.parser" in modules
+
+
+def test_descent_backend_does_not_load_yacc():
+    modules = imported_modules("import jsonpath_ng; jsonpath_ng.parse('a.b', backend='descent')")
+    assert "ply.lex" in modules
+    assert "ply.yacc" not in modules
+
+
+def test_public_namespace():
+    # In a fresh interpreter, as importing submodules adds them to the package namespace
+    names = subprocess.check_output(
+        [sys.executable, "-c", "import jsonpath_ng; print(' '.join(sorted(vars(jsonpath_ng))))"],
+        universal_newlines=True,
+    ).split()
+    assert [name for name in names if not name.startswith("_")] == [
+        "AutoIdForDatum", "Child", "DatumInContext", "Descendants", "Fields", "Index",
+        "IndexedDatum", "Intersect", "JSONPath", "JsonIndex", "Parent", "Root", "Slice", "This",
+        "Union", "Where",
+        "jsonpath", "parse", "parse_many",
+    ]
+
+
+def test_lazy_parse_matches_parser_module():
+    from jsonpath_ng import parser
+    from jsonpath_ng.ext import parse as ext_parse
+    from jsonpath_ng.ext import parser as ext_parser
+
+    assert jsonpath_ng.parse("a.b[0]") is parser.parse("a.b[0]")
+    assert ext_parse("a[?b > 1]") is ext_parser.parse("a[?b > 1]")
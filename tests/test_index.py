@@ -0,0 +1,137 @@
+"""
+Differential tests of evaluation against a `JsonIndex` and against the
+document it indexes.
+"""
+
+import random
+
+import pytest
+
+from jsonpath_ng import jsonpath
+from jsonpath_ng.ext import parse
+from jsonpath_ng.jsonpath import DatumInContext, IndexedDatum, JsonIndex
+
+from .test_compiler import documents, outcome, parsed, random_document
+from .test_descent import corpus, generated_cases
+from .test_jsonpath import find_test_cases, find_test_cases_with_auto_id
+
+
+def described(matches):
+    if not isinstance(matches, list):
+        return matches
+    # `parent` of the top of the document finds None
+    return [match and (match.value, str(match.full_path), match.path_tuple) for match in matches]
+
+
+def check(expression, data):
+    """Compare the evaluation of `expression` on `data` and on its index."""
+    index = JsonIndex(data)
+
+    expected = outcome(expression.find, data)
+    assert described(outcome(expression.find, index)) == described(expected)
+    if isinstance(expected, list):
+        assert expression.find(index) == expected
+    assert described(outcome(expression.compile().find, index)) == described(expected)
+
+    assert outcome(expression.find_values, index) == outcome(expression.find_values, data)
+    assert outcome(expression.count, index) == outcome(expression.count, data)
+
+
+@pytest.mark.parametrize("path, data, expected_values, expected_full_paths", find_test_cases)
+def test_find_test_cases(path, data, expected_values, expected_full_paths):
+    check(parse(path), data)
+
+
+@pytest.mark.parametrize("path, data, expected_values", find_test_cases_with_auto_id)
+def test_auto_id_test_cases(auto_id_field, path, data, expected_values):
+    check(parse(path), data)
+
+
+@pytest.mark.parametrize("string", corpus)
+def test_corpus(string):
+    expression = parsed(string)
+    if expression is not None and isinstance(expression, jsonpath.JSONPath):
+        for data in documents:
+            check(expression, data)
+
+
+def test_generated():
+    generator = random.Random(3)
+    for string in generated_cases(1000, seed=4):
+        expression = parsed(string)
+        if expression is not None and isinstance(expression, jsonpath.JSONPath):
+            check(expression, random_document(generator))
+
+
+def test_index_structure():
+    data = {"a": [{"b": 1}, {"c": {"b": 2}}], "b": 3}
+    index = JsonIndex(data)
+
+    assert len(index) == 8
+    assert [datum.value for datum in index.nodes] == [
+        data, data["a"], data["a"][0], 1, data["a"][1], data["a"][1]["c"], 2, 3,
+    ]
+    assert [datum.depth for datum in index.nodes] == [0, 1, 2, 3, 2, 3, 4, 1]
+    assert index.ends == [8, 7, 4, 4, 7, 7, 7, 8]
+    assert index.children[1] == [2, 4] and index.children[3] is None
+    assert index.fields["b"] == ([0, 2, 5], [7, 3, 6])
+    assert index.field(5, "b") is index.nodes[6]
+    assert index.field(4, "b") is None
+    assert [datum.value for datum in index.descendant_fields(1, ("b", "c"))] == [1, data["a"][1]["c"], 2]
+    assert index.build_time > 0
+    assert index.memory_size() > 0
+    assert repr(index) == "JsonIndex(<8 nodes>)"
+
+
+def test_index_lookups_build_no_data(monkeypatch):
+    data = {"a": [{"b": 1}, {"c": {"b": 2}}], "b": 3}
+    index = JsonIndex(data)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("A DatumInContext was created")
+
+    # The datums found from the index itself are made once
+    relative = (("a[*].c.b", [2]), ("*", [data["a"], 3]))
+    for string, _ in relative:
+        parse(string).find(index)
+
+    monkeypatch.setattr(DatumInContext, "__init__", fail)
+    for string, values in (
+        ("$..b", [3, 1, 2]),
+        ("$.a[1].c", [{"b": 2}]),
+        ("$..b.`parent`", [data, data["a"][0], data["a"][1]["c"]]),
+    ) + relative:
+        matches = parse(string).find(index)
+        assert [match.value for match in matches] == values
+        assert all(isinstance(match, IndexedDatum) and match.index is index for match in matches)
+
+
+def test_index_of_irregular_types():
+    class Mapping(dict):
+        def get(self, key, default=None):
+            return "got"
+
+    data = {"a": Mapping(b=1), "c": [Mapping()]}
+    index = JsonIndex(data)
+    assert not index.plain
+    for string in ("$..b", "$.a.b", "$.c[0].b", "$..*"):
+        assert described(parse(string).find(index)) == described(parse(string).find(data))
+
+
+@pytest.mark.parametrize("string", [
+    "$..[-1]", "[-1][-1]", "$.x[-1].a[-2]", "$..a[-1].`parent`", "x[-1]..a[-1]", "x[-1][*].a", "$..[-1][-1]",
+    "$..a.`parent`", "$.a.`parent`", "a.`parent`", "$..b.`parent`.`parent`", "*.`parent`",
+    "$..b.`parent`.`parent`.`parent`.x", "(a.`parent`)..b", "$.x..a[0].`parent`.`parent`",
+])
+def test_full_paths(string):
+    expression = parse(string)
+    found = False
+    for data in ({"a": [1, {"a": [2, 3], "b": 4}], "x": [[8], {"a": [9, {"b": 5}]}]}, [["ab", ["cd", "e"]], [["f"]]]):
+        expected = outcome(expression.find, data)
+        if not isinstance(expected, list):
+            continue
+        found = found or bool(expected)
+        index = JsonIndex(data)
+        for _ in range(2):
+            assert described(expression.find(index)) == described(expected)
+    assert found
@@ -0,0 +1,138 @@
+import copy
+import gc
+import pickle
+
+import pytest
+
+from jsonpath_ng.ext.parser import ExtentedJsonPathParser
+from jsonpath_ng.interning import InternTable
+from jsonpath_ng.jsonpath import Child, Fields, Index, JSONPath, Root, Slice, This
+
+from .test_descent import attributes
+
+# At least one expression per node type
+expressions = (
+    "$",
+    "`this`",
+    "`parent`",
+    "a.b",
+    "a..b",
+    "a where b",
+    "a|b",
+    "a&b",
+    "a,b",
+    "[0]",
+    "[1:2:3]",
+    "[*]",
+    "a[?b]",
+    "a[?b == 1 & c =~ 'x']",
+    "a[?b > 1.5]",
+    "a[?b == true]",
+    "a + 1",
+    "a.b * c.d",
+    "a.`sorted`",
+    "a[/b,\\c]",
+    "a.`len`",
+    "a.`keys`",
+    "a.`sub(/x/, y)`",
+    "a.`split(,, 0, -1)`",
+    "a.`str()`",
+)
+
+
+def parse(string):
+    # Bypasses the parse cache, which interns
+    return ExtentedJsonPathParser().parse(string)
+
+
+def nodes(value):
+    """Yields the nodes of an expression, following constructor arguments."""
+    if isinstance(value, JSONPath):
+        yield value
+        value = value.__reduce__()[1]
+    if isinstance(value, (list, tuple)):
+        for item in value:
+            yield from nodes(item)
+
+
+@pytest.mark.parametrize("string", expressions)
+def test_structural_equality_and_hash(string):
+    first, second = parse(string), parse(string)
+    for a, b in zip(nodes(first), nodes(second)):
+        assert a == b
+        assert hash(a) == hash(b)
+
+
+def test_distinct_expressions_are_unequal():
+    parsed = [parse(string) for string in expressions]
+    for i, a in enumerate(parsed):
+        for b in parsed[i + 1:]:
+            assert a != b
+
+
+@pytest.mark.parametrize(
+    "a, b",
+    (
+        ("a.`sorted`", "a.`len`"),
+        ("a[/b]", "a[\\b]"),
+        ("a[?b == 1]", "a[?b == true]"),
+        ("a[?b == 1]", "a[?b == 1.0]"),
+        ("1 + a", "1.0 + a"),
+        ("a + b", "a - b"),
+        ("a.`sub(/x/, y)`", "a.`sub(/x/, z)`"),
+    ),
+)
+def test_literal_types_and_operators_matter(a, b):
+    assert parse(a) != parse(b)
+
+
+@pytest.mark.parametrize("string", expressions)
+def test_nodes_are_immutable(string):
+    for node in nodes(parse(string)):
+        assert not hasattr(node, "__dict__")
+        for name in attributes(node):
+            with pytest.raises(AttributeError):
+                setattr(node, name, None)
+            with pytest.raises(AttributeError):
+                delattr(node, name)
+
+
+@pytest.mark.parametrize("string", expressions)
+def test_pickle_and_copy(string):
+    expression = parse(string)
+    assert pickle.loads(pickle.dumps(expression)) == expression
+    assert copy.deepcopy(expression) == expression
+
+
+def test_interning_shares_subexpressions():
+    table = InternTable()
+    first = table.intern(parse("$.a[?b == 1].c"))
+    second = table.intern(parse("$.a[?b == 1].d"))
+    assert first is not second
+    assert first.left is second.left
+    assert table.intern(parse("$.a[?b == 1].c")) is first
+
+
+def test_interning_distinguishes_literal_types():
+    table = InternTable()
+    assert table.intern(parse("a[?b == 1]")) is not table.intern(parse("a[?b == true]"))
+    assert table.intern(Index(1)) is not table.intern(Index(True))
+
+
+def test_interning_keeps_canonical_nodes_weakly():
+    table = InternTable()
+    expression = table.intern(Child(Child(Root(), Fields("a")), Slice()))
+    assert len(table) == 5
+    del expression
+    gc.collect()
+    assert len(table) == 0
+
+
+def test_interning_rebuilds_over_canonical_children():
+    table = InternTable()
+    fields = table.intern(Fields("a"))
+    child = Child(This(), Fields("a"))
+    interned = table.intern(child)
+    assert interned is not child
+    assert interned == child
+    assert interned.right is fields
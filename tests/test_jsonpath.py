@@ -1,9 +1,14 @@
 import copy
+import gc
+import pickle
+import sys
+import weakref
 
 import pytest
 
 from jsonpath_ng.ext.parser import parse as ext_parse
-from jsonpath_ng.jsonpath import DatumInContext, Fields, Root, This
+from jsonpath_ng import jsonpath
+from jsonpath_ng.jsonpath import DatumInContext, Fields, Index, Root, Slice, This
 from jsonpath_ng.lexer import JsonPathLexerError
 from jsonpath_ng.parser import parse as base_parse
 
@@ -51,6 +56,26 @@ def test_datumincontext_in_context_nested():
     assert sequential_calls == nested_calls
 
 
+def test_datumincontext_full_path_and_root_are_shared():
+    root = DatumInContext({"foo": [{"bar": 1}]}, path=Root())
+    foo = DatumInContext(root.value["foo"], path=Fields("foo"), context=root)
+    item = DatumInContext(foo.value[0], path=jsonpath.Index(0), context=foo)
+    bar = DatumInContext(1, path=Fields("bar"), context=item)
+
+    assert bar.full_path == Root().child(Fields("foo")).child(jsonpath.Index(0)).child(Fields("bar"))
+    assert bar.full_path is bar.full_path
+    assert bar.full_path.left is item.full_path
+    assert bar.root is root
+    assert item.root is root
+
+
+def test_datumincontext_has_no_dict():
+    datum = DatumInContext(3, path=Fields("foo"), context={"foo": 3})
+    assert not hasattr(datum, "__dict__")
+    assert not hasattr(jsonpath.AutoIdForDatum(datum), "__dict__")
+    assert datum.full_path == Fields("foo")
+
+
 parsers = pytest.mark.parametrize(
     "parse",
     (
@@ -60,6 +85,25 @@ parsers = pytest.mark.parametrize(
 )
 
 
+@pytest.mark.parametrize(
+    "path, data, expected",
+    (
+        ("$.foo[0].bar", {"foo": [{"bar": 1}]}, [("foo", 0, "bar")]),
+        ("foo[*]", {"foo": [1, 2]}, [("foo", 0), ("foo", 1)]),
+        ("$..b", {"a": {"b": 1}, "b": 2}, [("b",), ("a", "b")]),
+        ("a.`parent`", {"a": 1}, [()]),
+    ),
+)
+@parsers
+def test_datumincontext_path_tuple(parse, path, data, expected):
+    assert [match.path_tuple for match in parse(path).find(data)] == expected
+
+
+def test_datumincontext_path_tuple_auto_id(auto_id_field):
+    (match,) = base_parse("foo.id").find({"foo": {"bar": 1}})
+    assert match.path_tuple == ("foo", "id")
+
+
 update_test_cases = (
     #
     # Fields
@@ -127,6 +171,17 @@ update_test_cases = (
         {"foo": {"bar": 3, "flag": 1}, "baz": {"bar": 2}},
     ),
     #
+    # Union
+    # -----
+    #
+    ("foo|bar", {"foo": 1, "bar": 2, "baz": 3}, 5, {"foo": 5, "bar": 5, "baz": 3}),
+    (
+        "($..a)|(x[*].a)|(x[1].b.a)",
+        {"x": [{"a": 1}, {"b": {"a": 2}}]},
+        lambda x, y, z: x + 1,
+        {"x": [{"a": 2}, {"b": {"a": 3}}]},
+    ),
+    #
     # Lambdas
     # -------
     #
@@ -281,6 +336,332 @@ def test_find(parse, path, data, expected_values, expected_full_paths):
     assert_full_path_equality(results, expected_full_paths)
 
 
+@pytest.mark.parametrize(
+    "path, data, expected_values, expected_full_paths", find_test_cases
+)
+@parsers
+def test_iter_find(parse, path, data, expected_values, expected_full_paths):
+    results = parse(path).iter_find(data)
+
+    assert not isinstance(results, list)
+    assert list(results) == parse(path).find(data)
+
+
+@pytest.mark.parametrize(
+    "path, data, expected_values, expected_full_paths", find_test_cases
+)
+@parsers
+def test_find_first_exists_count(parse, path, data, expected_values, expected_full_paths):
+    expression = parse(path)
+    results = expression.find(data)
+
+    assert expression.find_first(data) == (results[0] if results else None)
+    assert expression.exists(data) is bool(results)
+    assert expression.count(data) == len(results)
+
+
+@pytest.mark.parametrize("expression", (Index(0), Index(-1), Slice(), Slice(0, 1)))
+@pytest.mark.parametrize("data", ({"a": 1}, {0: "x"}, {1, 2}, "ab", [1, 2]))
+def test_count_fails_as_find(expression, data):
+    try:
+        expected = len(expression.find(data))
+    except (KeyError, TypeError) as e:
+        with pytest.raises(type(e)):
+            expression.count(data)
+    else:
+        assert expression.count(data) == expected
+
+
+@pytest.mark.parametrize(
+    "path, data, expected_values, expected_full_paths", find_test_cases
+)
+@parsers
+def test_find_values(parse, path, data, expected_values, expected_full_paths):
+    expression = parse(path)
+    assert expression.find_values(data) == [match.value for match in expression.find(data)]
+
+
+@pytest.mark.parametrize(
+    "path, data, expected_values",
+    (
+        ("foo[*].bar", {"foo": [{"bar": 1}, {"baz": 2}, {"bar": 3}]}, [1, 3]),
+        ("$..bar", {"foo": [{"bar": 1}, {"bar": {"bar": 2}}]}, [1, {"bar": 2}, 2]),
+        ("(foo[0:2].bar)|baz", {"foo": [{"bar": 1}, {"bar": 2}], "baz": 3}, [1, 2, 3]),
+        ("foo[1].*", {"foo": [{}, {"bar": 1, "baz": 2}]}, [1, 2]),
+        ("foo[*].bar[0]", {"foo": {"bar": [1, 2]}}, [1]),
+        ("foo[*]", {"foo": {"bar": 1}}, [{"bar": 1}]),
+    ),
+)
+@parsers
+def test_find_values_builds_no_matches(monkeypatch, parse, path, data, expected_values):
+    expression = parse(path)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("A DatumInContext was created")
+
+    monkeypatch.setattr(DatumInContext, "__init__", fail)
+    assert expression.find_values(data) == expected_values
+    assert expression.count(data) == len(expected_values)
+
+
+@pytest.mark.parametrize(
+    "path, needs_context",
+    (
+        ("$.foo[*].bar", False),
+        ("(foo..bar)|$.baz", False),
+        ("foo.`parent`", True),
+        ("foo.$", True),
+        ("foo where $.bar", True),
+        ("foo|bar.(baz|$)", True),
+    ),
+)
+@parsers
+def test_find_values_needs_context(parse, path, needs_context):
+    assert jsonpath._needs_context(parse(path)) is needs_context
+
+
+class Upper(jsonpath.JSONPath):
+    """A node defined outside the library, unhashable as it defines `__eq__` alone."""
+
+    def find(self, datum):
+        datum = DatumInContext.wrap(datum)
+        return [DatumInContext(datum.value.upper(), path=Fields("upper"), context=datum)]
+
+    def __eq__(self, other):
+        return isinstance(other, Upper)
+
+
+def test_find_values_unhashable_node():
+    expression = jsonpath.Child(Fields("a"), Upper())
+    assert expression.find_values({"a": "x"}) == ["X"]
+    assert list(expression.iter_values({"a": "x"})) == ["X"]
+    assert not jsonpath._needs_context(expression)
+
+    # Nor are expressions kept alive
+    reference = weakref.ref(expression)
+    del expression
+    gc.collect()
+    assert reference() is None
+
+
+@parsers
+def test_union_unique(parse):
+    data = {"x": {"a": 1}, "a": [2]}
+    expression = parse("($..a)|(x.a)")
+    assert expression.find_values(data) == [[2], 1, 1]
+
+    unique = jsonpath.Union(expression.left, expression.right, unique=True)
+    assert [str(match.full_path) for match in unique.find(data)] == ["a", "x.a"]
+    assert unique.find_values(data) == [[2], 1]
+    assert unique.count(data) == 2
+    assert unique.compile().find(data) == unique.find(data)
+    assert unique.compile().find_values(data) == [[2], 1]
+    assert jsonpath._needs_context(unique)
+
+    assert unique != expression
+    assert repr(unique) == "Union(%r, %r, unique=True)" % (expression.left, expression.right)
+    assert pickle.loads(pickle.dumps(unique)) == unique
+
+
+@parsers
+def test_union_filter(parse):
+    data = {"a": [1, 2, 3, 4], "b": {"c": 5, "d": 6}}
+    expression = parse("(a[*])|(a[1:])|(b.*)")
+    assert expression.filter(lambda value: value % 2 == 0, data) == {"a": [1, 3], "b": {"c": 5}}
+
+
+@parsers
+def test_union_negative_indices(parse):
+    # `[-1]` and `[2]` are the same item, updated or removed once
+    expression = parse("($.a[-1])|($.a[2])")
+    assert expression.update({"a": [0, 1, 2]}, lambda value, data, field: value + 10) == {"a": [0, 1, 12]}
+    assert expression.filter(lambda value: True, {"a": [0, 1, 2]}) == {"a": [0, 1]}
+    assert parse("($.a[-1])|($.a[0])").filter(lambda value: True, {"a": [0, 1, 2]}) == {"a": [1]}
+
+
+@parsers
+def test_intersect(parse):
+    data = {"a": {"b": 1, "c": 2}, "x": [{"b": 3}, {"b": 4, "c": 5}]}
+    expression = parse("($..b)&(x[*].*)")
+    assert [str(match.full_path) for match in expression.find(data)] == ["x.[0].b", "x.[1].b"]
+    assert expression.find_values(data) == [3, 4]
+    assert expression.count(data) == 2
+    assert expression.compile().find(data) == expression.find(data)
+    assert parse("(a)&(a)").find_values(data) == [data["a"]]
+    assert parse("($)&(`this`)").find_values(data) == [data]
+    assert parse("(a.b)&(a.c)").find(data) == []
+    assert parse("(x[-1].b)&(x[1].*)").find_values(data) == [4]
+    assert jsonpath._needs_context(expression)
+
+    updated = copy.deepcopy(data)
+    assert expression.update(updated, lambda x, y, z: x * 10) == {
+        "a": {"b": 1, "c": 2}, "x": [{"b": 30}, {"b": 40, "c": 5}]}
+    assert expression.filter(lambda value: value > 3, data) == {"a": {"b": 1, "c": 2}, "x": [{"b": 3}, {"c": 5}]}
+
+
+@parsers
+@pytest.mark.parametrize("string, data, updated", (
+    ("x[*]", {"x": {"k": 1}}, {"x": 9}),
+    ("*[*]", {"a": {"k": 1}, "b": 2, "c": [3, "s"]}, {"a": 9, "b": 9, "c": [9, 9]}),
+    ("[*]", {"k": 1}, 9),
+    ("x[0:1]", {"x": "abc"}, {"x": 9}),
+))
+def test_intersect_wrapped_values(parse, string, data, updated):
+    """Slices put dicts and scalars in lists of their own, made anew each time"""
+    single = parse(string)
+    expression = parse("(%s)&(%s)" % (string, string))
+    assert expression.find_values(data) == single.find_values(data)
+    assert [str(match.full_path) for match in expression.find(data)] == [
+        str(match.full_path) for match in single.find(data)]
+    assert expression.compile().find_values(data) == single.find_values(data)
+    assert expression.update(copy.deepcopy(data), 9) == updated
+
+
+def nested(depth):
+    data = {"id": depth}
+    for level in range(depth):
+        data = {"id": level, "child": [data] if level % 2 else data}
+    return data
+
+
+@pytest.mark.parametrize("compile", (False, True), ids=("interpreted", "compiled"))
+def test_descendants_of_deep_data(compile):
+    depth = 5 * sys.getrecursionlimit()
+    expression = base_parse("$..id")
+    if compile:
+        expression = expression.compile()
+
+    expected = list(range(depth - 1, -1, -1)) + [depth]
+    assert [match.value for match in expression.find(nested(depth))] == expected
+    assert expression.find_values(nested(depth)) == expected
+    assert expression.count(nested(depth)) == depth + 1
+
+    data = expression.update(nested(depth), lambda value, data, field: value + 1)
+    assert expression.find_values(data) == [value + 1 for value in expected]
+
+    data = expression.filter(lambda value: value % 2 == 0, nested(depth))
+    assert expression.find_values(data) == [value for value in expected if value % 2]
+
+
+def evaluated(function, *args):
+    try:
+        return function(*args)
+    except Exception as e:
+        return type(e)
+
+
+@pytest.mark.parametrize(
+    "path",
+    (
+        "$..a",
+        "$..a,b",
+        "$..'q r'",
+        "b..a",
+        "$..[0]",
+        "$..[1]",
+        "$..[1:]",
+        "$..[:1]",
+        "$..[::-1]",
+        "$..[*]",
+        "$..a..[0:2]",
+    ),
+)
+@pytest.mark.parametrize(
+    "data",
+    (
+        {"a": 1, "b": {"a": [{"a": None}, {"b": 2}], "c": "xyz"}, "q r": False},
+        {"b": [[1, [2, 3]], [], "ab", {"a": {"a": 0}}]},
+        [["x", ["y", "z"]], [[]], ["a", "bc"]],
+        [{"a": [[1, 2], [3]]}, {"a": []}],
+        "text",
+        None,
+    ),
+)
+def test_descendants_key_test(monkeypatch, path, data):
+    expression = base_parse(path)
+    compiled = expression.compile()
+    outcomes = [
+        evaluated(expression.find, data),
+        evaluated(expression.find_values, data),
+        evaluated(expression.count, data),
+        evaluated(compiled.find, data),
+        evaluated(compiled.find_values, data),
+    ]
+
+    monkeypatch.setattr(jsonpath, "_descendant_test", lambda node: None)
+    expected = evaluated(expression.find, data)
+    assert outcomes[0] == outcomes[3] == expected
+    if isinstance(expected, list):
+        assert [str(match.full_path) for match in outcomes[0]] == [str(match.full_path) for match in expected]
+    assert outcomes[1] == outcomes[4] == evaluated(expression.find_values, data)
+    assert outcomes[2] == evaluated(expression.count, data)
+
+
+@pytest.mark.parametrize("compile", (False, True), ids=("interpreted", "compiled"))
+def test_descendants_key_test_builds_matches_only(monkeypatch, compile):
+    data = {"a": [{"b": {"c": 1}}, {"price": 2, "b": [3, {"d": 4}]}], "e": {"f": {"price": 5}}}
+    expression = base_parse("$..price")
+    if compile:
+        expression = expression.compile()
+
+    built = []
+    init = DatumInContext.__init__
+
+    def record(self, value, path=None, context=None):
+        built.append(value)
+        init(self, value, path, context)
+
+    monkeypatch.setattr(DatumInContext, "__init__", record)
+    matches = expression.find(data)
+    assert [match.value for match in matches] == [2, 5]
+    assert [str(match.full_path) for match in matches] == ["a.[1].price", "e.f.price"]
+    # The data, the matches and their ancestors
+    assert built == [data, data["a"], data["a"][1], 2, data["e"], data["e"]["f"], 5]
+
+
+class ExplodingDict(dict):
+    def explode(self, *args):
+        raise AssertionError("Evaluated past the first match")
+
+    keys = get = __getitem__ = explode
+
+
+@pytest.mark.parametrize(
+    "path, data",
+    (
+        ("$..a", {"a": 1, "b": ExplodingDict()}),
+        ("b[*].a", {"b": [{"a": 1}, ExplodingDict()]}),
+        ("a|(b.c)", {"a": 1, "b": ExplodingDict()}),
+        ("(b[*] where a).a", {"b": [{"a": 1}, ExplodingDict()]}),
+    ),
+)
+@parsers
+def test_iter_find_is_lazy(parse, path, data):
+    assert next(parse(path).iter_find(data)).value == 1
+    assert parse(path).find_first(data).value == 1
+    assert parse(path).exists(data)
+    with pytest.raises(AssertionError):
+        parse(path).find(data)
+
+
+@pytest.mark.parametrize(
+    "path, data, expected_values",
+    (
+        ("x where (*.c)", {"x": {"p": {"c": 1}, "q": ExplodingDict()}}, [{"p": {"c": 1}, "q": {}}]),
+        ("a[?b == 1 & c.d]", {"a": [{"b": 2, "c": ExplodingDict()}, {"b": 1, "c": {"d": 0}}]}, [{"b": 1, "c": {"d": 0}}]),
+        ("a[?c.*.d > 0]", {"a": [{"c": {"p": {"d": 1}, "q": ExplodingDict()}}]}, [{"c": {"p": {"d": 1}, "q": {}}}]),
+        ("a[?c.*.d]", {"a": [{"c": {"p": {"d": 1}, "q": ExplodingDict()}}]}, [{"c": {"p": {"d": 1}, "q": {}}}]),
+    ),
+)
+def test_predicates_stop_at_first_match(path, data, expected_values):
+    # A predicate stops at its first failing expression, and an expression
+    # at its first match
+    expression = ext_parse(path)
+    for evaluated in (expression, expression.compile()):
+        assert [match.value for match in evaluated.find(data)] == expected_values
+        assert evaluated.find_values(data) == expected_values
+
+
 find_test_cases_with_auto_id = (
     #
     # * (star)
@@ -349,6 +730,28 @@ def test_find_values_auto_id(auto_id_field, parse, path, data, expected_values):
     assert_value_equality(result, expected_values)
 
 
+@pytest.mark.parametrize("path, data, expected_values", find_test_cases_with_auto_id)
+@parsers
+def test_count_auto_id(auto_id_field, parse, path, data, expected_values):
+    assert parse(path).count(data) == len(expected_values)
+
+
+def test_package_auto_id_field(monkeypatch):
+    import jsonpath_ng
+
+    assert jsonpath_ng.auto_id_field is None
+    monkeypatch.setattr(jsonpath_ng, "auto_id_field", "id")
+    assert jsonpath.auto_id_field == jsonpath_ng.auto_id_field == "id"
+    assert [match.value for match in ext_parse("foo.baz.id").find({"foo": {"baz": 3}})] == ["foo.baz"]
+
+
+@pytest.mark.parametrize("path, data, expected_values", find_test_cases_with_auto_id)
+@parsers
+def test_find_values_method_auto_id(auto_id_field, parse, path, data, expected_values):
+    expression = parse(path)
+    assert expression.find_values(data) == [match.value for match in expression.find(data)]
+
+
 @parsers
 def test_find_full_paths_auto_id(auto_id_field, parse):
     results = parse("*").find({"foo": 1, "baz": 2})
@@ -5,9 +5,12 @@ test_jsonpath_ng_ext
 Tests for `jsonpath_ng_ext` module.
 """
 
+import copy
+
 import pytest
 
 from jsonpath_ng.exceptions import JsonPathParserError
+from jsonpath_ng import jsonpath
 from jsonpath_ng.ext import parser
 
 from .helpers import assert_value_equality
@@ -457,9 +460,70 @@ def test_values(path, data, expected_values):
     assert_value_equality(results, expected_values)
 
 
+@pytest.mark.parametrize("path, data, expected_values", test_cases)
+def test_iter_find_values(path, data, expected_values):
+    expression = parser.parse(path)
+    assert list(expression.iter_find(copy.deepcopy(data))) == expression.find(copy.deepcopy(data))
+
+
+@pytest.mark.parametrize("path, data, expected_values", test_cases)
+def test_count(path, data, expected_values):
+    expression = parser.parse(path)
+    assert expression.count(copy.deepcopy(data)) == len(expression.find(copy.deepcopy(data)))
+
+
+@pytest.mark.parametrize("path, data, expected_values", test_cases)
+def test_find_values(path, data, expected_values):
+    expression = parser.parse(path)
+    assert expression.find_values(copy.deepcopy(data)) == [
+        match.value for match in expression.find(copy.deepcopy(data))
+    ]
+
+
 def test_invalid_hyphenation_in_key():
     # This test is almost copied-and-pasted directly from `test_jsonpath.py`.
     # However, the parsers generate different exceptions for this syntax error.
     # This discrepancy needs to be resolved.
     with pytest.raises(JsonPathParserError):
         parser.parse("foo.-baz")
+
+
+def test_filter_over_dict():
+    data = {"objects": {"a": {"cow": 1}, "b": {"cow": 3}, "c": {"cow": 5}}}
+    expression = parser.parse("objects[?cow > 2]")
+    for evaluated in (expression, expression.compile()):
+        datum = jsonpath.DatumInContext(data)
+        matches = evaluated.find(datum)
+        assert [(match.value, str(match.full_path)) for match in matches] == [
+            ({"cow": 3}, "objects.b"),
+            ({"cow": 5}, "objects.c"),
+        ]
+        # Neither the data nor the datums passed are changed
+        assert datum.value is data
+        assert isinstance(matches[0].context.value, dict)
+        assert evaluated.find_values(data) == [{"cow": 3}, {"cow": 5}]
+    assert data == {"objects": {"a": {"cow": 1}, "b": {"cow": 3}, "c": {"cow": 5}}}
+
+    assert parser.parse("$[?cow > 2]").filter(lambda value: value["cow"] < 5, data["objects"]) == {
+        "a": {"cow": 1}, "c": {"cow": 5}}
+
+
+@pytest.mark.parametrize(
+    "path, data, expected_values",
+    (
+        ("a where `sorted`", {"a": 5}, [5]),
+        ("a where `sorted`", {"a": {"x": 1}}, [{"x": 1}]),
+        ("a where (`this`[/x])", {"a": {"x": 1}}, [{"x": 1}]),
+        ("a[?`sorted`]", {"a": [5, {"x": 1}]}, [5, {"x": 1}]),
+        ("a[?(@.`sorted`)]", {"a": [5]}, [5]),
+        ("a[?@[\\x]]", {"a": [{"x": 1}]}, [{"x": 1}]),
+        ("a.`sorted`", {"a": 5}, [5]),
+    ),
+)
+def test_sorted_of_scalars_and_dicts(path, data, expected_values):
+    expression = parser.parse(path)
+    for evaluated in (expression, expression.compile()):
+        assert [match.value for match in evaluated.find(data)] == expected_values
+        assert evaluated.find_values(data) == expected_values
+        assert evaluated.count(data) == len(expected_values)
+        assert evaluated.exists(data)
@@ -1,3 +1,5 @@
+import re
+
 import pytest
 
 from jsonpath_ng.lexer import JsonPathLexer, JsonPathLexerError
@@ -53,3 +55,57 @@ invalid_token_test_cases = (
 def test_lexer_errors(string):
     with pytest.raises(JsonPathLexerError):
         list(JsonPathLexer().tokenize(string))
+
+
+@pytest.mark.parametrize(
+    "string, expected_token_info",
+    (
+        (r"'a\'b'.c", (("a'b", "ID"), (".", "."), ("c", "ID"))),
+        (r'"a\\b"', (("a\\b", "ID"),)),
+        (r"`sub(/a\\+b/, c)`", (("sub(/a\\+b/, c)", "NAMED_OPERATOR"),)),
+        ("'multi\nline'", (("multi\nline", "ID"),)),
+    ),
+)
+def test_lexer_quoted_fast_path(string, expected_token_info):
+    from jsonpath_ng.ext.parser import ExtendedJsonPathLexer
+
+    for lexer in (JsonPathLexer(), ExtendedJsonPathLexer()):
+        tokens = [(token.value, token.type) for token in lexer.tokenize(string)]
+        assert tokens == list(expected_token_info)
+
+
+@pytest.mark.parametrize(
+    "string, message",
+    (
+        ("a 'b c'", "Parse error at 1:6 near token b c (ID)"),
+        ("`this`.'x y' `parent` )", "Parse error at 1:20 near token parent (NAMED_OPERATOR)"),
+        ("'a'\n'b' c", "Parse error at 2:3 near token b (ID)"),
+        ('a["x" "y"]', "Parse error at 1:8 near token y (ID)"),
+        ("a.`grandparent`", "Unknown named operator `grandparent` at 1:14"),
+    ),
+)
+def test_quoted_token_positions(string, message):
+    """Quoted tokens are at their closing quote, in errors too."""
+    from jsonpath_ng.parser import JsonPathParser
+
+    with pytest.raises(Exception, match="^%s$" % re.escape(message)):
+        JsonPathParser().parse(string)
+
+
+def test_lexer_is_built_once_per_class():
+    from jsonpath_ng.ext.parser import ExtendedJsonPathLexer
+    from jsonpath_ng.lexer import _built_lexers
+
+    first, second = JsonPathLexer().get_lexer(), JsonPathLexer().get_lexer()
+    assert first is not second
+    assert first.lexre is second.lexre is _built_lexers[JsonPathLexer].lexre
+    assert ExtendedJsonPathLexer().get_lexer().lexre is not first.lexre
+
+    # Interleaved tokenizing must not share any per-input state
+    tokens_a = JsonPathLexer().tokenize("'a'.b")
+    tokens_b = JsonPathLexer().tokenize("c.'d")
+    assert next(tokens_a).value == "a"
+    assert next(tokens_b).value == "c"
+    assert [token.value for token in tokens_a] == [".", "b"]
+    with pytest.raises(JsonPathLexerError):
+        list(tokens_b)
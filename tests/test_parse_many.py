@@ -0,0 +1,61 @@
+import pytest
+
+from jsonpath_ng import parse_many
+from jsonpath_ng.descent import JsonPathDescentParser
+from jsonpath_ng.exceptions import JsonPathLexerError, JsonPathParserError
+from jsonpath_ng.ext import parse_many as ext_parse_many
+from jsonpath_ng.ext.filter import Filter
+from jsonpath_ng.ext.parser import ExtentedJsonPathParser
+from jsonpath_ng.jsonpath import Child, Fields, Index
+from jsonpath_ng.parser import JsonPathParser, ParseResults
+
+
+def test_parse_many():
+    results = parse_many(["a.b", "c[0]", "a.b"])
+    assert isinstance(results, ParseResults)
+    assert results.expressions == {"a.b": Child(Fields("a"), Fields("b")), "c[0]": Child(Fields("c"), Index(0))}
+    assert results.errors == {}
+
+
+def test_parse_many_deduplicates(monkeypatch):
+    parsed = []
+    parse = JsonPathParser.parse
+
+    def counting_parse(self, string, lexer=None):
+        parsed.append(string)
+        return parse(self, string, lexer)
+
+    monkeypatch.setattr(JsonPathParser, "parse", counting_parse)
+    results = parse_many(["a", "b", "a", "a", "b"], backend="ply")
+    assert parsed == ["a", "b"]
+    assert list(results.expressions) == ["a", "b"]
+
+
+def test_parse_many_collects_errors():
+    results = parse_many(["a", "a[", "b", "a.b+", "c"])
+    assert sorted(results.expressions) == ["a", "b", "c"]
+    assert isinstance(results.errors["a["], JsonPathParserError)
+    assert isinstance(results.errors["a.b+"], JsonPathLexerError)
+
+
+@pytest.mark.parametrize("backend", ("ply", "descent"))
+def test_ext_parse_many(backend):
+    results = ext_parse_many(["a[?b > 1]", "a + 1", "a["], backend=backend)
+    assert isinstance(results.expressions["a[?b > 1]"].right, Filter)
+    assert list(results.errors) == ["a["]
+
+
+def test_parse_many_with_parser_class():
+    assert isinstance(parse_many(["a[?b]"], parser=ExtentedJsonPathParser).expressions["a[?b]"].right, Filter)
+    assert "a[?b]" in parse_many(["a[?b]"], parser=JsonPathDescentParser).errors
+
+
+@pytest.mark.parametrize("parse_many_function", (parse_many, ext_parse_many))
+def test_parse_many_with_workers(parse_many_function):
+    strings = ["field%d.sub[%d]" % (i % 50, i) for i in range(200)] + ["bad["] * 3
+    in_process = parse_many_function(strings)
+    pooled = parse_many_function(strings, workers=2)
+    assert pooled.expressions == in_process.expressions
+    assert list(pooled.expressions) == list(in_process.expressions)
+    assert list(pooled.errors) == ["bad["]
+    assert isinstance(pooled.errors["bad["], JsonPathParserError)
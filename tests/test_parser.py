@@ -36,3 +36,54 @@ parser_test_cases = (
 def test_parser(string, expected_object):
     parser = JsonPathParser(lexer_class=lambda: JsonPathLexer())
     assert parser.parse(string) == expected_object
+
+
+def test_parser_tables_are_built_once_per_class():
+    from jsonpath_ng.ext.parser import ExtentedJsonPathParser
+
+    base = JsonPathParser().get_parser()
+    assert JsonPathParser(lexer_class=JsonPathLexer).get_parser() is base
+    assert ExtentedJsonPathParser().get_parser() is ExtentedJsonPathParser().get_parser()
+    assert ExtentedJsonPathParser().get_parser() is not base
+
+
+@pytest.mark.parametrize(
+    "parser_class, table_module",
+    (
+        ("jsonpath_ng.parser.JsonPathParser", "jsonpath_ng.parser_jsonpath_parsetab"),
+        ("jsonpath_ng.ext.parser.ExtentedJsonPathParser", "jsonpath_ng.ext.parser_jsonpath_parsetab"),
+    ),
+)
+def test_shipped_parse_tables_are_current(parser_class, table_module):
+    """Run `make parsetab` after changing a grammar if this fails."""
+    import importlib
+
+    import ply.yacc
+
+    module_name, class_name = parser_class.rsplit(".", 1)
+    parser = getattr(importlib.import_module(module_name), class_name)()
+    pdict = {name: getattr(parser, name) for name in dir(parser)}
+    pdict["start"] = "jsonpath"
+    reflect = ply.yacc.ParserReflect(pdict)
+    reflect.get_all()
+
+    assert importlib.import_module(table_module)._lr_signature == reflect.signature()
+
+
+class DebugParser(JsonPathParser):
+    """A parser without shipped tables, so that PLY builds them."""
+
+
+def test_debug_parser_writes_no_report():
+    import os
+
+    import jsonpath_ng
+
+    reports = [os.path.join(os.path.dirname(path), "parser.out") for path in (jsonpath_ng.__file__, __file__)]
+
+    def written():
+        return [os.stat(report).st_mtime_ns if os.path.exists(report) else None for report in reports]
+
+    before = written()
+    assert DebugParser(debug=True).parse("foo[1]") == Child(Fields("foo"), Index(1))
+    assert written() == before
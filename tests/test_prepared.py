@@ -0,0 +1,106 @@
+import pytest
+
+from jsonpath_ng.cache import parse_cache
+from jsonpath_ng.ext import parse
+from jsonpath_ng.ext.filter import Expression, Filter
+from jsonpath_ng.ext.prepared import Parameter, Prepared
+from jsonpath_ng.jsonpath import Child, Fields, Root
+
+users = {
+    "users": [
+        {"id": 1, "name": "ann", "age": 31},
+        {"id": 2, "name": "bob", "age": 17},
+        {"id": 3, "name": "cid", "age": 45},
+    ]
+}
+
+
+@pytest.mark.parametrize("backend", ("ply", "descent"))
+def test_parse_parameter(backend):
+    expression = parse("$.users[?id == :uid]", backend=backend)
+    assert expression == Prepared(
+        Child(Child(Root(), Fields("users")), Filter([Expression(Fields("id"), "==", Parameter("uid"))])),
+        ["uid"],
+    )
+    assert expression.parameters == ("uid",)
+    assert str(expression.expression.right.expressions[0]) == "id == :uid"
+
+
+@pytest.mark.parametrize("backend", ("ply", "descent"))
+def test_find_with_params(backend):
+    expression = parse("$.users[?age > :min & name != :name].name", backend=backend)
+    assert expression.parameters == ("min", "name")
+    assert [m.value for m in expression.find(users, params={"min": 18, "name": "ann"})] == ["cid"]
+    assert [m.value for m in expression.find(users, params={"min": 10, "name": "cid"})] == ["ann", "bob"]
+
+
+def test_prepared_expression_is_parsed_once():
+    parse_cache.clear()
+    for uid in (1, 2, 3):
+        matches = parse("$.users[?id == :uid].name").find(users, params={"uid": uid})
+        assert [m.value for m in matches] == [users["users"][uid - 1]["name"]]
+    assert parse_cache.cache_info().misses == 1
+
+
+def test_parameter_values_keep_their_type():
+    expression = parse("$.users[?id == :uid].name")
+    # An int parameter coerces values to int, as an int literal does
+    assert [m.value for m in expression.find({"users": [{"id": "2", "name": "x"}]}, params={"uid": 2})] == ["x"]
+    assert expression.find({"users": [{"id": "2", "name": "x"}]}, params={"uid": "3"}) == []
+    regex = parse("$.users[?name =~ :pattern].id")
+    assert [m.value for m in regex.find(users, params={"pattern": "^[ab]"})] == [1, 2]
+
+
+def test_iter_find_with_params():
+    expression = parse("$.users[?id != :uid].name")
+    first = expression.iter_find(users, params={"uid": 1})
+    second = expression.iter_find(users, params={"uid": 3})
+    # Each iterator keeps its own values while the other one runs
+    assert [next(m).value for m in (first, second, first, second)] == [
+        "bob", "ann", "cid", "bob"
+    ]
+    with pytest.raises(ValueError, match=":uid"):
+        expression.iter_find(users)
+
+
+def test_find_first_exists_count_with_params():
+    expression = parse("$.users[?age > :age].name")
+    assert expression.find_first(users, params={"age": 18}).value == "ann"
+    assert expression.find_first(users, params={"age": 50}) is None
+    assert expression.exists(users, params={"age": 40})
+    assert not expression.exists(users, params={"age": 50})
+    assert expression.count(users, params={"age": 18}) == 2
+
+
+def test_find_values_with_params():
+    expression = parse("$.users[?age > :age].name")
+    assert expression.find_values(users, params={"age": 18}) == ["ann", "cid"]
+    assert list(expression.iter_values(users, params={"age": 40})) == ["cid"]
+
+
+def test_missing_parameter():
+    expression = parse("$.users[?id == :uid & age > :age]")
+    with pytest.raises(ValueError, match=":uid, :age"):
+        expression.find(users)
+    with pytest.raises(ValueError, match=":age"):
+        expression.find(users, params={"uid": 1})
+
+    # Outside of a prepared expression nothing is bound
+    with pytest.raises(ValueError, match=":uid"):
+        expression.expression.find(users)
+
+
+def test_update_and_filter_with_params():
+    expression = parse("$.users[?id == :uid].age")
+    data = {"users": [dict(user) for user in users["users"]]}
+    expression.update(data, 99, params={"uid": 2})
+    assert [user["age"] for user in data["users"]] == [31, 99, 45]
+
+    expression = parse("$.users[?age < :age]")
+    expression.filter(lambda user: True, data, params={"age": 40})
+    assert [user["id"] for user in data["users"]] == [2, 3]
+
+
+def test_expressions_without_parameters_are_not_prepared():
+    assert not isinstance(parse("$.users[?id == 1]"), Prepared)
+    assert isinstance(parse("$.users[1:2]"), Child)
@@ -0,0 +1,91 @@
+"""
+Differential tests of `QuerySet` against evaluating each expression alone.
+"""
+
+import random
+
+import pytest
+
+from jsonpath_ng import jsonpath, queryset
+from jsonpath_ng.ext import parse
+from jsonpath_ng.jsonpath import JSONPath, JsonIndex
+from jsonpath_ng.queryset import QuerySet
+
+from .test_compiler import documents, outcome, parsed, random_document
+from .test_descent import corpus, generated_cases
+from .test_jsonpath import find_test_cases, find_test_cases_with_auto_id
+
+
+def check(expressions, data):
+    """Compare a `QuerySet` of those of `expressions` which evaluate on `data`."""
+    expressions = [expression for expression in expressions
+                   if isinstance(outcome(expression.find_values, data), list)]
+    expected = [expression.find(data) for expression in expressions]
+
+    queries = QuerySet(expressions)
+    results = queries.find(data)
+    assert results == expected
+    # `parent` of the top of the document finds None
+    assert [[match and str(match.full_path) for match in matches] for matches in results] == [
+        [match and str(match.full_path) for match in matches] for matches in expected
+    ]
+    assert queries.find_values(data) == [[match.value for match in matches] for matches in expected]
+
+
+def expressions(strings):
+    return [expression for expression in map(parsed, strings) if isinstance(expression, JSONPath)]
+
+
+@pytest.mark.parametrize("path, data, expected_values, expected_full_paths", find_test_cases)
+def test_find_test_cases(path, data, expected_values, expected_full_paths):
+    check(expressions(case[0] for case in find_test_cases), data)
+
+
+@pytest.mark.parametrize("path, data, expected_values", find_test_cases_with_auto_id)
+def test_auto_id_test_cases(auto_id_field, path, data, expected_values):
+    check(expressions(case[0] for case in find_test_cases_with_auto_id), data)
+
+
+@pytest.mark.parametrize("data", documents)
+def test_corpus(data):
+    check(expressions(corpus), data)
+    check(expressions(corpus), JsonIndex(data))
+
+
+def test_generated():
+    generator = random.Random(5)
+    strings = list(generated_cases(1000, seed=6))
+    for start in range(0, len(strings), 100):
+        check(expressions(strings[start:start + 100]), random_document(generator))
+
+
+def test_shared_steps(monkeypatch):
+    data = {"order": {"items": [{"sku": "a", "price": 1}, {"sku": "b", "price": 2, "tags": {"sku": "c"}}]}}
+    strings = ["$.order.items[*].sku", "$.order.items[*].price", "$.order..sku", "$.order..price",
+               "$.order.items[*].sku"]
+    queries = QuerySet(parse(string) for string in strings)
+    assert len(queries) == 5
+    assert queries.find_values(data) == [["a", "b"], [1, 2], ["a", "b", "c"], [1, 2], ["a", "b"]]
+
+    # `$.order` is found once, and the descendants of the order walked once
+    calls = []
+
+    def walk_hits(datum, test):
+        calls.append(datum.value)
+        return jsonpath._walk_hits(datum, test)
+
+    monkeypatch.setattr(queryset, "_walk_hits", walk_hits)
+    assert queries.find_values(data)[2] == ["a", "b", "c"]
+    assert calls == [data["order"]]
+
+
+def test_literal_types_are_told_apart():
+    queries = QuerySet([parse("a[?b == 1]"), parse("a[?b == true]")])
+    data = {"a": [{"b": 1}, {"b": True}, {"b": "true"}]}
+    assert queries.find_values(data) == [parse("a[?b == 1]").find_values(data),
+                                         parse("a[?b == true]").find_values(data)]
+
+
+def test_expressions_only():
+    with pytest.raises(TypeError):
+        QuerySet(["$.a"])
@@ -0,0 +1,170 @@
+"""
+Tests of the incremental parser and of streamed evaluation against the
+interpreter.
+"""
+
+import io
+import json
+import random
+
+import pytest
+
+from jsonpath_ng import stream
+from jsonpath_ng.exceptions import JSONPathError
+from jsonpath_ng.ext import parse
+from jsonpath_ng.jsonpath import JSONPath
+from jsonpath_ng.stream import iter_events, iter_stream
+
+from .test_compiler import documents, outcome, parsed, random_document
+from .test_descent import corpus, generated_cases
+from .test_jsonpath import find_test_cases
+
+
+def build(events):
+    """The value made of `events`, to compare the parser with `json.loads`."""
+    stack = [[]]
+    keys = []
+    for event, value in events:
+        if event == "map_key":
+            keys.append(value)
+            continue
+        if event in ("start_map", "start_array"):
+            stack.append({} if event == "start_map" else [])
+            continue
+        if event in ("end_map", "end_array"):
+            value = stack.pop()
+        parent = stack[-1]
+        if isinstance(parent, dict):
+            parent[keys.pop()] = value
+        else:
+            parent.append(value)
+    return stack[0][0]
+
+
+def described(matches):
+    return sorted((str(match.full_path), json.dumps(match.value, sort_keys=True)) for match in matches)
+
+
+def check(expression, data):
+    """Compare streaming `expression` over `data` with the interpreter."""
+    try:
+        iter_stream(expression, io.StringIO("1"))
+    except JSONPathError:
+        return
+    expected = outcome(expression.find, data)
+    if not isinstance(expected, list):
+        return
+    # Some cases have data JSON cannot hold
+    text = outcome(json.dumps, data)
+    if not isinstance(text, str):
+        return
+    for chunk_size in (1, 7, 65536):
+        assert described(iter_stream(expression, io.StringIO(text), chunk_size)) == described(expected)
+
+
+@pytest.mark.parametrize("text", [
+    '{"a": [1, -2.5e3, "x\\"y\\u00e9", true, false, null, {}, []], "b": {"c": {"d": 0}}}',
+    ' [ 1 , 2 ] ', '"\\ud83d\\ude00 café"', "0", "-0.5", "1E+2", "NaN", "[Infinity, -Infinity]",
+])
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 1000])
+def test_events(text, chunk_size):
+    expected = json.loads(text)
+    assert json.dumps(build(iter_events(io.StringIO(text), chunk_size))) == json.dumps(expected)
+    data = io.BytesIO(text.encode("utf-8"))
+    assert json.dumps(build(iter_events(data, chunk_size))) == json.dumps(expected)
+
+
+@pytest.mark.parametrize("text", [
+    "", "[", "[1,]", "{1: 2}", '{"a" 1}', '{"a": 1,}', "[1 2]", "[1}", "01", "tru", '"a', "1 2", "]", "-",
+])
+def test_malformed(text):
+    for chunk_size in (1, 1000):
+        with pytest.raises(ValueError):
+            list(iter_events(io.StringIO(text), chunk_size))
+
+
+def test_round_trip():
+    generator = random.Random(3)
+    for _ in range(200):
+        data = random_document(generator)
+        text = json.dumps(data)
+        for chunk_size in (1, 5):
+            assert build(iter_events(io.StringIO(text), chunk_size)) == data
+
+
+@pytest.mark.parametrize("path, data, expected_values, expected_full_paths", find_test_cases)
+def test_find_test_cases(path, data, expected_values, expected_full_paths):
+    check(parse(path), data)
+
+
+@pytest.mark.parametrize("data", documents)
+def test_corpus(data):
+    for string in corpus:
+        expression = parsed(string)
+        if isinstance(expression, JSONPath):
+            check(expression, data)
+
+
+def test_generated():
+    generator = random.Random(7)
+    for string in generated_cases(500, seed=8):
+        expression = parsed(string)
+        if isinstance(expression, JSONPath):
+            check(expression, random_document(generator))
+
+
+class Reader(io.StringIO):
+    """A file recording how far it has been read."""
+
+    def read(self, size=-1):
+        text = super().read(size)
+        self.offsets.append(self.tell())
+        return text
+
+
+def test_matches_as_they_end():
+    data = {"items": [{"id": index, "tags": ["x"] * 10} for index in range(100)]}
+    fp = Reader(json.dumps(data))
+    fp.offsets = []
+    matches = iter_stream(parse("$.items[*].id"), fp, 64)
+    first = next(matches)
+    assert (first.value, str(first.full_path)) == (0, "items.[0].id")
+    assert fp.offsets[-1] < 200
+    assert [match.value for match in matches] == list(range(1, 100))
+
+    # Inner matches come first
+    assert [match.value for match in iter_stream(parse("$..a"), io.StringIO('{"a": {"a": 1}}'))] == [1, {"a": 1}]
+
+
+def test_values_not_followed_are_not_built(monkeypatch):
+    added = []
+    _add = stream._add
+
+    def add(parent, key, value):
+        added.append(value)
+        _add(parent, key, value)
+
+    monkeypatch.setattr(stream, "_add", add)
+    text = json.dumps({"skipped": [{"a": [1, 2]}] * 50, "kept": {"b": [3]}, "a": 4})
+    assert [match.value for match in iter_stream(parse("$.kept"), io.StringIO(text))] == [{"b": [3]}]
+    assert added == [[3], 3]
+    del added[:]
+    assert [match.value for match in iter_stream(parse("a"), io.StringIO(text))] == [4]
+    assert added == []
+
+
+def test_filters_elements_once_complete():
+    text = json.dumps({"a": [{"b": 1, "c": "x"}, {"b": 2, "c": "y"}, {"c": "z"}]})
+    matches = list(iter_stream(parse("a[?b > 1].c"), io.StringIO(text)))
+    assert [(match.value, str(match.full_path)) for match in matches] == [("y", "a.[1].c")]
+
+
+@pytest.mark.parametrize("string", ["a.`parent`", "a[?b].$.c", "$.a.`this`.`parent`"])
+def test_context_not_streamed(string):
+    with pytest.raises(JSONPathError):
+        iter_stream(parse(string), io.StringIO("{}"))
+
+
+def test_auto_id_not_streamed(auto_id_field):
+    with pytest.raises(JSONPathError):
+        iter_stream(parse("a"), io.StringIO("{}"))